@@ -3,10 +3,21 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
+import io
 import time
-import yfinance as yf
 import numpy as np
 import re
+from hybrid_engine import SentimentBrain
+from market_data import load_history, fetch_many, INDICATORS
+from chart_data import reduce_chart, volume_marker
+import figures
+from shared_cache import shared_cache
+from ledger import Ledger
+from history_store import HistoryStore
+from headline_store import headline_store
+from reporting import write_html_report
+import instrumentation
+from instrumentation import timer
 
 # ==========================================
 # 0. CONFIGURATION & ASSETS
@@ -143,85 +154,64 @@ def render_ticker():
     </div>
     """, unsafe_allow_html=True)
 
-def get_chart(ticker):
+# Finished charts, shared by every session (keyed on the bars they were built from);
+# stale ones are rebuilt in the background after 10 minutes, dropped after an hour
+CHART_CACHE = shared_cache('charts', ttl=600, max_stale=3600, max_entries=256)
+
+def _terminal_skeleton():
+    fig = make_subplots(rows=2, cols=1, shared_xaxes=True, row_heights=[0.7, 0.3], vertical_spacing=0.05)
+    
+    fig.add_trace(go.Candlestick(increasing_line_color='#26a69a', decreasing_line_color='#ef5350', name='OHLC'), row=1, col=1)
+    fig.add_trace(go.Scatter(mode='lines', name='SMA 20', line=dict(color='#FFD700', width=1.5)), row=1, col=1)
+    fig.add_trace(go.Bar(marker=volume_marker(None, '#26a69a', '#ef5350'), opacity=0.5, name='Volume'), row=2, col=1)
+
+    fig.update_layout(template="plotly_dark", paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
+                      height=500, margin=dict(t=50, b=20, l=20, r=20), hovermode="x unified", showlegend=False,
+                      title=dict(font=dict(color="#FFF", family="Montserrat", size=20)))
+    fig.update_xaxes(showgrid=False, type='date')
+    fig.update_yaxes(showgrid=True, gridcolor='rgba(255,255,255,0.05)')
+    return fig
+
+def get_chart(ticker, df=None, width=None):
     try:
-        stock = yf.Ticker(ticker)
-        df = stock.history(period="6mo")
+        if df is None: df = load_history(ticker, "6mo") # shared, stale-while-revalidate
         if df.empty: return None, None
-        
-        df['SMA_20'] = df['Close'].rolling(window=20).mean()
-        
-        fig = make_subplots(rows=2, cols=1, shared_xaxes=True, row_heights=[0.7, 0.3], vertical_spacing=0.05)
-        
-        fig.add_trace(go.Candlestick(x=df.index, open=df['Open'], high=df['High'], low=df['Low'], close=df['Close'],
-                                     increasing_line_color='#26a69a', decreasing_line_color='#ef5350', name='OHLC'), row=1, col=1)
-        fig.add_trace(go.Scatter(x=df.index, y=df['SMA_20'], mode='lines', name='SMA 20', line=dict(color='#FFD700', width=1.5)), row=1, col=1)
-        
-        colors = ['#26a69a' if c >= o else '#ef5350' for c, o in zip(df['Close'], df['Open'])]
-        fig.add_trace(go.Bar(x=df.index, y=df['Volume'], marker_color=colors, opacity=0.5, name='Volume'), row=2, col=1)
-
-        fig.update_layout(template="plotly_dark", paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
-                          height=500, margin=dict(t=50, b=20, l=20, r=20), hovermode="x unified", showlegend=False,
-                          title=dict(text=f"{ticker} // MARKET DATA", font=dict(color="#FFF", family="Montserrat", size=20)))
-        fig.update_xaxes(showgrid=False)
-        fig.update_yaxes(showgrid=True, gridcolor='rgba(255,255,255,0.05)')
-        
-        return fig, df.iloc[-1]
+        # The finished chart is shared by every session until the bars change
+        key = (ticker, width, int(pd.util.hash_pandas_object(df['Close']).sum()))
+        with timer('app.chart'):
+            return CHART_CACHE.get(key, lambda: _build_chart(ticker, df, width))
     except: return None, None
 
-class SentimentBrain:
-    def analyze(self, text):
-        from textblob import TextBlob
-        
-        # 1. DICTIONARY BOOST (Fixes the "Plummet" Issue)
-        text_lower = text.lower()
-        
-        # Weighted Financial Dictionary
-        bull_words = ['surge', 'soar', 'jump', 'rise', 'gain', 'beat', 'profit', 'record', 'growth', 'bull', 'buy', 'upgrade', 'high', 'rocket']
-        bear_words = ['plummet', 'crash', 'drop', 'fall', 'miss', 'loss', 'debt', 'bear', 'sell', 'downgrade', 'halt', 'warning', 'low', 'dip']
-        
-        manual_score = 0
-        for w in bull_words: 
-            if w in text_lower: manual_score += 0.5
-        for w in bear_words: 
-            if w in text_lower: manual_score -= 0.5
-            
-        # 2. NLP Score
-        blob_score = TextBlob(text).sentiment.polarity
-        
-        # 3. Hybrid Calculation
-        # If manual keywords exist, they dominate. If not, fallback to Blob.
-        final_score = blob_score + manual_score
-        
-        # Normalize to 0-1 range (where 0 is Bear, 1 is Bull)
-        # Standardize: -1.0 to 1.0 -> 0.0 to 1.0
-        norm_score = (final_score + 1) / 2
-        
-        # Clamp between 0.01 and 0.99
-        norm_score = max(0.01, min(0.99, norm_score))
+def _build_chart(ticker, df, width):
+    with timer('app.indicators'):
+        df = INDICATORS.apply(ticker, df)
+    # Long histories are bucketed/LTTB-reduced to what the chart can show
+    with timer('app.reduce'):
+        data = reduce_chart(df, width, overlays=('SMA_20',))
+    
+    # Layout is built once; only the data is swapped in per call
+    with timer('app.figure'):
+        fig = figures.render('app.terminal', _terminal_skeleton, traces=[
+            {'x': data['x'], 'open': data['open'], 'high': data['high'], 'low': data['low'], 'close': data['close']},
+            {'x': data['line_x'], 'y': data['SMA_20']},
+            {'x': data['x'], 'y': data['volume'], 'marker.color': data['up']},
+        ], layout={'title.text': f"{ticker} // MARKET DATA"})
+    
+    return fig, df.iloc[-1]
 
-        # 4. Classification
-        if norm_score > 0.6:
-            label = "BULLISH"
-            color = "#26a69a" # Green
-        elif norm_score < 0.4:
-            label = "BEARISH"
-            color = "#ef5350" # Red
-        else:
-            label = "NEUTRAL"
-            color = "#ffffff"
-            
-        confidence = abs(norm_score - 0.5) * 2
-        
-        return {"label": label, "score": norm_score, "color": color, "confidence": confidence}
+def _report_html(history):
+    buf = io.StringIO()
+    write_html_report(history, buf)
+    return buf.getvalue()
 
 # ==========================================
 # 3. STATE MANAGEMENT
 # ==========================================
 if 'authenticated' not in st.session_state: st.session_state['authenticated'] = False
 if 'user_name' not in st.session_state: st.session_state['user_name'] = "OPERATOR"
-if 'portfolio' not in st.session_state: st.session_state['portfolio'] = {'balance': 0}
-if 'history' not in st.session_state: st.session_state['history'] = []
+if 'portfolio' not in st.session_state: st.session_state['portfolio'] = Ledger(balance=0)
+# Bounded: the newest entries in NumPy records, older ones spilled to SQLite (history_store.py)
+if 'history' not in st.session_state: st.session_state['history'] = HistoryStore()
 
 brain = SentimentBrain()
 
@@ -247,7 +237,7 @@ if not st.session_state['authenticated']:
                     time.sleep(1.0)
                     st.session_state['authenticated'] = True
                     st.session_state['user_name'] = name.upper()
-                    st.session_state['portfolio']['balance'] = balance
+                    st.session_state['portfolio'] = Ledger(balance=balance)
                     st.rerun()
             else:
                 st.error("IDENTITY REQUIRED")
@@ -257,6 +247,9 @@ if not st.session_state['authenticated']:
 # 5. PART B: DASHBOARD
 # ==========================================
 else:
+    # Timings are scoped to this session's rerun (the toggle's value from the last interaction)
+    instrumentation.start_rerun(timed=st.session_state.get('show_timings', False))
+    rerun_t0 = time.perf_counter()
     with st.sidebar:
         st.markdown(f"### 👤 <span class='gold-text'>{st.session_state.get('user_name', 'USER')}</span>", unsafe_allow_html=True)
         st.caption("JUGAR-AI // v1.0")
@@ -270,7 +263,11 @@ else:
         ])
         
         st.markdown("---")
-        st.metric("LIQUIDITY", f"${st.session_state['portfolio']['balance']:,.2f}")
+        st.metric("LIQUIDITY", f"${st.session_state['portfolio'].balance:,.2f}")
+        
+        # Turning the panel on enables the (process-wide) stage timers; the panel is filled in last
+        show_timings = st.toggle("STAGE TIMINGS", key='show_timings', help="Per-stage timings of this rerun + Prometheus export")
+        timing_panel = st.empty()
         
         if st.button("LOGOUT"):
             st.session_state['authenticated'] = False
@@ -359,23 +356,40 @@ else:
                 if txt:
                     with st.spinner("PROCESSING..."):
                         time.sleep(0.5)
-                        res = brain.analyze(txt)
+                        with timer('app.analyze'):
+                            res = brain.analyze(txt)
+                        st.session_state['history'].append_result(txt, res)
+                        # Persisted across sessions (free text: no ticker); written by the store within
+                        # its flush_delay, together with other sessions' clicks meanwhile
+                        headline_store().add(txt, res, version=brain.version)
                         st.markdown(f"""
                         <div style="text-align:center; padding:20px; border:2px solid {res['color']}; border-radius:10px; margin-top:20px;">
                             <h1 style="color:{res['color']}; font-size:4rem; margin:0;">{res['label']}</h1>
                             <p style="font-family:JetBrains Mono;">CONFIDENCE: {res['confidence']*100:.2f}%</p>
                         </div>
                         """, unsafe_allow_html=True)
+            history = st.session_state['history']
+            if history:
+                with st.expander(f"SESSION LOG ({len(history)})"):
+                    st.dataframe(history.to_frame(limit=20), use_container_width=True, hide_index=True)
+                    # Built only when clicked (Streamlit runs the callable on download), streamed row by row
+                    st.download_button("📥 DOWNLOAD INTELLIGENCE REPORT", data=lambda: _report_html(history),
+                                       file_name="Citadel_Report.html", mime="text/html")
             st.markdown('</div>', unsafe_allow_html=True)
 
         with tabs[1]:
             st.markdown('<div class="jugar-card">', unsafe_allow_html=True)
-            tick = st.text_input("TICKER", value="BTC-USD").upper()
+            tick = st.text_input("TICKER", value="BTC-USD", help="Comma-separate tickers to chart several at once").upper()
             if tick:
-                fig, last = get_chart(tick)
-                if fig:
-                    st.metric("LIVE PRICE", f"${last['Close']:,.2f}")
-                    st.plotly_chart(fig, use_container_width=True)
+                # All symbols are downloaded concurrently; one bad ticker doesn't block the rest
+                for sym, res in fetch_many(tick.split(","), "6mo").items():
+                    if not res.ok:
+                        st.warning(f"{sym}: {res.error}")
+                        continue
+                    fig, last = get_chart(sym, res.data)
+                    if fig:
+                        st.metric(f"{sym} LIVE PRICE", f"${last['Close']:,.2f}")
+                        st.plotly_chart(fig, use_container_width=True)
             st.markdown('</div>', unsafe_allow_html=True)
             
         with tabs[2]:
@@ -394,3 +408,17 @@ else:
         """)
         st.progress(100)
         st.markdown('</div>', unsafe_allow_html=True)
+
+    # ==========================================
+    # 6. TIMING PANEL (sidebar, filled after everything above ran)
+    # ==========================================
+    if show_timings:
+        instrumentation.observe('app.rerun', time.perf_counter() - rerun_t0)
+        with timing_panel.container():
+            timings = instrumentation.rerun_timings()
+            st.caption(f"THIS RERUN // {timings['app.rerun'][1] * 1e3:,.0f} MS")
+            st.dataframe(pd.DataFrame([{"STAGE": stage, "CALLS": calls, "MS": round(total * 1e3, 2)}
+                                       for stage, (calls, total) in timings.items()]),
+                         hide_index=True, use_container_width=True)
+            st.download_button("EXPORT METRICS", instrumentation.export_prometheus(),
+                               file_name="jugar_metrics.prom", mime="text/plain", use_container_width=True)
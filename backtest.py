@@ -0,0 +1,190 @@
+"""
+Vectorized sentiment backtester built on MarketSim's order rules.
+
+Every bar, a strategy with thresholds (bull, bear) and order size `amount`
+  - buys `amount` at the close when the sentiment score is > bull
+  - otherwise sells `amount` when the score is < bear
+  - otherwise holds
+and orders follow MarketSim.execute_trade exactly: a buy needs balance >= price * amount
+(else INSUFFICIENT FUNDS), a sell needs shares >= amount (else INSUFFICIENT ASSETS).
+
+Fills depend on the cash left by earlier fills, so the time axis is a loop, but each
+step updates every parameter combination at once with NumPy (P strategies per step).
+sweep() shards large grids across processes. replay() runs the original one-order-
+at-a-time MarketSim loop and is the reference the vectorized engine must equal.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from simulator import MarketSim
+
+# Same thresholds as engine.BULL_THRESHOLD / BEAR_THRESHOLD
+BULL_THRESHOLD = 0.6
+BEAR_THRESHOLD = 0.4
+INITIAL_BALANCE = 10_000.0
+# Parameter combinations per worker task in sweep()
+PARAMS_PER_JOB = 2_000
+
+# Per-bar order status codes
+HOLD, BOUGHT, SOLD, NO_FUNDS, NO_ASSETS = 0, 1, 2, 3, 4
+STATUS = ["HOLD", "BOUGHT", "SOLD", "INSUFFICIENT FUNDS", "INSUFFICIENT ASSETS"]
+
+def label_scores(labels):
+    """BULLISH/BEARISH/NEUTRAL labels -> scores that the default thresholds map back to the label."""
+    mapping = {'BULLISH': 1.0, 'BEARISH': 0.0}
+    return np.array([mapping.get(str(label).upper(), 0.5) for label in labels])
+
+def _align(prices, scores):
+    """Float arrays of equal length; Series scores are aligned on the price index (missing -> hold)."""
+    if isinstance(prices, pd.Series) and isinstance(scores, pd.Series):
+        scores = scores.reindex(prices.index)
+    prices = np.asarray(prices, dtype=np.float64)
+    scores = np.asarray(scores, dtype=np.float64)
+    if prices.shape != scores.shape or prices.ndim != 1:
+        raise ValueError("prices and scores must be 1-D and the same length")
+    return prices, scores
+
+def simulate(prices, scores, bull=BULL_THRESHOLD, bear=BEAR_THRESHOLD, amount=1,
+             balance=INITIAL_BALANCE, shares=0, curves=True):
+    """
+    Runs P strategies (bull, bear and amount broadcast to P) over T bars.
+    Returns a dict of (P,) summary arrays (final equity, max drawdown, order counts...)
+    and, with curves=True, the (P, T) arrays status, cash, shares, equity, drawdown.
+    """
+    prices, scores = _align(prices, scores)
+    bull, bear, amount = (a.astype(np.float64) for a in np.broadcast_arrays(
+        np.atleast_1d(bull), np.atleast_1d(bear), np.atleast_1d(amount)))
+    n_params, n_bars = len(bull), len(prices)
+
+    # Signals for every strategy and bar up front (buy wins if both fire, as np.select does)
+    buy = scores[None, :] > bull[:, None]
+    sell = (scores[None, :] < bear[:, None]) & ~buy
+
+    # Mark-to-market on the last known price
+    marks = pd.Series(prices).ffill().fillna(0.0).to_numpy()
+
+    cash = np.full(n_params, float(balance))
+    held = np.full(n_params, float(shares))
+    equity = np.empty(n_params)
+    peak = np.full(n_params, -np.inf)
+    max_dd = np.zeros(n_params)
+    dd = np.empty(n_params)
+    # Time-major while looping (contiguous rows), transposed at the end
+    status = np.zeros((n_bars, n_params), dtype=np.int8)
+    cash_t = np.empty((n_bars, n_params)) if curves else None
+    held_t = np.empty((n_bars, n_params)) if curves else None
+    dd_t = np.empty((n_bars, n_params)) if curves else None
+    cost = np.empty(n_params)
+    ok = np.empty(n_params, dtype=bool)
+    for t in range(n_bars):
+        price = prices[t]
+        if price == price: # no orders on a missing bar
+            np.multiply(price, amount, out=cost)
+            b, s, row = buy[:, t], sell[:, t], status[t]
+            np.greater_equal(cash, cost, out=ok)
+            ok &= b
+            np.subtract(cash, cost, out=cash, where=ok)
+            np.add(held, amount, out=held, where=ok)
+            row[ok] = BOUGHT
+            row[b & ~ok] = NO_FUNDS
+            np.greater_equal(held, amount, out=ok)
+            ok &= s
+            np.add(cash, cost, out=cash, where=ok)
+            np.subtract(held, amount, out=held, where=ok)
+            row[ok] = SOLD
+            row[s & ~ok] = NO_ASSETS
+        # Equity and drawdown from the running peak, for every strategy
+        np.multiply(held, marks[t], out=equity)
+        equity += cash
+        np.maximum(peak, equity, out=peak)
+        np.divide(equity, peak, out=dd, where=peak > 0)
+        dd[peak <= 0] = 1.0
+        dd -= 1.0
+        np.minimum(max_dd, dd, out=max_dd)
+        if curves:
+            cash_t[t] = cash
+            held_t[t] = held
+            dd_t[t] = dd
+
+    out = {'bull': bull, 'bear': bear, 'amount': amount, 'max_drawdown': max_dd}
+    if curves:
+        out.update(status=status.T, cash=cash_t.T, shares=held_t.T,
+                   equity=(cash_t + held_t * marks[:, None]).T, drawdown=dd_t.T)
+    final_equity = cash + held * (marks[-1] if n_bars else 0.0)
+    start_equity = float(balance) + float(shares) * (marks[0] if n_bars else 0.0)
+    counts = [(status == code).sum(axis=0) for code in (BOUGHT, SOLD, NO_FUNDS, NO_ASSETS)]
+    out.update(final_cash=cash, final_shares=held, final_equity=final_equity,
+               total_return=final_equity / start_equity - 1.0 if start_equity else np.full(n_params, np.nan),
+               buys=counts[0], sells=counts[1], rejected_funds=counts[2], rejected_assets=counts[3])
+    return out
+
+def backtest(prices, scores, bull=BULL_THRESHOLD, bear=BEAR_THRESHOLD, amount=1,
+             balance=INITIAL_BALANCE, shares=0):
+    """One strategy, bar by bar, as a DataFrame (price, score, status, cash, shares, equity, drawdown)."""
+    res = simulate(prices, scores, bull, bear, amount, balance, shares)
+    index = prices.index if isinstance(prices, pd.Series) else None
+    p, s = _align(prices, scores)
+    return pd.DataFrame({
+        'price': p, 'score': s,
+        'status': pd.Categorical.from_codes(res['status'][0], STATUS),
+        'cash': res['cash'][0], 'shares': res['shares'][0],
+        'equity': res['equity'][0], 'drawdown': res['drawdown'][0],
+    }, index=index)
+
+def param_grid(bulls, bears, amounts):
+    """Every (bull, bear, amount) combination as three aligned arrays."""
+    b, r, a = np.meshgrid(np.asarray(bulls, float), np.asarray(bears, float), np.asarray(amounts, float), indexing='ij')
+    return b.ravel(), r.ravel(), a.ravel()
+
+SUMMARY = ['bull', 'bear', 'amount', 'final_equity', 'total_return', 'max_drawdown',
+           'buys', 'sells', 'rejected_funds', 'rejected_assets']
+
+def _sweep_chunk(args):
+    prices, scores, bull, bear, amount, balance, shares = args
+    res = simulate(prices, scores, bull, bear, amount, balance, shares, curves=False)
+    return {k: res[k] for k in SUMMARY}
+
+def sweep(prices, scores, bulls, bears, amounts, balance=INITIAL_BALANCE, shares=0,
+          n_jobs=-1, params_per_job=PARAMS_PER_JOB):
+    """
+    Backtests the full bulls x bears x amounts grid. Returns one summary row per
+    combination. The grid is split evenly across n_jobs processes, at most
+    params_per_job combinations per task (bounds the per-task memory).
+    """
+    prices, scores = _align(prices, scores)
+    bull, bear, amount = param_grid(bulls, bears, amounts)
+    if n_jobs == -1:
+        n_jobs = os.cpu_count() or 1
+    size = max(1, min(params_per_job, -(-len(bull) // max(n_jobs, 1))))
+    chunks = [(prices, scores, bull[i:i + size], bear[i:i + size], amount[i:i + size], balance, shares)
+              for i in range(0, len(bull), size)]
+    if n_jobs <= 1 or len(chunks) <= 1:
+        parts = [_sweep_chunk(c) for c in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=min(n_jobs, len(chunks))) as pool:
+            parts = list(pool.map(_sweep_chunk, chunks))
+    return pd.DataFrame({k: np.concatenate([p[k] for p in parts]) for k in SUMMARY})
+
+def replay(prices, scores, bull=BULL_THRESHOLD, bear=BEAR_THRESHOLD, amount=1,
+           balance=INITIAL_BALANCE, shares=0):
+    """Reference: the same strategy through MarketSim.execute_trade, one order at a time."""
+    prices, scores = _align(prices, scores)
+    sim = MarketSim()
+    portfolio = {'balance': float(balance), 'shares': shares}
+    statuses, cash, held = [], [], []
+    for price, score in zip(prices, scores):
+        code = HOLD
+        if price == price:
+            if score > bull:
+                filled, _ = sim.execute_trade(portfolio, 'buy', price, amount)
+                code = BOUGHT if filled else NO_FUNDS
+            elif score < bear:
+                filled, _ = sim.execute_trade(portfolio, 'sell', price, amount)
+                code = SOLD if filled else NO_ASSETS
+        statuses.append(code)
+        cash.append(portfolio['balance'])
+        held.append(portfolio['shares'])
+    return np.array(statuses, dtype=np.int8), np.array(cash), np.array(held, dtype=np.float64)
@@ -0,0 +1,155 @@
+"""
+Persistent per-ticker OHLCV bar cache (one Parquet file per ticker/interval).
+
+history() loads the cached bars and only asks upstream for the tail since the last
+cached bar (which is re-fetched, since it may have been a still-forming bar). The full
+window is downloaded only when the cache does not reach back far enough.
+
+Bars come from the current market-data provider (providers.get_provider() unless one
+is passed in). Files are replaced atomically (write temp file + os.replace), so concurrent readers in
+other processes always see a complete file. Refreshes take an advisory file lock
+where the platform has fcntl, so two processes don't download the same tail twice.
+"""
+import os
+import re
+import time
+import tempfile
+import contextlib
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+import providers
+from providers import period_start
+
+try:
+    import fcntl
+except ImportError: # Windows: atomic replace still keeps readers safe
+    fcntl = None
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.environ.get('JUGAR_BAR_CACHE', os.path.join(BASE_DIR, '.cache', 'bars'))
+# Don't hit upstream again if the file was refreshed less than this many seconds ago
+MIN_REFRESH_SECONDS = 60
+
+class BarCache:
+    def __init__(self, root=CACHE_DIR, provider=None, min_refresh=MIN_REFRESH_SECONDS):
+        """provider: a providers.MarketDataProvider; None follows providers.get_provider()."""
+        self.root = root
+        self._provider = provider
+        self.min_refresh = min_refresh
+
+    @property
+    def provider(self):
+        return self._provider or providers.get_provider()
+
+    def fetch(self, ticker, period=None, start=None, interval='1d'):
+        return self.provider.history(ticker, period=period, start=start, interval=interval)
+
+    def path(self, ticker, interval='1d'):
+        # One sub-directory per provider, so synthetic and live bars never mix
+        safe = re.sub(r'[^A-Za-z0-9._=^-]', '_', ticker.upper())
+        return os.path.join(self.root, self.provider.name, f"{safe}_{interval}.parquet")
+
+    def load(self, ticker, interval='1d'):
+        """(bars, meta) from disk, or (None, {}) if nothing is cached."""
+        path = self.path(ticker, interval)
+        try:
+            table = pq.read_table(path)
+        except (OSError, pa.ArrowInvalid):
+            return None, {}
+        meta = {k.decode(): v.decode() for k, v in (table.schema.metadata or {}).items()
+                if k.startswith(b'jugar.')}
+        return table.to_pandas(), meta
+
+    def history(self, ticker, period='6mo', interval='1d'):
+        """Bars for `period`, served from disk and topped up with only the missing tail."""
+        start = period_start(period)
+        cached, meta = self.load(ticker, interval)
+        if self._fresh(cached, meta, start):
+            return self._window(cached, start)
+
+        with self._lock(ticker, interval):
+            # Another process may have refreshed the file while we waited for the lock
+            cached, meta = self.load(ticker, interval)
+            if self._fresh(cached, meta, start):
+                return self._window(cached, start)
+            try:
+                bars, covered_from = self._refresh(ticker, period, interval, start, cached, meta)
+            except Exception:
+                if cached is None or not self._covers(cached, meta, start):
+                    raise
+                return self._window(cached, start) # upstream down: serve what we have
+            if not bars.empty:
+                self._write(ticker, interval, bars, covered_from)
+        return self._window(bars, start)
+
+    def _covers(self, cached, meta, start):
+        if cached is None or cached.empty:
+            return False
+        covered_from = meta.get('jugar.covered_from')
+        if covered_from == 'max':
+            return True
+        return start is not None and covered_from is not None and pd.Timestamp(covered_from) <= start
+
+    def _fresh(self, cached, meta, start):
+        fetched_at = float(meta.get('jugar.fetched_at', 0))
+        return self._covers(cached, meta, start) and time.time() - fetched_at < self.min_refresh
+
+    def _refresh(self, ticker, period, interval, start, cached, meta):
+        """Returns (merged bars, covered_from) after fetching the tail or the full window."""
+        if not self._covers(cached, meta, start):
+            fresh = self.fetch(ticker, period=period, interval=interval)
+            covered_from = 'max' if start is None else start.isoformat()
+            if cached is not None and not cached.empty and not fresh.empty:
+                fresh = self._merge(cached, fresh)
+            return fresh, covered_from
+
+        tail = self.fetch(ticker, start=cached.index[-1].strftime('%Y-%m-%d'), interval=interval)
+        return self._merge(cached, tail), meta['jugar.covered_from']
+
+    @staticmethod
+    def _merge(cached, fresh):
+        """Union of both frames; overlapping bars take the freshly fetched values."""
+        if fresh.empty:
+            return cached
+        if cached.index.tz is not None and fresh.index.tz is not None:
+            fresh = fresh.tz_convert(cached.index.tz)
+        merged = pd.concat([cached[~cached.index.isin(fresh.index)], fresh])
+        return merged.sort_index()
+
+    @staticmethod
+    def _window(bars, start):
+        return providers.window(bars, start=start).copy()
+
+    def _write(self, ticker, interval, bars, covered_from):
+        path = self.path(ticker, interval)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        table = pa.Table.from_pandas(bars)
+        meta = dict(table.schema.metadata or {})
+        meta[b'jugar.covered_from'] = str(covered_from).encode()
+        meta[b'jugar.fetched_at'] = repr(time.time()).encode()
+        table = table.replace_schema_metadata(meta)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        os.close(fd)
+        try:
+            pq.write_table(table, tmp)
+            os.replace(tmp, path) # atomic: readers see old or new, never half
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+    @contextlib.contextmanager
+    def _lock(self, ticker, interval):
+        if fcntl is None:
+            yield
+            return
+        path = self.path(ticker, interval)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path + '.lock', 'a') as fh:
+            fcntl.flock(fh, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(fh, fcntl.LOCK_UN)
@@ -0,0 +1,156 @@
+"""
+Vectorized indicators for a whole universe at once.
+
+Inputs are aligned tickers x time arrays (one row per ticker, one column per bar).
+Tickers with a shorter history are NaN-padded on the left; a gap inside a history is
+a NaN bar. Every row gives the same numbers as running the pandas code in
+market_data (rolling(20).mean/std, Bollinger bands, calculate_rsi) on that ticker's
+own frame, without a per-ticker loop:
+
+  - SMA and the RSI gain/loss means use cumulative sums (O(T) per row, any window)
+  - the rolling standard deviation is a two-pass sum over `window` shifted
+    (strided) slices of the array, so no N x T x window temporary is built
+
+stack() builds the arrays from {ticker: DataFrame}.
+"""
+import numpy as np
+import pandas as pd
+
+NAN = np.nan
+
+def stack(frames, columns=('Open', 'High', 'Low', 'Close', 'Volume')):
+    """
+    {ticker: OHLCV frame} -> (tickers, index, {column: tickers x time float64 array}).
+    Rows are aligned on the union of the dates; missing bars are NaN.
+    """
+    tickers = list(frames)
+    index = None
+    for df in frames.values():
+        index = df.index if index is None else index.union(df.index)
+    if index is None:
+        index = pd.DatetimeIndex([])
+    arrays = {col: np.full((len(tickers), len(index)), NAN) for col in columns}
+    for row, ticker in enumerate(tickers):
+        df = frames[ticker]
+        pos = index.get_indexer(df.index)
+        for col in columns:
+            arrays[col][row, pos] = df[col].to_numpy(dtype=float)
+    return tickers, index, arrays
+
+def _window_sums(x, window):
+    """Sum of every trailing `window` along axis 1 (columns < window-1 are undefined)."""
+    c = np.cumsum(x, axis=1)
+    out = np.empty_like(c)
+    out[:, :window] = c[:, :window]
+    out[:, window:] = c[:, window:] - c[:, :-window]
+    return out
+
+def first_valid(x):
+    """Column of the first non-NaN value per row (the row length if there is none)."""
+    valid = ~np.isnan(x)
+    return np.where(valid.any(axis=1), valid.argmax(axis=1), x.shape[1])
+
+def rolling_mean(x, window):
+    """pandas rolling(window).mean() per row: NaN unless the whole window is present."""
+    x = np.asarray(x, dtype=float)
+    nan = np.isnan(x)
+    # Centre every row on its first value so the cumulative sums stay small (precision)
+    offset = x[np.arange(len(x)), np.minimum(first_valid(x), x.shape[1] - 1)]
+    offset = np.where(np.isnan(offset), 0.0, offset)[:, None]
+    centred = np.where(nan, 0.0, x - offset)
+    out = _window_sums(centred, window) / window + offset
+    missing = _window_sums(nan.astype(np.int32), window)
+    out[missing > 0] = NAN
+    out[:, :window - 1] = NAN
+    return out
+
+def rolling_std(x, window, ddof=1, mean=None):
+    """
+    pandas rolling(window).std() per row. Two-pass: the squared deviations from the
+    (cumsum) rolling mean are accumulated over `window` shifted slices, so every
+    window is handled at once without an N x T x window temporary.
+    """
+    x = np.asarray(x, dtype=float)
+    n, t = x.shape
+    out = np.full(x.shape, NAN)
+    if t < window or window < 2:
+        return out
+    m = (rolling_mean(x, window) if mean is None else mean)[:, window - 1:]
+    acc = np.zeros_like(m)
+    d = np.empty_like(m)
+    for k in range(window): # k-th value of every window (NaN anywhere -> NaN)
+        np.subtract(x[:, k:t - window + 1 + k], m, out=d)
+        np.multiply(d, d, out=d)
+        acc += d
+    out[:, window - 1:] = np.sqrt(acc / (window - ddof))
+    # A flat window (no move between its values) is exactly 0, as in pandas
+    moves = _window_sums((np.diff(x, axis=1) != 0).astype(np.int32), window - 1)
+    flat = moves[:, window - 2:] == 0
+    out[:, window - 1:][flat] = 0.0
+    return out
+
+def rsi(close, window=14, method='rolling'):
+    """
+    RSI per row. method='rolling' is calculate_rsi (the first bar of each history counts
+    as a zero move); method='wilder' matches indicators.RSI(window, 'wilder').
+    """
+    close = np.asarray(close, dtype=float)
+    n, t = close.shape
+    delta = np.diff(close, axis=1, prepend=NAN)
+    # NaN moves (first bar, padding, gaps) are no move, like pandas' where()
+    gain = np.where(delta > 0, delta, 0.0)
+    loss = np.where(delta < 0, -delta, 0.0)
+    start = first_valid(close)[:, None]
+    cols = np.arange(t)[None, :]
+
+    if method == 'rolling':
+        avg_gain = _window_sums(gain, window) / window
+        avg_loss = _window_sums(loss, window) / window
+        # All-flat windows are exactly 0 (no cumsum residue)
+        avg_gain[_window_sums((gain > 0).astype(np.int32), window) == 0] = 0.0
+        avg_loss[_window_sums((loss > 0).astype(np.int32), window) == 0] = 0.0
+        ready = cols >= start + window - 1
+    elif method == 'wilder':
+        avg_gain, avg_loss = np.full((n, t), NAN), np.full((n, t), NAN)
+        seed_col = (start + window).ravel() # first `window` real moves are averaged
+        g, l = np.full(n, NAN), np.full(n, NAN)
+        sums_g, sums_l = _window_sums(gain, window) / window, _window_sums(loss, window) / window
+        for col in range(t):
+            seeding = seed_col == col
+            g = np.where(seeding, sums_g[:, col], g + (gain[:, col] - g) / window)
+            l = np.where(seeding, sums_l[:, col], l + (loss[:, col] - l) / window)
+            avg_gain[:, col], avg_loss[:, col] = g, l
+        ready = cols >= start + window
+    else:
+        raise ValueError(f"Unknown RSI method: {method!r}")
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        out = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    out[(avg_loss == 0) & (avg_gain > 0)] = 100.0
+    out[(avg_loss == 0) & (avg_gain == 0)] = NAN
+    out[~ready] = NAN
+    return out
+
+def volume_colors(open_, close, up='#00ff00', down='#ff2a2a'):
+    """Bar colour per (ticker, bar): `up` where close >= open (NaN bars are `down`)."""
+    return np.where(np.asarray(close) >= np.asarray(open_), up, down)
+
+def compute(open_, close, window=20, num_std=2, rsi_window=14, rsi_method='rolling'):
+    """
+    Every chart indicator for every ticker: {SMA_<w>, STD_<w>, Upper_BB, Lower_BB, RSI, Up}.
+    `Up` is the close >= open mask behind the volume colouring.
+    """
+    close = np.asarray(close, dtype=float)
+    sma = rolling_mean(close, window)
+    std = rolling_std(close, window, mean=sma)
+    # Flat windows: the mean is exactly the value, as in pandas
+    flat = std == 0
+    sma[flat] = close[flat]
+    return {
+        f'SMA_{window}': sma,
+        f'STD_{window}': std,
+        'Upper_BB': sma + std * num_std,
+        'Lower_BB': sma - std * num_std,
+        'RSI': rsi(close, rsi_window, rsi_method),
+        'Up': np.asarray(close) >= np.asarray(open_, dtype=float),
+    }
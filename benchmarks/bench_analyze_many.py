@@ -0,0 +1,41 @@
+"""
+Throughput of analyze() in a loop vs analyze_many() for both model-backed engines.
+Usage: python benchmarks/bench_analyze_many.py
+"""
+import time
+
+from fixtures import make_headlines
+from engine import SentimentEngine
+from nlp_engine import SentimentBrain
+
+BATCH_SIZES = (1, 100, 10_000)
+
+def _tag(i):
+    """Letters-only suffix (digits are stripped by the cleaners)."""
+    return ''.join(chr(97 + int(d)) for d in str(i))
+
+def _throughput(fn, texts, cache, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        cache.clear() # time the scorer, not the result cache
+        t0 = time.perf_counter()
+        fn(texts)
+        best = min(best, time.perf_counter() - t0)
+    return len(texts) / best
+
+def run():
+    for name, engine in (("engine.SentimentEngine", SentimentEngine()),
+                         ("nlp_engine.SentimentBrain", SentimentBrain())):
+        print(f"\n{name} (fallback={engine.use_fallback})")
+        print(f"{'batch':>8} {'analyze/s':>14} {'analyze_many/s':>16} {'speedup':>9}")
+        for n in BATCH_SIZES:
+            # Unique texts, so in-batch de-duplication doesn't flatter the numbers
+            texts = [f"{h} {_tag(i)}" for i, h in enumerate(make_headlines(n))]
+            # Parity check before timing
+            assert [r['label'] for r in engine.analyze_many(texts)] == [engine.analyze(t)['label'] for t in texts]
+            single = _throughput(lambda ts: [engine.analyze(t) for t in ts], texts, engine.cache, repeat=1 if n > 1000 else 3)
+            batch = _throughput(engine.analyze_many, texts, engine.cache)
+            print(f"{n:>8} {single:>14,.0f} {batch:>16,.0f} {batch / single:>8.1f}x")
+
+if __name__ == "__main__":
+    run()
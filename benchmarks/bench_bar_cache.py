@@ -0,0 +1,57 @@
+"""
+Upstream traffic and time-to-data for market data with and without the on-disk bar cache.
+The upstream is a synthetic provider with a simulated network cost, so it runs offline.
+Usage: python benchmarks/bench_bar_cache.py
+"""
+import time
+import tempfile
+
+from fixtures import TICKERS
+import bar_cache
+from providers import MarketDataProvider, RandomWalkProvider
+
+ROUND_TRIP_S = 0.15
+PER_BAR_S = 0.0002
+
+class SimulatedUpstream(MarketDataProvider):
+    """Synthetic bars with a network cost model (round trip + per-bar transfer)."""
+    name = "simulated"
+
+    def __init__(self):
+        self.source = RandomWalkProvider(seed=7)
+        self.calls = 0
+        self.bars = 0
+
+    def history(self, ticker, period=None, start=None, interval='1d'):
+        df = self.source.history(ticker, period=period, start=start, interval=interval)
+        self.calls += 1
+        self.bars += len(df)
+        time.sleep(ROUND_TRIP_S + PER_BAR_S * len(df))
+        return df
+
+def _scenario(name, fetch_all):
+    t0 = time.perf_counter()
+    fetch_all()
+    return name, time.perf_counter() - t0
+
+def run(period='5y'):
+    upstream = SimulatedUpstream()
+    rows = []
+    with tempfile.TemporaryDirectory() as root:
+        # No cache: the pre-cache behaviour, full window on every call
+        rows.append(_scenario("no cache", lambda: [upstream(t, period=period) for t in TICKERS]))
+        rows[-1] += (upstream.calls, upstream.bars)
+
+        for label, min_refresh in (("cold cache", 0), ("restart (tail only)", 0), ("warm (<60s)", 60)):
+            upstream.calls = upstream.bars = 0
+            cache = bar_cache.BarCache(root, provider=upstream, min_refresh=min_refresh) # new object = restart
+            rows.append(_scenario(label, lambda: [cache.history(t, period) for t in TICKERS]))
+            rows[-1] += (upstream.calls, upstream.bars)
+
+    print(f"{len(TICKERS)} tickers x {period} daily bars")
+    print(f"{'scenario':>20} {'seconds':>8} {'calls':>6} {'bars downloaded':>16}")
+    for name, seconds, calls, bars in rows:
+        print(f"{name:>20} {seconds:>8.2f} {calls:>6} {bars:>16,}")
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,63 @@
+"""
+Universe-wide indicators on tickers x time arrays vs a per-ticker pandas loop.
+Usage: python benchmarks/bench_batch_indicators.py [tickers] [bars]
+"""
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+import fixtures # noqa: F401 (puts the project root on sys.path)
+import batch_indicators
+from market_data import calculate_rsi
+
+def make_universe(n, t, seed=5):
+    """Random-walk OHLC with NaN-padded (shorter) histories for a quarter of the tickers."""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0002, 0.02, (n, t)), axis=1))
+    open_ = close * np.exp(rng.normal(0, 0.005, (n, t)))
+    lengths = np.where(rng.random(n) < 0.25, rng.integers(30, t, n), t)
+    pad = np.arange(t)[None, :] < (t - lengths)[:, None]
+    close[pad] = np.nan
+    open_[pad] = np.nan
+    return open_, close, lengths
+
+def pandas_ticker(open_, close):
+    """The per-ticker pandas code from market_data.get_chart."""
+    c = pd.Series(close)
+    sma = c.rolling(window=20).mean()
+    std = c.rolling(window=20).std()
+    colors = ['#00ff00' if c >= o else '#ff2a2a' for c, o in zip(close, open_)]
+    return sma, std, sma + std * 2, sma - std * 2, calculate_rsi(c), colors
+
+def run(n=5000, t=252):
+    open_, close, lengths = make_universe(n, t)
+
+    t0 = time.perf_counter()
+    out = batch_indicators.compute(open_, close)
+    colors = batch_indicators.volume_colors(open_, close)
+    batch_s = time.perf_counter() - t0
+
+    sample = range(0, n, max(1, n // 200))
+    t0 = time.perf_counter()
+    refs = {i: pandas_ticker(open_[i, t - lengths[i]:], close[i, t - lengths[i]:]) for i in sample}
+    loop_s = (time.perf_counter() - t0) / len(refs) * n
+
+    worst = 0.0
+    for i, (sma, std, upper, lower, rsi, cols) in refs.items():
+        k = t - lengths[i]
+        for name, ref in (('SMA_20', sma), ('STD_20', std), ('Upper_BB', upper), ('Lower_BB', lower), ('RSI', rsi)):
+            got, exp = out[name][i, k:], ref.to_numpy()
+            assert np.array_equal(np.isnan(got), np.isnan(exp)), (i, name)
+            m = ~np.isnan(exp)
+            worst = max(worst, float(np.max(np.abs(got[m] - exp[m]) / np.maximum(1.0, np.abs(exp[m])), initial=0)))
+        assert list(colors[i, k:]) == cols
+
+    print(f"{n} tickers x {t} bars ({(lengths < t).sum()} with shorter, NaN-padded history)")
+    print(f"  vectorized:        {batch_s:.2f}s")
+    print(f"  per-ticker pandas: {loop_s:.2f}s (extrapolated from {len(refs)} tickers)")
+    print(f"  speed-up: {loop_s / batch_s:.0f}x, max relative diff {worst:.1e}")
+
+if __name__ == "__main__":
+    run(*[int(a) for a in sys.argv[1:]])
@@ -0,0 +1,57 @@
+"""
+Chart payload size and build time, before/after the chart_data reduction stage.
+"Before" is the previous get_chart trace code (every bar, float64, per-bar colour list).
+Usage: python benchmarks/bench_chart_payload.py [width_px]
+"""
+import sys
+import time
+
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+import fixtures # noqa: F401 (puts the project root on sys.path)
+from providers import RandomWalkProvider
+from indicators import IndicatorBook
+import market_data
+
+SERIES = [("6mo daily", "6mo", "1d"), ("5y daily", "5y", "1d"), ("1-min bars (1mo)", "1mo", "1m")]
+
+def legacy_chart(ticker, df):
+    """market_data.get_chart before the reduction stage (same indicators, full-resolution traces)."""
+    fig = make_subplots(rows=2, cols=1, shared_xaxes=True, vertical_spacing=0.05, row_heights=[0.75, 0.25])
+    fig.add_trace(go.Candlestick(x=df.index, open=df['Open'], high=df['High'], low=df['Low'], close=df['Close'],
+                                 name='OHLC', increasing_line_color='#00ff00', decreasing_line_color='#ff2a2a'), row=1, col=1)
+    fig.add_trace(go.Scatter(x=df.index, y=df['SMA_20'], mode='lines', name='SMA 20',
+                             line=dict(color='#FFD700', width=2)), row=1, col=1)
+    fig.add_trace(go.Scatter(x=df.index, y=df['Upper_BB'], mode='lines', name='Upper BB',
+                             line=dict(width=0), showlegend=False), row=1, col=1)
+    fig.add_trace(go.Scatter(x=df.index, y=df['Lower_BB'], mode='lines', name='Lower BB', line=dict(width=0),
+                             fill='tonexty', fillcolor='rgba(255, 215, 0, 0.1)', showlegend=False), row=1, col=1)
+    colors = ['#00ff00' if c >= o else '#ff2a2a' for c, o in zip(df['Close'], df['Open'])]
+    fig.add_trace(go.Bar(x=df.index, y=df['Volume'], name='Volume', marker_color=colors, opacity=0.5), row=2, col=1)
+    fig.update_layout(template="plotly_dark", height=500, title=dict(text=f"{ticker} MARKET VECTOR"),
+                      hovermode="x unified", xaxis_rangeslider_visible=False, showlegend=False)
+    return fig
+
+def _measure(build, repeats=5):
+    best = None
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        payload = build().to_json() # what Streamlit ships to the browser
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+    return len(payload), best
+
+def run(width=None):
+    source = RandomWalkProvider(seed=4)
+    print(f"{'series':>18} {'bars':>6} {'before':>11} {'after':>10} {'ratio':>6} {'build before':>13} {'after':>8}")
+    for label, period, interval in SERIES:
+        bars = source.history("AAPL", period=period, interval=interval)
+        df = IndicatorBook().apply("AAPL", bars)
+        before, t_before = _measure(lambda: legacy_chart("AAPL", df))
+        after, t_after = _measure(lambda: market_data.get_chart("AAPL", bars, width=width)[0])
+        print(f"{label:>18} {len(bars):>6} {before:>9,} B {after:>8,} B {before / after:>5.1f}x "
+              f"{t_before * 1000:>10.0f} ms {t_after * 1000:>5.0f} ms")
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else None)
@@ -0,0 +1,70 @@
+"""
+CompactScorer (model.npz) vs the pickled sklearn pair: parity, cold start, RSS and
+per-headline latency. Run `python train_model.py --export --model model.pkl --tfidf tfidf.pkl` first.
+Usage: python benchmarks/bench_compact_scorer.py
+"""
+import sys
+import json
+import time
+import subprocess
+
+from fixtures import ROOT, make_headlines
+import model_registry
+from engine import SentimentEngine
+
+CHILD = r'''
+import sys, time, json
+t0 = time.perf_counter()
+sys.path.insert(0, {root!r})
+import warnings; warnings.simplefilter("ignore")
+import model_registry
+reg = model_registry.ModelRegistry(use_compact={compact})
+art = reg.get_artifacts()
+if art.scorer is not None:
+    art.scorer.score_many(["stocks surge on record profit"])
+else:
+    art.model.predict_proba(art.vectorizer.transform(["stocks surge on record profit"]))
+rss = 0
+with open("/proc/self/status") as fh:
+    for line in fh:
+        if line.startswith("VmRSS:"): rss = int(line.split()[1]) / 1024
+print(json.dumps({{"cold_ms": (time.perf_counter() - t0) * 1000, "rss_mb": rss,
+                  "sklearn": "sklearn" in sys.modules, "compact": art.scorer is not None}}))
+'''
+
+def _latency_us(fn, texts):
+    t0 = time.perf_counter()
+    for t in texts:
+        fn([t])
+    return (time.perf_counter() - t0) / len(texts) * 1e6
+
+def run():
+    sk = model_registry.ModelRegistry(use_compact=False).get_artifacts()
+    compact = model_registry.ModelRegistry().get_artifacts().scorer
+    if compact is None:
+        sys.exit("model.npz missing or stale - run train_model.py --export first")
+
+    engine = SentimentEngine()
+    texts = [engine._clean_text(t) for t in make_headlines(5000)]
+    expected = sk.model.predict_proba(sk.vectorizer.transform(texts))[:, 1]
+    diff = abs(compact.score_many(texts) - expected).max()
+    print(f"parity on {len(texts):,} headlines: max |dp| = {diff:.2e} ({'OK' if diff <= 1e-9 else 'FAIL'})")
+
+    print(f"\n{'path':>8} {'cold start ms':>14} {'RSS MB':>8} {'sklearn imported':>17}")
+    for use_compact in (False, True):
+        out = subprocess.run([sys.executable, "-c", CHILD.format(root=ROOT, compact=use_compact)],
+                             capture_output=True, text=True, check=True)
+        res = json.loads(out.stdout.strip().splitlines()[-1])
+        name = "compact" if res["compact"] else "sklearn"
+        print(f"{name:>8} {res['cold_ms']:>14.0f} {res['rss_mb']:>8.0f} {str(res['sklearn']):>17}")
+
+    sample = texts[:2000]
+    sk_us = _latency_us(lambda b: sk.model.predict_proba(sk.vectorizer.transform(b)), sample)
+    cs_us = _latency_us(compact.score_many, sample)
+    print(f"\nper-headline latency: sklearn {sk_us:.0f} us, compact {cs_us:.0f} us")
+    t0 = time.perf_counter(); sk.model.predict_proba(sk.vectorizer.transform(texts)); sk_b = time.perf_counter() - t0
+    t0 = time.perf_counter(); compact.score_many(texts); cs_b = time.perf_counter() - t0
+    print(f"batch of {len(texts):,}: sklearn {len(texts) / sk_b:,.0f}/s, compact {len(texts) / cs_b:,.0f}/s")
+
+if __name__ == "__main__":
+    run()
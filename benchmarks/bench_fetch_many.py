@@ -0,0 +1,66 @@
+"""
+Concurrent multi-ticker fetch and in-flight request coalescing (offline, simulated latency).
+Usage: python benchmarks/bench_fetch_many.py
+"""
+import time
+import threading
+
+from fixtures import TICKERS
+import providers
+import market_data
+
+ROUND_TRIP_S = 0.2
+
+class SlowProvider(providers.RandomWalkProvider):
+    """Synthetic bars behind a fixed network round trip; counts upstream calls."""
+    name = "slow-synthetic"
+    cacheable = False
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.calls = 0
+        self._count_lock = threading.Lock()
+
+    def history(self, ticker, period=None, start=None, interval='1d'):
+        with self._count_lock:
+            self.calls += 1
+        time.sleep(ROUND_TRIP_S)
+        if ticker.upper().startswith("BAD"):
+            raise KeyError(f"unknown symbol {ticker}")
+        return super().history(ticker, period=period, start=start, interval=interval)
+
+def run(sessions=50):
+    upstream = SlowProvider(seed=3)
+    providers.set_provider(upstream)
+
+    t0 = time.perf_counter()
+    for t in TICKERS:
+        market_data.load_history(t, "6mo")
+    sequential = time.perf_counter() - t0
+
+    market_data.MARKET_CACHE.clear() # measure downloads, not the shared cache
+    t0 = time.perf_counter()
+    results = market_data.fetch_many(TICKERS + ["BAD-TICKER"], "6mo")
+    concurrent = time.perf_counter() - t0
+    failed = {t: repr(r.error) for t, r in results.items() if not r.ok}
+
+    # `sessions` threads asking for the same symbol at the same moment
+    market_data.MARKET_CACHE.clear()
+    upstream.calls = 0
+    barrier = threading.Barrier(sessions)
+    def session():
+        barrier.wait()
+        market_data.load_history("BTC-USD", "6mo")
+    threads = [threading.Thread(target=session) for _ in range(sessions)]
+    t0 = time.perf_counter()
+    for th in threads: th.start()
+    for th in threads: th.join()
+    stampede = time.perf_counter() - t0
+
+    print(f"{len(TICKERS)} tickers, {ROUND_TRIP_S * 1000:.0f} ms simulated round trip")
+    print(f"  sequential load_history: {sequential:.2f}s")
+    print(f"  fetch_many (+1 bad):     {concurrent:.2f}s   errors: {failed}")
+    print(f"  {sessions} concurrent sessions, same ticker: {stampede:.2f}s, upstream calls: {upstream.calls}")
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,43 @@
+"""
+Figure-build latency per call: cached skeleton + data swap (figures.render) vs a full
+rebuild (make_subplots, add_trace, update_layout), and a check that both serialize to
+the same figure.
+Usage: python benchmarks/bench_figures.py [calls]
+"""
+import sys
+import json
+import time
+
+import plotly.io as pio
+
+import fixtures # noqa: F401 (puts the project root on sys.path)
+from providers import RandomWalkProvider
+import market_data
+import plots
+
+def _per_call_ms(fn, calls):
+    fn() # skeleton built here (cached path) / plotly validators imported
+    t0 = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - t0) / calls * 1000
+
+def _spec(fig):
+    return json.loads(pio.to_json(fig, validate=False))
+
+def run(calls=50):
+    bars = RandomWalkProvider(seed=9).history("AAPL", "6mo")
+    cases = [
+        ("get_chart (candles+SMA+bands+volume)", lambda cached: market_data.get_chart("AAPL", bars, cached=cached)[0]),
+        ("plot_gauge", lambda cached: plots.plot_gauge(0.73, cached=cached)),
+        ("plot_stock_history", lambda cached: plots.plot_stock_history("AAPL", bars, cached=cached)),
+    ]
+    print(f"{'figure':>38} {'rebuild':>9} {'cached':>8} {'speed-up':>9} identical")
+    for name, build in cases:
+        before = _per_call_ms(lambda: build(False), calls)
+        after = _per_call_ms(lambda: build(True), calls)
+        same = _spec(build(False)) == _spec(build(True))
+        print(f"{name:>38} {before:>6.1f} ms {after:>5.1f} ms {before / after:>8.1f}x {same}")
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 50)
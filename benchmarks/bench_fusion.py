@@ -0,0 +1,113 @@
+"""
+Sentiment / price fusion at scale: minute bars for hundreds of tickers and millions
+of headlines. Times the initial as-of join, the fused frames, and an incremental
+tick (one new bar + a few headlines per ticker) against rebuilding everything, and
+checks the fused columns against a pandas merge_asof / groupby / rolling reference.
+Usage: python benchmarks/bench_fusion.py [tickers] [bars per ticker] [headlines]
+"""
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+import fixtures # noqa: F401 (puts the project root on sys.path)
+from fusion import FusionBook, BYTES_PER_BAR
+
+WINDOW, HALFLIFE, HORIZONS = 30, 30, (1, 5, 15)
+
+def make_data(n_tickers, n_bars, n_headlines, seed=9):
+    rng = np.random.default_rng(seed)
+    index = pd.date_range("2024-01-02 09:30", periods=n_bars + 1, freq="min").as_unit('ns')
+    tickers = [f"T{i:03d}" for i in range(n_tickers)]
+    closes = 100 * np.exp(np.cumsum(rng.normal(0, 1e-3, (n_tickers, n_bars + 1)), axis=1))
+    bars = {tk: pd.DataFrame({'Close': closes[i]}, index=index) for i, tk in enumerate(tickers)}
+    span = (index[-1] - index[0]).value
+    heads = pd.DataFrame({
+        'ticker': np.array(tickers)[rng.integers(0, n_tickers, n_headlines)],
+        'time': index[0] + pd.to_timedelta(rng.integers(0, span, n_headlines), unit='ns'),
+        'score': rng.random(n_headlines),
+    })
+    return tickers, bars, heads
+
+def reference(bars, heads):
+    """The pandas way for one ticker: merge_asof, groupby, rolling, a Python EWM loop."""
+    close = bars['Close']
+    b = pd.DataFrame({'time': close.index, 'bar': np.arange(len(close))})
+    m = pd.merge_asof(heads.sort_values('time'), b, on='time').dropna(subset=['bar'])
+    g = m.groupby('bar')['score'].agg(['sum', 'count']).reindex(range(len(close)), fill_value=0)
+    rs = g['sum'].rolling(WINDOW, min_periods=1).sum()
+    rc = g['count'].rolling(WINDOW, min_periods=1).sum()
+    a, es, ec, ewm = 0.5 ** (1 / HALFLIFE), 0.0, 0.0, []
+    for x, c in zip(g['sum'].tolist(), g['count'].tolist()):
+        es, ec = a * es + x, a * ec + c
+        ewm.append(es / ec if ec > 1e-12 else np.nan)
+    out = pd.DataFrame({'sentiment': (g['sum'] / g['count'].replace(0, np.nan)).to_numpy(),
+                        f'sentiment_{WINDOW}': (rs / rc.replace(0, np.nan)).to_numpy(), 'sentiment_ewm': ewm},
+                       index=close.index)
+    for h in HORIZONS:
+        out[f'fwd_return_{h}'] = (close.shift(-h) / close - 1).to_numpy()
+    return out
+
+def run(n_tickers=200, n_bars=10_000, n_headlines=2_000_000):
+    tickers, bars, heads = make_data(n_tickers, n_bars, n_headlines)
+    print(f"{n_tickers} tickers x {n_bars:,} minute bars, {n_headlines:,} headlines")
+    book = FusionBook(window=WINDOW, halflife=HALFLIFE, horizons=HORIZONS)
+
+    t0 = time.perf_counter()
+    for tk in tickers:
+        book.add_bars(tk, bars[tk].iloc[:-1]) # the last bar arrives in the incremental tick
+    t_bars = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    book.add_headlines(heads['ticker'], heads['time'], heads['score'])
+    t_join = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    frames = {tk: book.frame(tk) for tk in tickers}
+    t_frames = time.perf_counter() - t0
+    stats = book.stats()
+    print(f"add_bars: {t_bars:.2f}s   as-of join: {t_join:.2f}s ({n_headlines / t_join:,.0f} headlines/s)"
+          f"   all frames: {t_frames:.2f}s")
+    print(f"memory: {stats['nbytes'] / 1e6:.0f} MB for {stats['bars']:,} bars "
+          f"({BYTES_PER_BAR} B/bar + growth headroom), {stats['dropped']:,} headlines before the first bar")
+
+    # Parity on a few tickers (the pandas reference is slow: a Python loop for the EWM)
+    sample = tickers[:3]
+    t0 = time.perf_counter()
+    for tk in sample:
+        ref = reference(bars[tk].iloc[:-1], heads[heads['ticker'] == tk])
+        pd.testing.assert_frame_equal(frames[tk][ref.columns].reset_index(drop=True), ref.reset_index(drop=True),
+                                      check_dtype=False, rtol=1e-8)
+    t_ref = (time.perf_counter() - t0) / len(sample)
+    print(f"parity: {len(sample)} tickers match the pandas reference "
+          f"({t_ref * 1e3:.0f} ms per ticker there vs {t_frames / n_tickers * 1e3:.1f} ms here)")
+
+    # Incremental tick: one new bar and 10 headlines per ticker, then the last hour of each frame
+    rng = np.random.default_rng(1)
+    last = bars[tickers[0]].index[-1]
+    tick = pd.DataFrame({'ticker': np.repeat(tickers, 10),
+                         'time': last + pd.to_timedelta(rng.integers(0, 60_000_000_000, 10 * n_tickers), unit='ns'),
+                         'score': rng.random(10 * n_tickers)})
+    t0 = time.perf_counter()
+    for tk in tickers:
+        book.add_bars(tk, bars[tk].iloc[-1:])
+    book.add_headlines(tick['ticker'], tick['time'], tick['score'])
+    recent = {tk: book.frame(tk, start=last - pd.Timedelta("59min")) for tk in tickers}
+    t_tick = time.perf_counter() - t0
+    assert all(len(f) == 60 for f in recent.values())
+
+    t0 = time.perf_counter()
+    rebuilt = FusionBook(window=WINDOW, halflife=HALFLIFE, horizons=HORIZONS)
+    for tk in tickers:
+        rebuilt.add_bars(tk, bars[tk])
+    rebuilt.add_headlines(pd.concat([heads['ticker'], tick['ticker']]), pd.concat([heads['time'], tick['time']]),
+                          pd.concat([heads['score'], tick['score']]))
+    full = {tk: rebuilt.frame(tk) for tk in tickers}
+    t_full = time.perf_counter() - t0
+    for tk in tickers[:5]:
+        pd.testing.assert_frame_equal(recent[tk], full[tk].iloc[-60:], rtol=1e-9)
+    print(f"incremental tick ({n_tickers} bars + {len(tick):,} headlines): {t_tick * 1e3:.0f} ms"
+          f" vs {t_full:.2f}s to rebuild everything (results identical)")
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:]]
+    run(*args)
@@ -0,0 +1,42 @@
+"""
+Reproducible market_data.get_chart latency, fed by the offline synthetic provider
+(no network, no on-disk cache involved).
+Usage: python benchmarks/bench_get_chart.py [calls]
+"""
+import sys
+import time
+import statistics
+
+from fixtures import TICKERS
+import providers
+import market_data
+
+class InMemoryProvider(providers.RandomWalkProvider):
+    """Synthetic bars, generated once per ticker and served from memory (isolates chart cost)."""
+    cacheable = False
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._frames = {}
+
+    def history(self, ticker, period=None, start=None, interval='1d'):
+        if ticker not in self._frames:
+            self._frames[ticker] = super().history(ticker, period='max', interval=interval)
+        return providers.window(self._frames[ticker], period, start).copy()
+
+def run(calls=50):
+    providers.set_provider(InMemoryProvider(seed=1))
+    for t in TICKERS:
+        market_data.get_chart(t) # warm-up: generate bars, import plotly validators
+    samples = []
+    for i in range(calls):
+        t0 = time.perf_counter()
+        fig, last = market_data.get_chart(TICKERS[i % len(TICKERS)])
+        samples.append((time.perf_counter() - t0) * 1000)
+        assert fig is not None
+    samples.sort()
+    print(f"get_chart over {calls} calls: median {statistics.median(samples):.1f} ms, "
+          f"p90 {samples[int(0.9 * (calls - 1))]:.1f} ms, min {samples[0]:.1f} ms")
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 50)
@@ -0,0 +1,101 @@
+"""
+Load test for the sentiment engines, fed by simulator.HeadlineStream.
+
+  1. saturation: headlines scored back to back (analyze, or analyze_many in batches)
+     -> the engine's capacity in headlines/s
+  2. open loop: headlines arrive in real time at `rate` (steady / poisson / bursty);
+     latency is measured from each headline's scheduled arrival to its result, so
+     queueing behind a slow call or a burst is included
+
+Usage: python benchmarks/bench_headline_load.py [hybrid|engine|nlp] [rate] [mode] [seconds] [batch]
+"""
+import sys
+import time
+import queue
+import threading
+
+import numpy as np
+
+import fixtures # noqa: F401 (puts the project root on sys.path)
+from simulator import HeadlineStream
+
+def make_engine(name):
+    if name == "hybrid":
+        from hybrid_engine import SentimentBrain
+        return SentimentBrain()
+    if name == "engine":
+        from engine import SentimentEngine
+        return SentimentEngine()
+    if name == "nlp":
+        from nlp_engine import SentimentBrain
+        return SentimentBrain()
+    raise SystemExit(f"unknown engine {name!r} (hybrid, engine, nlp)")
+
+def scorer(engine, batch):
+    """texts -> results, batched through analyze_many when the engine has it."""
+    if batch > 1 and hasattr(engine, "analyze_many"):
+        return engine.analyze_many
+    return lambda texts: [engine.analyze(t) for t in texts]
+
+def percentiles(latencies):
+    ms = np.asarray(latencies) * 1e3
+    return {q: float(np.percentile(ms, q)) for q in (50, 99)} if len(ms) else {50: np.nan, 99: np.nan}
+
+def saturation(engine, batch, n=5_000, seed=1):
+    score = scorer(engine, batch)
+    headlines = HeadlineStream(seed=seed, neutral_share=0.1).take(n)
+    latencies, agree = [], 0
+    t0 = time.perf_counter()
+    for i in range(0, n, batch):
+        part = headlines[i:i + batch]
+        t = time.perf_counter()
+        results = score([h.text for h in part])
+        done = time.perf_counter()
+        latencies.extend([done - t] * len(part))
+        agree += sum(r is not None and r['label'] == h.label.upper() for r, h in zip(results, part))
+    return n / (time.perf_counter() - t0), percentiles(latencies), agree / n
+
+def open_loop(engine, rate, mode, seconds, batch, seed=2):
+    """Producer thread paces the stream; the consumer scores whatever has arrived (up to `batch`)."""
+    score = scorer(engine, batch)
+    stream = HeadlineStream(seed=seed, rate=rate, mode=mode, neutral_share=0.1)
+    inbox = queue.SimpleQueue()
+    start = time.perf_counter()
+
+    def produce():
+        for h in stream.paced(duration=seconds):
+            inbox.put(h)
+        inbox.put(None)
+
+    threading.Thread(target=produce, daemon=True).start()
+    latencies, finished = [], False
+    while not finished:
+        part = [inbox.get()]
+        while len(part) < batch:
+            try:
+                part.append(inbox.get_nowait())
+            except queue.Empty:
+                break
+        if part[-1] is None:
+            finished = True
+            part.pop()
+        if part:
+            score([h.text for h in part])
+            done = time.perf_counter() - start
+            latencies.extend(done - h.ts for h in part)
+    elapsed = time.perf_counter() - start
+    return len(latencies), len(latencies) / elapsed, percentiles(latencies), elapsed
+
+def run(name="hybrid", rate=200.0, mode="poisson", seconds=10.0, batch=1):
+    rate, seconds, batch = float(rate), float(seconds), int(batch)
+    engine = make_engine(name)
+    cap, lat, agree = saturation(engine, batch)
+    print(f"{name} engine, batch {batch}")
+    print(f"  saturation: {cap:,.0f} headlines/s  p50 {lat[50]:.2f} ms  p99 {lat[99]:.2f} ms per call  "
+          f"label agreement {agree:.1%}")
+    n, sustained, lat, elapsed = open_loop(engine, rate, mode, seconds, batch)
+    print(f"  open loop ({mode}, {rate:,.0f}/s offered): {n:,} headlines in {elapsed:.1f}s = {sustained:,.0f}/s sustained  "
+          f"p50 {lat[50]:.2f} ms  p99 {lat[99]:.2f} ms")
+
+if __name__ == "__main__":
+    run(*sys.argv[1:])
@@ -0,0 +1,83 @@
+"""
+HeadlineStore at scale: batched insert throughput into a fresh SQLite file (WAL, both
+indexes and the hourly rollup maintained), then the latency of the aggregate and
+lookup queries, checked against a pandas groupby of the same rows.
+Usage: python benchmarks/bench_headline_store.py [rows] [tickers] [days]
+"""
+import sys
+import time
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+import fixtures # noqa: F401 (puts the project root on sys.path)
+from headline_store import HeadlineStore, HOUR
+from simulator import HeadlineStream
+
+def make_rows(n, n_tickers, days, seed=3):
+    rng = np.random.default_rng(seed)
+    texts = [h.text for h in HeadlineStream(seed=seed).take(min(n, 200_000))]
+    texts = [texts[i % len(texts)] + (f" #{i}" if i >= len(texts) else "") for i in range(n)]
+    tickers = np.array([f"T{i:04d}" for i in range(n_tickers)])[rng.integers(0, n_tickers, n)]
+    start = pd.Timestamp("2024-01-01").timestamp()
+    ts = np.sort(start + rng.uniform(0, days * 86400, n))
+    scores = rng.random(n)
+    labels = np.where(scores > 0.6, "BULLISH", np.where(scores < 0.4, "BEARISH", "NEUTRAL"))
+    results = [{'score': s, 'label': l} for s, l in zip(scores.tolist(), labels.tolist())]
+    return texts, results, tickers.tolist(), ts, start
+
+def best_ms(fn, repeat=20):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        times.append(time.perf_counter() - t0)
+    return min(times) * 1e3, sorted(times)[len(times) // 2] * 1e3, out
+
+def run(n=2_000_000, n_tickers=500, days=30):
+    texts, results, tickers, ts, start = make_rows(n, n_tickers, days)
+    print(f"{n:,} scored headlines, {n_tickers} tickers over {days} days")
+    with tempfile.TemporaryDirectory(prefix="bench-headlines-") as tmp:
+        store = HeadlineStore(f"{tmp}/headlines.sqlite")
+        chunk = 100_000 # what a feed would hand over at a time
+        t0 = time.perf_counter()
+        for i in range(0, n, chunk):
+            store.add_many(texts[i:i + chunk], results[i:i + chunk], tickers[i:i + chunk], ts[i:i + chunk], "bench")
+        store.flush()
+        elapsed = time.perf_counter() - t0
+        stats = store.stats()
+        print(f"insert: {elapsed:.2f}s = {n / elapsed:,.0f} rows/s end to end (hashing included), "
+              f"{stats['rows_per_s']:,.0f} rows/s in SQLite; file {stats['file_mb']:.0f} MB")
+        assert len(store) == n
+
+        # Parity: rollup vs pandas over the raw rows
+        frame = pd.DataFrame({'ticker': tickers, 'hour': (ts // HOUR).astype(np.int64) * HOUR,
+                              'score': [r['score'] for r in results]})
+        expect = frame[frame['ticker'] == "T0007"].groupby('hour')['score'].agg(['count', 'mean'])
+        got = store.hourly("T0007")
+        assert (got['count'].to_numpy() == expect['count'].to_numpy()).all()
+        assert np.allclose(got['mean_score'].to_numpy(), expect['mean'].to_numpy())
+        print(f"parity: hourly rollup for T0007 matches pandas ({len(got)} hours)")
+
+        day = start + 10 * 86400
+        week = start + 7 * 86400
+        queries = [
+            ("hourly: one ticker, one day", lambda: store.hourly("T0007", day, day + 86400)),
+            ("hourly: one ticker, all days", lambda: store.hourly("T0007")),
+            ("hourly: all tickers, one hour", lambda: store.hourly(None, day, day + HOUR)),
+            ("window: one ticker, one day, 15 min", lambda: store.window("T0007", day, day + 86400, 900)),
+            ("window: one ticker, one week, 1 h", lambda: store.window("T0007", week, week + 7 * 86400)),
+            ("lookup: text hash", lambda: store.lookup(texts[n // 2])),
+            ("len() (last rowid)", lambda: len(store)),
+        ]
+        print(f"\n{'query':<40} {'best':>9} {'median':>9} {'rows':>6}")
+        for name, fn in queries:
+            best, median, out = best_ms(fn)
+            rows = out if isinstance(out, int) else len(out)
+            print(f"{name:<40} {best:>7.2f}ms {median:>7.2f}ms {rows:>6}")
+        store.close()
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:]]
+    run(*args)
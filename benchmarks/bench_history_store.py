@@ -0,0 +1,96 @@
+"""
+Session history: the old unbounded list of dicts vs HistoryStore (ring of NumPy
+records + string pool, older entries spilled to SQLite). Checks that both hold the
+same rows and that the store's memory per in-memory entry is BYTES_PER_ENTRY plus
+the text bytes, however many entries were appended.
+Usage: python benchmarks/bench_history_store.py [entries] [capacity]
+"""
+import sys
+import time
+import pickle
+import datetime
+import tempfile
+import tracemalloc
+
+import fixtures # noqa: F401 (puts the project root on sys.path)
+from history_store import HistoryStore, BYTES_PER_ENTRY
+from simulator import HeadlineStream
+
+LABELS = {'Bullish': 'BULLISH', 'Bearish': 'BEARISH', 'Neutral': 'NEUTRAL'}
+
+def make_entries(n, seed=5):
+    stream = HeadlineStream(seed=seed, neutral_share=0.2)
+    t0 = 1.7e9
+    return [(h.text, LABELS[h.label], (i % 97) / 97, (i % 89) / 89, t0 + h.ts)
+            for i, h in enumerate(stream.take(n))]
+
+def as_list(entries):
+    """The old session state: one dict per analysis, kept forever."""
+    history = []
+    for text, label, score, conf, ts in entries:
+        history.append({'time': datetime.datetime.fromtimestamp(ts).strftime('%Y-%m-%d %H:%M:%S'),
+                        'text': text, 'label': label, 'score': score, 'confidence': conf})
+    return history
+
+def as_store(entries, capacity, path):
+    store = HistoryStore(capacity=capacity, spill_path=path)
+    for text, label, score, conf, ts in entries:
+        store.append(text, label, score, conf, ts)
+    return store
+
+def traced(fn):
+    """(result, bytes still allocated, peak bytes) of fn()."""
+    tracemalloc.start()
+    out = fn()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return out, current, peak
+
+def run(n=200_000, capacity=1_000):
+    entries = make_entries(n)
+    avg_text = sum(len(e[0].encode('utf-8')) for e in entries) / n
+    print(f"{n:,} analyses, average headline {avg_text:.1f} bytes, store capacity {capacity:,}")
+
+    with tempfile.TemporaryDirectory(prefix="bench-history-") as tmp:
+        path = f"{tmp}/history.sqlite"
+        t0 = time.perf_counter()
+        history = as_list(entries)
+        t_list = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        store = as_store(entries, capacity, path)
+        t_store = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        rows = list(store)
+        t_iter = time.perf_counter() - t0
+        for a, b in zip(history, rows):
+            assert a['text'] == b['text'] and a['label'] == b['label'] and a['time'] == b['time']
+            assert abs(a['score'] - b['score']) < 1e-6 and abs(a['confidence'] - b['confidence']) < 1e-6
+        assert len(rows) == len(history) == len(store)
+        print(f"parity: {len(rows):,} rows identical ({store.spilled:,} read back from SQLite)")
+        del rows
+
+        # Memory in separate runs (tracemalloc slows the appends down)
+        _, list_bytes, _ = traced(lambda: as_list(entries))
+        _, store_bytes, store_peak = traced(lambda: as_store(entries, capacity, f"{tmp}/traced.sqlite"))
+        list_pickle = len(pickle.dumps(history))
+        store_pickle = len(pickle.dumps(store))
+
+        expected = BYTES_PER_ENTRY + avg_text # ring record + its text in the pool
+        per_entry = store.nbytes() / capacity
+        print(f"\n{'':<26} {'list of dicts':>14} {'HistoryStore':>14}")
+        print(f"{'append (total)':<26} {t_list:>13.2f}s {t_store:>13.2f}s")
+        print(f"{'memory held':<26} {list_bytes / 1e6:>12.1f}MB {store_bytes / 1e6:>12.2f}MB")
+        print(f"{'peak while appending':<26} {'':>14} {store_peak / 1e6:>12.2f}MB")
+        print(f"{'per entry held':<26} {list_bytes / n:>13.0f}B {store_bytes / n:>13.1f}B")
+        print(f"{'pickled size':<26} {list_pickle / 1e6:>12.1f}MB {store_pickle / 1e6:>12.2f}MB")
+        print(f"\nstore: {BYTES_PER_ENTRY} B record + {avg_text:.1f} B text = {expected:.1f} B expected per in-memory"
+              f" entry; measured {per_entry:.1f} B (nbytes {store.nbytes():,} / {capacity:,})")
+        print(f"iterate all {n:,} rows: {t_iter:.2f}s ({n / t_iter:,.0f} rows/s)")
+        # The pool may hold up to one spill batch of dead bytes before it compacts
+        assert per_entry <= expected * 1.5, "store memory per entry above the documented bound"
+        store.close()
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:]]
+    run(*args)
@@ -0,0 +1,63 @@
+"""
+Streaming indicators vs recomputing the pandas rolling versions on every new bar.
+Usage: python benchmarks/bench_indicators.py [tickers] [bars]
+"""
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+import fixtures # noqa: F401 (puts the project root on sys.path)
+from providers import RandomWalkProvider
+from market_data import calculate_rsi
+from indicators import IndicatorBook
+
+def pandas_row(close):
+    """What get_chart used to compute for the last bar (the whole frame, every call)."""
+    sma = close.rolling(window=20).mean()
+    std = close.rolling(window=20).std()
+    return sma.iloc[-1], std.iloc[-1], (sma + std * 2).iloc[-1], (sma - std * 2).iloc[-1], calculate_rsi(close).iloc[-1]
+
+def run(n_tickers=1000, bars=126, ticks=20):
+    source = RandomWalkProvider(seed=11)
+    index = pd.bdate_range('2024-01-01', periods=bars + ticks, tz='America/New_York')
+    closes = {f"T{i:04d}": source.bars(f"T{i:04d}", index)["Close"] for i in range(n_tickers)}
+    arrays = {t: c.to_numpy() for t, c in closes.items()}
+
+    book = IndicatorBook(window=20, num_std=2, rsi_window=14)
+    t0 = time.perf_counter()
+    for ticker, close in arrays.items():
+        book.seed(ticker, close[:bars])
+    seed_s = time.perf_counter() - t0
+
+    # One new bar for every ticker, `ticks` times
+    t0 = time.perf_counter()
+    for k in range(bars, bars + ticks):
+        for ticker, close in arrays.items():
+            book.update(ticker, close[k])
+    stream_s = time.perf_counter() - t0
+
+    sample = list(closes)[: max(1, n_tickers // 10)]
+    t0 = time.perf_counter()
+    for ticker in sample:
+        expected = pandas_row(closes[ticker])
+    pandas_s = (time.perf_counter() - t0) / len(sample) * n_tickers
+
+    worst = 0.0
+    for ticker in sample:
+        got = np.array(list(book.latest(ticker).values()))
+        exp = np.array(pandas_row(closes[ticker]))
+        worst = max(worst, float(np.nanmax(np.abs(got - exp) / np.maximum(1.0, np.abs(exp)))))
+
+    updates = n_tickers * ticks
+    print(f"{n_tickers} tickers, {bars} bars seeded, {ticks} new bars each")
+    print(f"  seed:       {seed_s:.2f}s ({seed_s / (n_tickers * bars) * 1e6:.1f} us/bar)")
+    print(f"  streaming:  {stream_s / updates * 1e6:.1f} us per ticker-bar "
+          f"({updates / stream_s:,.0f} updates/s)")
+    print(f"  pandas recompute: {pandas_s / n_tickers * 1e6:.0f} us per ticker-bar")
+    print(f"  max relative diff vs pandas: {worst:.2e}")
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:]]
+    run(*args)
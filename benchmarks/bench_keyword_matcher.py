@@ -0,0 +1,80 @@
+"""
+Legacy substring loop vs the compiled KeywordMatcher in hybrid_engine, on headlines
+and long article bodies, for the default lexicon and an enlarged one.
+Usage: python benchmarks/bench_keyword_matcher.py
+"""
+import time
+import random
+
+from fixtures import make_headlines
+from hybrid_engine import BULL_WORDS, BEAR_WORDS, DEFAULT_LEXICON, KeywordMatcher, SentimentBrain
+
+def legacy_analyze(text):
+    """Verbatim copy of the pre-matcher app.SentimentBrain.analyze."""
+    from textblob import TextBlob
+    text_lower = text.lower()
+    bull_words = ['surge', 'soar', 'jump', 'rise', 'gain', 'beat', 'profit', 'record', 'growth', 'bull', 'buy', 'upgrade', 'high', 'rocket']
+    bear_words = ['plummet', 'crash', 'drop', 'fall', 'miss', 'loss', 'debt', 'bear', 'sell', 'downgrade', 'halt', 'warning', 'low', 'dip']
+    manual_score = 0
+    for w in bull_words:
+        if w in text_lower: manual_score += 0.5
+    for w in bear_words:
+        if w in text_lower: manual_score -= 0.5
+    blob_score = TextBlob(text).sentiment.polarity
+    return max(0.01, min(0.99, (blob_score + manual_score + 1) / 2))
+
+def legacy_loop_score(text_lower, bull_words, bear_words):
+    score = 0
+    for w in bull_words:
+        if w in text_lower: score += 0.5
+    for w in bear_words:
+        if w in text_lower: score -= 0.5
+    return score
+
+def _per_call_us(fn, items, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for item in items:
+            fn(item)
+        best = min(best, time.perf_counter() - t0)
+    return best / len(items) * 1e6
+
+def _bigger_lexicon(n, seed=0):
+    rng = random.Random(seed)
+    words = set()
+    while len(words) < n:
+        words.add(''.join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(rng.randint(4, 9))))
+    return {w: (0.5 if i % 2 else -0.5) for i, w in enumerate(sorted(words))}
+
+def run():
+    headlines = [h.lower() for h in make_headlines(2000)]
+    articles = [' '.join(make_headlines(150, seed=s)).lower() for s in range(20)] # ~8 KB each
+    corpora = (("headline", headlines), ("article", articles))
+
+    print("Lexicon scoring only (us/call)")
+    print(f"{'lexicon':>8} {'corpus':>9} {'loop':>10} {'compiled':>10}")
+    for size, lexicon in ((len(DEFAULT_LEXICON), DEFAULT_LEXICON), (500, _bigger_lexicon(500))):
+        bull = [w for w, v in lexicon.items() if v > 0]
+        bear = [w for w, v in lexicon.items() if v < 0]
+        matcher = KeywordMatcher(lexicon)
+        for name, corpus in corpora:
+            loop = _per_call_us(lambda t: legacy_loop_score(t, bull, bear), corpus)
+            compiled = _per_call_us(matcher.score, corpus)
+            print(f"{size:>8} {name:>9} {loop:>10.1f} {compiled:>10.1f}")
+
+    print("\nFull analyze() incl. TextBlob (us/call)")
+    brain = SentimentBrain()
+    raw = make_headlines(500)
+    bodies = [' '.join(make_headlines(150, seed=s)) for s in range(5)]
+    for name, corpus in (("headline", raw), ("article", bodies)):
+        print(f"{name:>9} legacy {_per_call_us(legacy_analyze, corpus, 1):>10.1f} "
+              f"compiled {_per_call_us(brain.analyze, corpus, 1):>10.1f}")
+
+    # Word-boundary fix: legacy loop fires on substrings
+    text = "earnings highlights: revenue in line"
+    print(f"\n'{text}': loop={legacy_loop_score(text, BULL_WORDS, BEAR_WORDS)} "
+          f"compiled={KeywordMatcher().score(text)}")
+
+if __name__ == "__main__":
+    run()
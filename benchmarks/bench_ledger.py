@@ -0,0 +1,75 @@
+"""
+One million orders over 500 symbols: Ledger.execute_batch vs MarketSim.execute_trade
+on per-symbol portfolio dicts, with a parity check and the journal's memory.
+Usage: python benchmarks/bench_ledger.py [orders] [symbols]
+"""
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+import fixtures # noqa: F401 (puts the project root on sys.path)
+from ledger import Ledger, BYTES_PER_TRADE, FILLED, MESSAGES
+from simulator import MarketSim
+
+def make_orders(n, n_symbols, seed=11):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'symbol': pd.Categorical.from_codes(rng.integers(0, n_symbols, n), [f"SYM{i}" for i in range(n_symbols)]),
+        'side': np.where(rng.random(n) < 0.52, 1, -1),
+        'price': np.round(rng.uniform(5, 500, n), 2),
+        'amount': rng.integers(1, 50, n),
+    })
+
+def dict_loop(balance, orders, holdings):
+    """The old way: one dict per symbol, one execute_trade per order."""
+    sim, books, statuses = MarketSim(), {}, []
+    for sym, side, price, amount in zip(orders['symbol'].astype(str).tolist(), orders['side'].tolist(),
+                                        orders['price'].tolist(), orders['amount'].tolist()):
+        book = books.setdefault(sym, {'balance': 0.0, 'shares': holdings})
+        book['balance'] = balance
+        filled, _ = sim.execute_trade(book, 'buy' if side > 0 else 'sell', price, amount)
+        balance = book['balance']
+        statuses.append(filled)
+    return balance, {s: b['shares'] for s, b in books.items()}, np.array(statuses)
+
+def run(n=1_000_000, n_symbols=500):
+    orders = make_orders(n, n_symbols)
+    print(f"{n:,} orders over {n_symbols} symbols")
+    # covered: every symbol starts with a deep position, cash is ample (few rejections)
+    # random:  starts flat with little cash (many sells and buys are rejected)
+    for name, balance, holdings in [("covered", 1e12, 10**9), ("random", 50_000.0, 0)]:
+        def fresh():
+            ledger = Ledger(balance)
+            if holdings:
+                ledger.execute_batch({'symbol': list(orders['symbol'].cat.categories), 'side': 1,
+                                      'price': 1e-3, 'amount': holdings})
+            return ledger
+        # Peak memory in a separate run (tracemalloc slows down Python-level code)
+        ledger = fresh()
+        tracemalloc.start()
+        ledger.execute_batch(orders)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        ledger = fresh()
+        start_cash = ledger.balance
+        t0 = time.perf_counter()
+        status = ledger.execute_batch(orders)
+        batch_s = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        cash, books, filled = dict_loop(start_cash, orders, holdings)
+        loop_s = time.perf_counter() - t0
+        same = (cash == ledger.balance and (filled == (status == FILLED)).all()
+                and all(ledger.position(s) == q for s, q in books.items()))
+        counts = pd.Series(pd.Categorical.from_codes(status, MESSAGES)).value_counts()
+        print(f"  {name:8s} execute_batch {batch_s:.2f}s  dict loop {loop_s:.2f}s  identical: {same}")
+        print(f"           {({k: int(v) for k, v in counts.items()})}")
+        print(f"           journal {len(ledger):,} entries, {BYTES_PER_TRADE} bytes each, "
+              f"{ledger.nbytes() / 2**20:.1f} MB allocated, batch peak {peak / 2**20:.1f} MB")
+
+if __name__ == "__main__":
+    run(*[int(a) for a in sys.argv[1:]])
@@ -0,0 +1,54 @@
+"""
+Load time and resident memory for one vs many engine instances, with and without
+the shared model registry. Each scenario runs in a fresh interpreter.
+Usage: python benchmarks/bench_model_registry.py
+"""
+import os
+import sys
+import json
+import subprocess
+
+INSTANCES = (1, 10, 50)
+
+CHILD = r'''
+import sys, time, json, warnings
+warnings.simplefilter("ignore")
+sys.path.insert(0, {root!r})
+
+def rss_mb():
+    with open("/proc/self/status") as fh:
+        for line in fh:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+import joblib, sklearn.linear_model, sklearn.feature_extraction.text, model_registry
+base = rss_mb()
+t0 = time.perf_counter()
+held = []
+for _ in range({n}):
+    if {legacy}:
+        # Pre-registry behaviour: every instance runs joblib.load itself
+        held.append((joblib.load(model_registry.MODEL_PATH), joblib.load(model_registry.TFIDF_PATH)))
+    else:
+        held.append(model_registry.get_models())
+print(json.dumps({{"seconds": time.perf_counter() - t0, "rss_mb": rss_mb() - base}}))
+'''
+
+def _run(n, legacy):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    code = CHILD.format(root=root, n=n, legacy=legacy)
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+def run():
+    print(f"{'instances':>10} {'mode':>10} {'load ms':>10} {'+RSS MB':>9}")
+    for n in INSTANCES:
+        for legacy in (True, False):
+            res = _run(n, legacy)
+            mode = "per-inst" if legacy else "registry"
+            print(f"{n:>10} {mode:>10} {res['seconds'] * 1000:>10.1f} {res['rss_mb']:>9.1f}")
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,85 @@
+"""
+Time and peak memory of report generation: generate_html_report (DataFrame.to_html +
+base64 data URI, in memory) vs the streaming writers (HTML, paginated HTML, CSV, Parquet).
+Each run happens in a fresh interpreter; "peak" is the RSS high-water mark above the
+interpreter's RSS before the log was built (the legacy function needs the log as a
+list, the streaming writers read it from a generator).
+Usage: python benchmarks/bench_reporting.py [rows ...]
+"""
+import os
+import sys
+import json
+import tempfile
+import subprocess
+
+from fixtures import ROOT
+
+CHILD = r'''
+import sys, time, json, resource
+sys.path.insert(0, {root!r})
+sys.path.insert(0, {bench!r})
+import reporting
+from fixtures import make_labelled_headlines
+
+def rss_mb():
+    with open("/proc/self/status") as fh:
+        for line in fh:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+
+def history(n, block=50_000):
+    done = 0
+    while done < n:
+        texts, labels = make_labelled_headlines(min(block, n - done), seed=done)
+        for i, (t, y) in enumerate(zip(texts, labels)):
+            k = done + i
+            yield {{"time": f"2024-01-{{1 + k // 86400 % 28:02d}} {{k // 3600 % 24:02d}}:{{k // 60 % 60:02d}}:{{k % 60:02d}}", "text": t,
+                   "label": "BULLISH" if y else "BEARISH", "score": 0.8 if y else 0.2}}
+        done += len(texts)
+
+base = rss_mb()
+rows, out = {rows}, {out!r}
+t0 = time.perf_counter()
+if {mode!r} == "legacy":
+    link = reporting.generate_html_report(list(history(rows)))
+    size = len(link)
+elif {mode!r} == "html":
+    reporting.write_html_report(history(rows), out)
+    size = 0
+elif {mode!r} == "pages":
+    reporting.write_html_pages(history(rows), out)
+    size = 0
+elif {mode!r} == "csv":
+    reporting.export_csv(history(rows), out)
+    size = 0
+elif {mode!r} == "parquet":
+    reporting.export_parquet(history(rows), out)
+    size = 0
+seconds = time.perf_counter() - t0
+print(json.dumps({{"seconds": seconds, "peak_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024 - base,
+                  "size": size}}))
+'''
+
+MODES = (("legacy", "generate_html_report"), ("html", "write_html_report"), ("pages", "write_html_pages"),
+         ("csv", "export_csv"), ("parquet", "export_parquet"))
+
+def _size(path):
+    if os.path.isdir(path):
+        return sum(os.path.getsize(os.path.join(path, f)) for f in os.listdir(path))
+    return os.path.getsize(path)
+
+def run(sizes=(10_000, 100_000, 1_000_000)):
+    print(f"{'rows':>10} {'writer':>22} {'seconds':>9} {'peak MB':>9} {'output MB':>10}")
+    for rows in sizes:
+        for mode, name in MODES:
+            with tempfile.TemporaryDirectory() as tmp:
+                out = os.path.join(tmp, "pages" if mode == "pages" else f"report.{mode}")
+                code = CHILD.format(root=ROOT, bench=os.path.dirname(os.path.abspath(__file__)),
+                                    rows=rows, out=out, mode=mode)
+                proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+                res = json.loads(proc.stdout.strip().splitlines()[-1])
+                size = res["size"] or _size(out)
+            print(f"{rows:>10,} {name:>22} {res['seconds']:>9.2f} {res['peak_mb']:>9.0f} {size / 2**20:>10.1f}")
+
+if __name__ == "__main__":
+    run([int(a) for a in sys.argv[1:]] or (10_000, 100_000, 1_000_000))
@@ -0,0 +1,94 @@
+"""
+Load generator for scoring_server.py: for each (max_batch, max_wait_ms) setting, a
+fresh server process is started and `concurrency` keep-alive clients each send one
+headline per request, back to back, for `seconds`. Reports throughput, p50 / p99
+latency and the mean micro-batch size the server formed.
+Headlines come from simulator.HeadlineStream with a unique letter tag per request,
+so the engines' result cache never answers instead of the batch.
+Usage: python benchmarks/bench_scoring_server.py [engine|nlp|hybrid] [concurrency] [seconds]
+"""
+import os
+import re
+import sys
+import json
+import time
+import asyncio
+import subprocess
+
+import numpy as np
+
+from fixtures import ROOT
+from simulator import HeadlineStream
+
+SETTINGS = [(1, 0), (8, 1), (32, 2), (64, 5), (256, 10)] # (max_batch, max_wait_ms)
+
+def _tag(i):
+    """Letters-only suffix (digits are stripped by the cleaners), so texts are unique."""
+    return ''.join(chr(97 + int(d)) for d in str(i))
+
+def start_server(engine, max_batch, max_wait_ms):
+    env = dict(os.environ, PYTHONWARNINGS="ignore")
+    proc = subprocess.Popen([sys.executable, os.path.join(ROOT, "scoring_server.py"), "--engine", engine,
+                             "--port", "0", "--max-batch", str(max_batch), "--max-wait-ms", str(max_wait_ms)],
+                            cwd=ROOT, env=env, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    for line in proc.stdout:
+        match = re.search(r"http://([\d.]+):(\d+)", line)
+        if match:
+            return proc, match.group(1), int(match.group(2))
+    raise RuntimeError("scoring server did not start")
+
+async def request(reader, writer, method, path, payload=None):
+    body = json.dumps(payload).encode() if payload is not None else b''
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: bench\r\nContent-Type: application/json\r\n"
+                 f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+    status = await reader.readline()
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        if line.lower().startswith(b'content-length:'):
+            length = int(line.split(b':')[1])
+    data = await reader.readexactly(length)
+    if b' 200 ' not in status:
+        raise RuntimeError(f"{status!r}: {data!r}")
+    return json.loads(data)
+
+async def load(host, port, concurrency, seconds, texts):
+    latencies, counter = [], iter(range(10**9))
+    deadline = time.perf_counter() + seconds
+
+    async def client():
+        reader, writer = await asyncio.open_connection(host, port)
+        while time.perf_counter() < deadline:
+            i = next(counter)
+            t0 = time.perf_counter()
+            await request(reader, writer, "POST", "/score", {"text": f"{texts[i % len(texts)]} {_tag(i)}"})
+            latencies.append(time.perf_counter() - t0)
+        writer.close()
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - t0
+    reader, writer = await asyncio.open_connection(host, port)
+    stats = await request(reader, writer, "GET", "/stats")
+    writer.close()
+    return len(latencies) / elapsed, np.percentile(latencies, [50, 99]) * 1e3, stats
+
+def run(engine="engine", concurrency=64, seconds=5):
+    texts = [h.text for h in HeadlineStream(seed=4, neutral_share=0.1).take(5_000)]
+    print(f"engine={engine}, {concurrency} concurrent clients, {seconds}s per setting")
+    print(f"{'max_batch':>9} {'wait_ms':>8} {'req/s':>9} {'p50':>9} {'p99':>9} {'mean batch':>11}")
+    for max_batch, max_wait_ms in SETTINGS:
+        proc, host, port = start_server(engine, max_batch, max_wait_ms)
+        try:
+            asyncio.run(load(host, port, concurrency, 0.5, texts)) # warm-up (model load, first batches)
+            rate, (p50, p99), stats = asyncio.run(load(host, port, concurrency, seconds, texts))
+        finally:
+            proc.terminate()
+            proc.wait()
+        print(f"{max_batch:>9} {max_wait_ms:>8g} {rate:>9,.0f} {p50:>7.1f}ms {p99:>7.1f}ms {stats['mean_batch']:>11.1f}")
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    run(args[0] if args else "engine", *(int(a) for a in args[1:]))
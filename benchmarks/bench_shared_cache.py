@@ -0,0 +1,69 @@
+"""
+User-visible latency of market data reads: hard TTL expiry (st.cache_data-style) vs the
+shared stale-while-revalidate cache. Simulated sessions rerun against a slow upstream.
+Usage: python benchmarks/bench_shared_cache.py [seconds]
+"""
+import sys
+import time
+import random
+import threading
+
+from fixtures import TICKERS
+from providers import RandomWalkProvider
+from shared_cache import SharedCache
+
+UPSTREAM_S = 0.3 # simulated download
+TTL_S = 1.0
+SESSIONS = 20
+THINK_S = (0.02, 0.1) # pause between reruns of one session
+
+def run(duration=6.0):
+    source = RandomWalkProvider(seed=5)
+    frames = {t: source.history(t, "6mo") for t in TICKERS[:4]}
+    calls = {"n": 0}
+    lock = threading.Lock()
+
+    def loader(ticker):
+        def load():
+            with lock:
+                calls["n"] += 1
+            time.sleep(UPSTREAM_S)
+            return frames[ticker]
+        return load
+
+    print(f"{SESSIONS} sessions x {duration:.0f}s, {len(frames)} tickers, ttl {TTL_S}s, upstream {UPSTREAM_S * 1000:.0f} ms")
+    print(f"{'mode':>24} {'reads':>6} {'p50 ms':>7} {'p99 ms':>7} {'max ms':>7} {'slow reads':>10} {'upstream':>8}")
+    # max_stale == ttl is a hard expiry: the first reader after it waits for the refetch
+    for mode, cache in (("hard expiry", SharedCache("hard", ttl=TTL_S, max_stale=TTL_S)),
+                        ("stale-while-revalidate", SharedCache("swr", ttl=TTL_S, max_stale=60))):
+        for ticker in frames: # warm start: measure expiry, not the first cold load
+            cache.get(("6mo", ticker), loader(ticker))
+        calls["n"] = 0
+        latencies = []
+        stop = time.monotonic() + duration
+
+        def session(seed):
+            rng = random.Random(seed)
+            while time.monotonic() < stop:
+                ticker = rng.choice(list(frames))
+                t0 = time.perf_counter()
+                cache.get(("6mo", ticker), loader(ticker))
+                latencies.append(time.perf_counter() - t0)
+                time.sleep(rng.uniform(*THINK_S))
+
+        threads = [threading.Thread(target=session, args=(i,)) for i in range(SESSIONS)]
+        for th in threads: th.start()
+        for th in threads: th.join()
+        latencies.sort()
+        pick = lambda q: latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000
+        slow = sum(1 for x in latencies if x > UPSTREAM_S / 2)
+        print(f"{mode:>24} {len(latencies):>6} {pick(0.5):>7.1f} {pick(0.99):>7.1f} {latencies[-1] * 1000:>7.0f} "
+              f"{slow:>10} {calls['n']:>8}")
+        stats = cache.stats()
+        refresh = stats['refresh_latency']
+        refresh = f"{refresh['mean'] * 1000:.0f} ms mean" if refresh['count'] else "-"
+        print(f"{'':>24} hit rate {stats['hit_rate']:.3f} (fresh {stats['fresh_hit_rate']:.3f}), "
+              f"background refreshes {stats['refreshes']}, refresh latency {refresh}")
+
+if __name__ == "__main__":
+    run(float(sys.argv[1]) if len(sys.argv) > 1 else 6.0)
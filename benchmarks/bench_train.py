@@ -0,0 +1,43 @@
+"""
+Throughput and peak RSS of the batch trainer (TF-IDF + LogisticRegression) vs the
+streaming trainer (HashingVectorizer + SGD partial_fit) on synthetic corpora.
+Each run happens in a fresh interpreter so ru_maxrss is per-trainer.
+Usage: python benchmarks/bench_train.py [rows ...]
+"""
+import os
+import sys
+import json
+import tempfile
+import subprocess
+
+from fixtures import ROOT, write_sentiment_csv
+
+CHILD = r'''
+import sys, time, json, resource, contextlib, io
+sys.path.insert(0, {root!r})
+import train_model
+t0 = time.perf_counter()
+with contextlib.redirect_stdout(io.StringIO()):
+    if {stream}:
+        train_model.train_streaming({data!r}, {model!r}, {tfidf!r})
+    else:
+        train_model.train({data!r}, {model!r}, {tfidf!r})
+print(json.dumps({{"seconds": time.perf_counter() - t0,
+                  "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024}}))
+'''
+
+def run(sizes=(100_000, 500_000)):
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'rows':>10} {'trainer':>10} {'rows/s':>10} {'peak RSS MB':>12}")
+        for rows in sizes:
+            data = write_sentiment_csv(os.path.join(tmp, f"data_{rows}.csv"), rows)
+            for stream in (False, True):
+                code = CHILD.format(root=ROOT, stream=stream, data=data,
+                                    model=os.path.join(tmp, "model.pkl"), tfidf=os.path.join(tmp, "tfidf.pkl"))
+                out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+                res = json.loads(out.stdout.strip().splitlines()[-1])
+                name = "stream" if stream else "batch"
+                print(f"{rows:>10,} {name:>10} {rows / res['seconds']:>10,.0f} {res['peak_rss_mb']:>12.0f}")
+
+if __name__ == "__main__":
+    run(tuple(int(a) for a in sys.argv[1:]) or (100_000, 500_000))
@@ -0,0 +1,47 @@
+"""Deterministic offline fixtures shared by the benchmark scripts."""
+import os
+import sys
+import random
+
+# Make the project modules importable when run as `python benchmarks/<script>.py`
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.append(ROOT)
+
+TICKERS = ["AAPL", "TSLA", "NVDA", "MSFT", "AMZN", "BTC-USD", "ETH-USD", "SPY", "GOLD", "OIL"]
+SUBJECTS = ["shares", "stock", "earnings", "revenue", "guidance", "outlook", "margins", "demand"]
+BULL_VERBS = ["surge", "soar", "jump", "rise", "beat estimates", "hit record high", "rally", "get an upgrade"]
+BEAR_VERBS = ["plummet", "crash", "drop", "fall", "miss estimates", "hit a new low", "dip", "get a downgrade"]
+# Context only: a tail must not carry sentiment of its own, or it can contradict the label
+TAILS = ["after the Fed decision", "ahead of the open", "in midday trading",
+         "after the close", "ahead of the quarterly report", "after the jobs report"]
+
+def make_labelled_headlines(n, seed=42):
+    """Returns (headlines, labels) with label 1 for bullish, 0 for bearish."""
+    rng = random.Random(seed)
+    texts, labels = [], []
+    for _ in range(n):
+        bull = rng.random() < 0.5
+        verbs = BULL_VERBS if bull else BEAR_VERBS
+        texts.append(f"{rng.choice(TICKERS)} {rng.choice(SUBJECTS)} {rng.choice(verbs)} "
+                     f"{rng.randint(1, 40)}% {rng.choice(TAILS)}")
+        labels.append(int(bull))
+    return texts, labels
+
+def make_headlines(n, seed=42):
+    """Returns `n` reproducible headline strings."""
+    return make_labelled_headlines(n, seed)[0]
+
+def write_sentiment_csv(path, rows, seed=42, block=100_000):
+    """Writes a Sentiment_Stock_data.csv-shaped file in blocks (never holds `rows` in memory)."""
+    import csv
+    with open(path, "w", newline="") as fh:
+        writer = csv.writer(fh)
+        writer.writerow(["", "Sentence", "Sentiment"])
+        done = 0
+        while done < rows:
+            n = min(block, rows - done)
+            texts, labels = make_labelled_headlines(n, seed + done)
+            writer.writerows(zip(range(done, done + n), texts, labels))
+            done += n
+    return path
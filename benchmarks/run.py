@@ -0,0 +1,272 @@
+"""
+Benchmark suite: every hot path timed the same way on fixed offline fixtures, saved as JSON.
+
+    python benchmarks/run.py                                  # run all, write .cache/benchmarks/latest.json
+    python benchmarks/run.py --only analyze --out new.json    # cases whose name contains "analyze"
+    python benchmarks/run.py --baseline old.json              # run, then flag regressions (exit 1)
+    python benchmarks/run.py --compare old.json new.json      # compare two saved runs only
+
+Each case is timed with timeit (auto-ranged inner loop for fast cases, a single call for
+slow ones); the best of `repeat` runs is the number that gets compared, since it is the
+least sensitive to noise. A case regresses when best_new > best_old * (1 + threshold).
+The one-off scripts next to this file go deeper on single topics.
+"""
+import io
+import os
+import sys
+import json
+import time
+import timeit
+import platform
+import argparse
+import tempfile
+import warnings
+import contextlib
+import subprocess
+from collections import namedtuple
+
+from fixtures import ROOT, make_headlines, make_labelled_headlines, write_sentiment_csv
+
+warnings.simplefilter("ignore") # sklearn version warnings when unpickling the models
+
+DEFAULT_OUT = os.path.join(ROOT, ".cache", "benchmarks", "latest.json")
+DEFAULT_THRESHOLD = 0.10
+FORMAT = 1
+
+# setup() -> (fn, items): fn() is the timed call, items what one call processes
+Case = namedtuple("Case", ["name", "setup", "repeat", "single"])
+
+def _tag(i):
+    """Letters-only suffix (digits are stripped by the cleaners), so texts are unique."""
+    return ''.join(chr(97 + int(d)) for d in str(i))
+
+def _texts(n):
+    return [f"{h} {_tag(i)}" for i, h in enumerate(make_headlines(n))]
+
+def _quiet(fn, *args, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn(*args, **kwargs)
+
+def _bars(period="5y"):
+    from providers import RandomWalkProvider
+    return RandomWalkProvider(seed=7).history("BENCH", period)
+
+# --- sentiment ---------------------------------------------------------------
+
+def _analyze(make, n=1_000, fallback=False, batch=False):
+    def setup():
+        from result_cache import ResultCache
+        engine = _quiet(make, cache=ResultCache())
+        if fallback:
+            engine.use_fallback = True
+        texts = _texts(n)
+
+        def fn():
+            engine.cache.clear() # time the scorer, not the result cache
+            if batch:
+                engine.analyze_many(texts)
+            else:
+                for t in texts:
+                    engine.analyze(t)
+        return fn, n
+    return setup
+
+def _engine(**kw):
+    from engine import SentimentEngine
+    return SentimentEngine(**kw)
+
+def _nlp(**kw):
+    from nlp_engine import SentimentBrain
+    return SentimentBrain(**kw)
+
+def _app(**kw):
+    from hybrid_engine import SentimentBrain # the brain app.py uses
+    return SentimentBrain(**kw)
+
+# --- training ----------------------------------------------------------------
+
+def _clean_text(n=20_000):
+    def setup():
+        import preprocessing
+        texts = make_headlines(n)
+        return (lambda: [preprocessing.clean_text(t) for t in texts]), n
+    return setup
+
+def _clean_series(n=100_000):
+    def setup():
+        import pandas as pd
+        import preprocessing
+        texts = pd.Series(make_headlines(n), dtype=object)
+        return (lambda: preprocessing.clean_series(texts)), n
+    return setup
+
+def _train(rows=20_000):
+    def setup():
+        import train_model
+        tmp = tempfile.TemporaryDirectory(prefix="bench-train-") # removed when fn is dropped
+        data = write_sentiment_csv(os.path.join(tmp.name, "data.csv"), rows)
+        model, tfidf = os.path.join(tmp.name, "model.pkl"), os.path.join(tmp.name, "tfidf.pkl")
+        return (lambda _tmp=tmp: _quiet(train_model.train, data, model, tfidf)), rows
+    return setup
+
+# --- market data / charts ----------------------------------------------------
+
+def _rsi(period="5y"):
+    def setup():
+        from market_data import calculate_rsi
+        df = _bars(period)
+        return (lambda: calculate_rsi(df)), len(df)
+    return setup
+
+def _indicators_cold(period="5y"):
+    def setup():
+        from indicators import IndicatorBook
+        df = _bars(period)
+        return (lambda: IndicatorBook(window=20, num_std=2, rsi_window=14).apply("BENCH", df)), len(df)
+    return setup
+
+def _get_chart(period="6mo", cached=True):
+    def setup():
+        import market_data
+        df = _bars(period)
+        return (lambda: market_data.get_chart("BENCH", df, cached=cached)), len(df)
+    return setup
+
+def _gauge(cached=True):
+    def setup():
+        import plots
+        return (lambda: plots.plot_gauge(0.73, cached=cached)), 1
+    return setup
+
+def _history(period="1y", cached=True):
+    def setup():
+        import plots
+        df = _bars(period)
+        return (lambda: plots.plot_stock_history("BENCH", df, cached=cached)), len(df)
+    return setup
+
+# --- reporting ---------------------------------------------------------------
+
+def _report(rows):
+    def setup():
+        from reporting import generate_html_report
+        texts, labels = make_labelled_headlines(rows)
+        history = [{"time": f"12:{i // 60 % 60:02d}:{i % 60:02d}", "text": t,
+                    "label": "BULLISH" if y else "BEARISH", "score": 0.5 + (0.3 if y else -0.3)}
+                   for i, (t, y) in enumerate(zip(texts, labels))]
+        return (lambda: generate_html_report(history)), rows
+    return setup
+
+CASES = [
+    Case("analyze: engine (model)", _analyze(_engine), 3, False),
+    Case("analyze_many: engine (model)", _analyze(_engine, 10_000, batch=True), 3, False),
+    Case("analyze: engine (TextBlob fallback)", _analyze(_engine, fallback=True), 3, False),
+    Case("analyze: nlp_engine (model)", _analyze(_nlp), 3, False),
+    Case("analyze: nlp_engine (TextBlob fallback)", _analyze(_nlp, fallback=True), 3, False),
+    Case("analyze: app (hybrid lexicon + TextBlob)", _analyze(_app), 3, False),
+    Case("preprocessing.clean_text", _clean_text(), 3, False),
+    Case("preprocessing.clean_series", _clean_series(), 3, False),
+    Case("train_model.train (20k rows)", _train(), 2, True),
+    Case("market_data.calculate_rsi (5y)", _rsi(), 5, False),
+    Case("indicators: IndicatorBook cold (5y)", _indicators_cold(), 5, False),
+    Case("market_data.get_chart (6mo)", _get_chart(), 5, False),
+    Case("market_data.get_chart uncached figure (6mo)", _get_chart(cached=False), 5, False),
+    Case("plots.plot_gauge", _gauge(), 5, False),
+    Case("plots.plot_stock_history (1y)", _history(), 5, False),
+    Case("reporting.generate_html_report (1k rows)", _report(1_000), 3, False),
+    Case("reporting.generate_html_report (100k rows)", _report(100_000), 2, True),
+]
+
+def time_case(case):
+    fn, items = case.setup()
+    timer = timeit.Timer(fn)
+    if case.single:
+        number = 1
+        fn() # warm-up
+    else:
+        number, _ = timer.autorange()
+    runs = [t / number for t in timer.repeat(case.repeat, number)]
+    best = min(runs)
+    return {"best_s": best, "median_s": sorted(runs)[len(runs) // 2], "runs": runs, "number": number,
+            "items": items, "per_item_us": best / items * 1e6, "items_per_s": items / best}
+
+def _meta():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                                text=True, timeout=10).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        commit = ""
+    import numpy, pandas
+    return {"format": FORMAT, "created": time.strftime("%Y-%m-%dT%H:%M:%S"), "commit": commit,
+            "python": platform.python_version(), "platform": platform.platform(), "cpus": os.cpu_count(),
+            "numpy": numpy.__version__, "pandas": pandas.__version__}
+
+def run(only=None):
+    results = {}
+    print(f"{'case':<48} {'best':>10} {'per item':>12} {'items/s':>12}")
+    for case in CASES:
+        if only and not any(o.lower() in case.name.lower() for o in only):
+            continue
+        res = results[case.name] = time_case(case)
+        print(f"{case.name:<48} {_fmt(res['best_s']):>10} {res['per_item_us']:>10,.1f}us {res['items_per_s']:>12,.0f}")
+    return {"meta": _meta(), "results": results}
+
+def _fmt(seconds):
+    return f"{seconds * 1e3:.2f}ms" if seconds < 1 else f"{seconds:.2f}s"
+
+def compare(old, new, threshold=DEFAULT_THRESHOLD):
+    """Prints old vs new per case; returns the names of the cases that regressed."""
+    regressed = []
+    print(f"\n{'case':<48} {'old':>10} {'new':>10} {'change':>8}")
+    for name, res in new["results"].items():
+        base = old["results"].get(name)
+        if base is None:
+            print(f"{name:<48} {'-':>10} {_fmt(res['best_s']):>10} {'new':>8}")
+            continue
+        change = res["best_s"] / base["best_s"] - 1.0
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            regressed.append(name)
+        elif change < -threshold:
+            flag = "  faster"
+        print(f"{name:<48} {_fmt(base['best_s']):>10} {_fmt(res['best_s']):>10} {change:>+8.1%}{flag}")
+    for name in old["results"]:
+        if name not in new["results"]:
+            print(f"{name:<48} {'(not run)':>10}")
+    if regressed:
+        print(f"\n{len(regressed)} case(s) slower than {threshold:.0%} over the baseline")
+    return regressed
+
+def _load(path):
+    with open(path) as fh:
+        return json.load(fh)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Project benchmark suite")
+    parser.add_argument("--only", nargs="+", help="run the cases whose name contains any of these")
+    parser.add_argument("--out", default=DEFAULT_OUT, help="where to write the JSON results")
+    parser.add_argument("--baseline", help="JSON results to compare this run against")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="compare two saved runs (no run)")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="relative slow-down that counts as a regression (default 0.10)")
+    parser.add_argument("--list", action="store_true", help="list the cases")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        print("\n".join(case.name for case in CASES))
+        return 0
+    if args.compare:
+        return 1 if compare(_load(args.compare[0]), _load(args.compare[1]), args.threshold) else 0
+
+    report = run(args.only)
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    with open(args.out, "w") as fh:
+        json.dump(report, fh, indent=2)
+    print(f"\nsaved {args.out}")
+    if args.baseline:
+        return 1 if compare(_load(args.baseline), report, args.threshold) else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
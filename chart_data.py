@@ -0,0 +1,106 @@
+"""
+Chart data reduction: fits a price history of any length into a point budget derived
+from the chart width, and hands Plotly compact typed arrays.
+
+  - candles/volume: OHLC-aware buckets of consecutive bars (first open, max high,
+    min low, last close, summed volume), sized so the chart has at most
+    width / PX_PER_CANDLE candles
+  - line overlays (SMA, bands): Largest-Triangle-Three-Buckets on the full-resolution
+    series, at most width / PX_PER_POINT points, shared by every overlay so filled
+    bands stay aligned
+  - dates become epoch milliseconds (wall clock) for a 'date' axis, prices float32,
+    and the volume colours an int8 up/down mask mapped by a two-colour colorscale
+
+Histories that already fit the budget keep every bar; only the encoding changes.
+"""
+import numpy as np
+
+CHART_WIDTH = 1200 # px, when the real width is not known
+PX_PER_CANDLE = 3
+PX_PER_POINT = 1
+
+def candle_budget(width=None):
+    return max(1, int((width or CHART_WIDTH) // PX_PER_CANDLE))
+
+def line_budget(width=None):
+    return max(3, int((width or CHART_WIDTH) // PX_PER_POINT))
+
+def epoch_ms(index):
+    """DatetimeIndex -> float64 epoch milliseconds of the wall-clock time (what a tz-less axis shows)."""
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index.as_unit('ms').asi8.astype(np.float64)
+
+def bucket_starts(n, max_buckets):
+    """Start offset of each bucket; buckets are aligned on the last bar (a partial bucket comes first)."""
+    if n <= max_buckets:
+        return np.arange(n)
+    size = -(-n // max_buckets) # ceil
+    first = n % size
+    starts = np.arange(first, n, size)
+    return np.concatenate(([0], starts)) if first else starts
+
+def bucket_ohlc(open_, high, low, close, volume, starts):
+    """Aggregates bars into buckets: (open, high, low, close, volume) arrays."""
+    n = len(close)
+    if len(starts) == n:
+        return open_, high, low, close, volume
+    ends = np.append(starts[1:], n) - 1
+    return (open_[starts], np.fmax.reduceat(high, starts), np.fmin.reduceat(low, starts),
+            close[ends], np.add.reduceat(np.nan_to_num(volume), starts))
+
+def lttb_indices(x, y, n_out):
+    """
+    Indices of the points Largest-Triangle-Three-Buckets keeps (first and last always).
+    NaN points (e.g. an indicator's warm-up) are never selected.
+    """
+    valid = np.flatnonzero(~np.isnan(y))
+    n = len(valid)
+    if n <= n_out or n_out < 3:
+        return valid
+    vx, vy = x[valid], y[valid]
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64) # n_out - 2 inner buckets
+    keep = np.empty(n_out, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # Average of the next bucket (or the last point) is the third triangle vertex
+        nlo, nhi = hi, (edges[i + 2] if i + 2 < len(edges) else n)
+        cx, cy = vx[nlo:nhi].mean(), vy[nlo:nhi].mean()
+        area = np.abs((vx[a] - cx) * (vy[lo:hi] - vy[a]) - (vx[a] - vx[lo:hi]) * (cy - vy[a]))
+        a = lo + int(area.argmax())
+        keep[i + 1] = a
+    return valid[keep]
+
+def reduce_chart(df, width=None, overlays=()):
+    """
+    Compact chart payload for an OHLCV frame (plus optional indicator columns):
+      x, open, high, low, close, volume, up  (bucketed candles; up is int8 close >= open)
+      line_x, <overlay>...                   (LTTB-reduced overlay lines)
+    """
+    x = epoch_ms(df.index)
+    starts = bucket_starts(len(df), candle_budget(width))
+    cols = [df[c].to_numpy(dtype=np.float64) for c in ('Open', 'High', 'Low', 'Close', 'Volume')]
+    open_, high, low, close, volume = bucket_ohlc(*cols, starts)
+    out = {
+        'x': x[starts],
+        'open': open_.astype(np.float32), 'high': high.astype(np.float32),
+        'low': low.astype(np.float32), 'close': close.astype(np.float32),
+        'volume': volume.astype(np.float32),
+        'up': (close >= open_).astype(np.int8),
+    }
+    if overlays:
+        lines = {name: df[name].to_numpy(dtype=np.float64) for name in overlays}
+        idx = lttb_indices(x, lines[overlays[0]], line_budget(width))
+        out['line_x'] = x[idx]
+        for name, y in lines.items():
+            out[name] = y[idx].astype(np.float32)
+    return out
+
+def volume_marker(up, up_color, down_color, opacity=None):
+    """Bar marker colouring each bar from the int8 up mask (no per-bar colour strings)."""
+    marker = dict(color=up, colorscale=[[0, down_color], [1, up_color]], cmin=0, cmax=1)
+    if opacity is not None:
+        marker['opacity'] = opacity
+    return marker
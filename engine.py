@@ -1,41 +1,57 @@
-import os
-import joblib
 import pandas as pd
-import yfinance as yf
 from textblob import TextBlob
-import streamlit as st
+import numpy as np
 import re
+import model_registry
+from result_cache import ResultCache
+from instrumentation import timer
+
+# Label thresholds and palette (shared by analyze / analyze_many)
+BULL_THRESHOLD = 0.6
+BEAR_THRESHOLD = 0.4
+LABELS = (
+    ("BULLISH", "#10b981"), # Green
+    ("BEARISH", "#ef4444"), # Red
+    ("NEUTRAL", "#94a3b8"), # Grey
+)
+_NON_ALPHA = re.compile(r'[^a-z\s]')
+
+# Process-wide result cache (shared across instances and Streamlit reruns)
+RESULT_CACHE = ResultCache()
+FALLBACK_VERSION = "textblob"
 
 class SentimentEngine:
-    def __init__(self):
+    def __init__(self, cache=None):
         self.use_fallback = False
         self.model = None
         self.vectorizer = None
+        self.scorer = None
+        self.model_version = None
+        self.cache = RESULT_CACHE if cache is None else cache
         self._load_resources()
 
     def _load_resources(self):
-        """Attempts to load trained models from the ROOT directory."""
+        """Fetches the shared model/vectorizer from the process-wide registry."""
         try:
-            # CHANGED: Look for files in the CURRENT folder (no 'models/' path)
-            base_path = os.path.dirname(os.path.abspath(__file__))
-            model_path = os.path.join(base_path, 'model.pkl')
-            tfidf_path = os.path.join(base_path, 'tfidf.pkl')
-
-            # Debug print to help you see where it's looking (optional)
-            # print(f"Looking for models at: {model_path}")
-
-            if os.path.exists(model_path) and os.path.exists(tfidf_path):
-                self.model = joblib.load(model_path)
-                self.vectorizer = joblib.load(tfidf_path)
-            else:
-                self.use_fallback = True
+            self.model, self.vectorizer, self.scorer, self.model_version = model_registry.get_artifacts()
         except Exception:
             self.use_fallback = True
 
+    def _sync_model(self, fresh=False):
+        """
+        Picks up re-trained artifacts; returns the version tag used in cache keys.
+        `fresh` checks the files now instead of at most every CHECK_INTERVAL (before scoring).
+        """
+        if self.use_fallback:
+            return FALLBACK_VERSION
+        self.model, self.vectorizer, self.scorer, self.model_version = model_registry.get_artifacts(fresh)
+        self.cache.bind_version(self.model_version)
+        return self.model_version
+
     def _clean_text(self, text):
         """Basic text cleaning."""
         text = str(text).lower()
-        text = re.sub(r'[^a-z\s]', '', text)
+        text = _NON_ALPHA.sub('', text)
         return text
 
     def analyze(self, text):
@@ -45,37 +61,108 @@ class SentimentEngine:
         if not text:
             return None
 
+        # The cache key is what the scorer actually sees (raw text for TextBlob)
+        version = self._sync_model()
+        with timer('engine.clean'):
+            norm = text if self.use_fallback else self._clean_text(text)
+        key = self.cache.make_key(norm, version)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        if self._sync_model(fresh=True) != version: # re-trained since the last check
+            return self.analyze(text)
+
         if self.use_fallback:
             # Fallback: TextBlob Logic
-            blob = TextBlob(text)
-            polarity = blob.sentiment.polarity
+            with timer('engine.textblob'):
+                blob = TextBlob(text)
+                polarity = blob.sentiment.polarity
             score = (polarity + 1) / 2 # Normalize to 0-1
         else:
-            # Trained Model Logic
-            clean = self._clean_text(text)
-            vec = self.vectorizer.transform([clean])
-            # Assuming class 1 is positive
-            score = self.model.predict_proba(vec)[0][1]
+            # Trained Model Logic (class 1 is positive)
+            score = self._predict([norm])[0]
 
         # Determine Label
-        if score > 0.6:
-            label = "BULLISH"
-            color = "#10b981" # Green
-        elif score < 0.4:
-            label = "BEARISH"
-            color = "#ef4444" # Red
+        if score > BULL_THRESHOLD:
+            label, color = LABELS[0]
+        elif score < BEAR_THRESHOLD:
+            label, color = LABELS[1]
+        else:
+            label, color = LABELS[2]
+
+        result = {"score": score, "label": label, "color": color}
+        self.cache.put(key, result)
+        return result
+
+    def analyze_many(self, texts):
+        """
+        Batch version of analyze(): one vectorized scoring pass for the whole list.
+        Returns a list aligned with `texts` (None where the text is empty).
+        """
+        texts = list(texts)
+        results = [None] * len(texts)
+        idx = [i for i, text in enumerate(texts) if text]
+        if not idx:
+            return results
+
+        version = self._sync_model()
+        with timer('engine.clean'):
+            norm = [texts[i] if self.use_fallback else self._clean_text(texts[i]) for i in idx]
+        keys = [self.cache.make_key(n, version) for n in norm]
+
+        # Cache lookups; duplicate texts inside the batch are scored once
+        found, todo = {}, {}
+        for key, n in zip(keys, norm):
+            if key in found or key in todo:
+                continue
+            cached = self.cache.get(key)
+            if cached is None:
+                todo[key] = n
+            else:
+                found[key] = cached
+
+        if todo and self._sync_model(fresh=True) != version: # re-trained since the last check
+            return self.analyze_many(texts)
+        if todo:
+            for key, result in zip(todo, self._score_batch(list(todo.values()))):
+                self.cache.put(key, result)
+                found[key] = result
+
+        for i, key in zip(idx, keys):
+            results[i] = dict(found[key])
+        return results
+
+    def _predict(self, clean_texts):
+        """P(bullish) per cleaned text: compact sparse scorer if exported, else the sklearn pair."""
+        if self.scorer is not None:
+            with timer('engine.predict'): # the compact scorer vectorizes and predicts in one pass
+                return self.scorer.score_many(clean_texts)
+        with timer('engine.vectorize'):
+            X = self.vectorizer.transform(clean_texts)
+        with timer('engine.predict'):
+            return self.model.predict_proba(X)[:, 1]
+
+    def _score_batch(self, norm_texts):
+        """Scores already-normalized texts in one vectorized pass."""
+        if self.use_fallback:
+            with timer('engine.textblob'):
+                scores = np.array([(TextBlob(t).sentiment.polarity + 1) / 2 for t in norm_texts])
         else:
-            label = "NEUTRAL"
-            color = "#94a3b8" # Grey
+            scores = self._predict(norm_texts)
 
-        return {"score": score, "label": label, "color": color}
+        # Vectorized labelling: 0 = bull, 1 = bear, 2 = neutral
+        codes = np.select([scores > BULL_THRESHOLD, scores < BEAR_THRESHOLD], [0, 1], 2)
+        results = []
+        for score, code in zip(scores, codes):
+            label, color = LABELS[code]
+            results.append({"score": score, "label": label, "color": color})
+        return results
 
-    @st.cache_data(ttl=300) # Cache data for 5 mins
     def get_market_data(_self, ticker):
-        """Fetches last 3 months of data for context."""
+        """Fetches last 3 months of data for context (load_history serves it from the shared SWR cache)."""
+        from market_data import load_history # imported here: scoring alone needs no market-data / plotly stack
         try:
-            stock = yf.Ticker(ticker)
-            df = stock.history(period="3mo")
+            df = load_history(ticker, "3mo")
             return df
         except Exception:
             return pd.DataFrame() # Return empty if fail
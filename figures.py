@@ -0,0 +1,92 @@
+"""
+Figure factory: every chart layout is built once with the normal Plotly API, kept as a
+validated skeleton dict, and each call only swaps the data into a cheap copy.
+
+    fig = figures.render('market_data.technical', _technical_skeleton,
+                         traces=[{'x': ..., 'open': ...}, ...],
+                         layout={'title.text': f"{ticker} MARKET VECTOR"})
+
+`build` returns a go.Figure with the final layout and traces but no data. Per-call
+updates use dotted paths ('marker.color') and are applied copy-on-write, so the
+skeleton is never mutated. The result is a go.Figure created without re-running
+Plotly's validators (the skeleton was validated when it was built), which is what
+makes a call ~10x cheaper than make_subplots + add_trace + update_layout.
+`_validate` is a private go.Figure argument: requirements.txt pins plotly below the
+next major version, and if a release drops it, render() falls back to the public
+validated constructor (same figures, without the speed-up).
+
+render(..., cached=False) takes the old path (fresh build + validated updates);
+the figures are identical (benchmarks/bench_figures.py compares the JSON).
+"""
+import threading
+
+import plotly.graph_objects as go
+
+_skeletons = {}
+_lock = threading.Lock()
+_unvalidated = True # go.Figure still accepts _validate=False
+
+def _figure(spec):
+    global _unvalidated
+    if _unvalidated:
+        try:
+            return go.Figure(spec, _validate=False)
+        except TypeError:
+            _unvalidated = False
+    return go.Figure(spec)
+
+def skeleton(key, build):
+    """The validated figure dict for `key` (build() runs only on first use)."""
+    skel = _skeletons.get(key)
+    if skel is None:
+        with _lock:
+            skel = _skeletons.get(key)
+            if skel is None:
+                skel = _skeletons[key] = build().to_dict()
+    return skel
+
+def clear():
+    """Drops every cached skeleton (e.g. after a theme change)."""
+    with _lock:
+        _skeletons.clear()
+
+def _patch(base, updates):
+    """Copy of `base` with dotted-path `updates` applied; untouched branches are shared, not copied."""
+    out = dict(base)
+    for path, value in updates.items():
+        node = out
+        *parents, leaf = path.split('.')
+        for part in parents:
+            node[part] = dict(node.get(part) or {})
+            node = node[part]
+        node[leaf] = value
+    return out
+
+def _nested(updates):
+    """{'a.b': 1} -> {'a': {'b': 1}} (for Plotly's validated update())."""
+    out = {}
+    for path, value in updates.items():
+        node = out
+        *parents, leaf = path.split('.')
+        for part in parents:
+            node = node.setdefault(part, {})
+        node[leaf] = value
+    return out
+
+def render(key, build, traces=(), layout=None, cached=True):
+    """
+    A new figure from the `key` skeleton with per-trace data (`traces`, in trace order)
+    and layout updates swapped in.
+    """
+    if not cached:
+        fig = build()
+        for trace, updates in zip(fig.data, traces):
+            trace.update(_nested(updates))
+        if layout:
+            fig.update_layout(_nested(layout))
+        return fig
+
+    skel = skeleton(key, build)
+    data = [_patch(trace, updates) for trace, updates in zip(skel['data'], traces)]
+    data.extend(skel['data'][len(data):])
+    return _figure({'data': data, 'layout': _patch(skel['layout'], layout or {})})
@@ -0,0 +1,270 @@
+"""
+Sentiment / price fusion: timestamped headline scores aligned to OHLCV bars.
+
+    book = FusionBook(window=30, halflife=30, horizons=(1, 5, 15))
+    book.add_bars('TSLA', bars)                          # OHLCV frame, DatetimeIndex (bar open times)
+    book.add_headlines(tickers, times, scores)           # millions at once, any ticker order
+    book.frame('TSLA')                                   # one row per bar, see SentimentFusion.frame
+
+A headline belongs to the bar in progress when it arrived: the last bar whose open
+time is <= its timestamp (a sorted as-of join, np.searchsorted over the bar times).
+Headlines before the first bar, or without a ticker (None / NaN), are dropped
+(counted in stats()). Per bar the store
+keeps the score sum and count, so:
+
+  - sentiment:          mean score of the bar's headlines (NaN if none)
+  - sentiment_<window>: mean over the headlines of the last `window` bars (cumulative sums)
+  - sentiment_ewm:      exponentially decayed mean, half-life `halflife` bars
+                        (decayed score sum / decayed count, the recurrence run by lfilter)
+  - fwd_return_<h>:     Close[t + h] / Close[t] - 1 (NaN until bar t + h exists)
+
+Appends are incremental: new bars and new headlines only touch the bars they land
+in, and the decayed sums are re-run from the earliest changed bar (late headlines
+for old bars cost O(bars since then), in-order ones O(new bars)). Headlines at or
+after the last bar's open time are provisionally in the last bar and re-homed when
+newer bars arrive. Memory is BYTES_PER_BAR per bar (times, close, sums, counts and
+the decayed pair, all 8-byte) plus 16 bytes per headline of the last bar.
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+from scipy.signal import lfilter
+
+INITIAL_CAPACITY = 1024
+BYTES_PER_BAR = 6 * 8
+DEFAULT_HORIZONS = (1, 5, 15)
+
+def _ns(values):
+    """int64 nanoseconds since the epoch (UTC) from datetimes, date strings or epoch seconds."""
+    if isinstance(values, (pd.Series, pd.Index)) and values.dtype.kind in 'iuf':
+        values = values.to_numpy()
+    if isinstance(values, np.ndarray) and values.dtype.kind in 'iuf':
+        return np.round(values.astype(np.float64) * 1e9).astype(np.int64) # epoch seconds
+    index = pd.DatetimeIndex(values if pd.api.types.is_list_like(values) else [values])
+    return index.as_unit('ns').asi8 # pandas may hold microseconds
+
+class SentimentFusion:
+    """Bars and headline scores of one ticker, fused bar by bar."""
+
+    def __init__(self, window=30, halflife=30, horizons=DEFAULT_HORIZONS, capacity=INITIAL_CAPACITY):
+        if window < 1 or halflife <= 0:
+            raise ValueError("window must be >= 1 and halflife > 0")
+        self.window = window
+        self.halflife = halflife
+        self.decay = 0.5 ** (1.0 / halflife)
+        self.horizons = tuple(horizons)
+        self.n = 0 # bars
+        self.headlines = 0 # assigned to a bar (tail included)
+        self.dropped = 0 # older than the first bar
+        self._t = np.empty(capacity, np.int64)
+        self._close = np.empty(capacity)
+        self._sum = np.zeros(capacity)
+        self._cnt = np.zeros(capacity)
+        self._ewm_sum = np.zeros(capacity)
+        self._ewm_cnt = np.zeros(capacity)
+        self._dirty = 0 # first bar whose decayed sums are stale
+        # Headlines at/after the last bar's open time (re-homed when newer bars arrive)
+        self._tail_t = np.empty(0, np.int64)
+        self._tail_s = np.empty(0)
+
+    def _reserve(self, extra):
+        need = self.n + extra
+        if need <= len(self._t):
+            return
+        size = max(need, 2 * len(self._t))
+        for name in ('_t', '_close', '_sum', '_cnt', '_ewm_sum', '_ewm_cnt'):
+            old = getattr(self, name)
+            new = np.zeros(size, old.dtype)
+            new[:self.n] = old[:self.n]
+            setattr(self, name, new)
+
+    def _assign(self, t, s):
+        """Adds headlines to the bars they fall in (those before the first bar are dropped)."""
+        idx = np.searchsorted(self._t[:self.n], t, side='right') - 1
+        keep = idx >= 0
+        if not keep.all():
+            self.dropped += int((~keep).sum())
+            idx, t, s = idx[keep], t[keep], s[keep]
+        if not len(idx):
+            return
+        lo, hi = int(idx.min()), int(idx.max()) + 1
+        self._sum[lo:hi] += np.bincount(idx - lo, weights=s, minlength=hi - lo)
+        self._cnt[lo:hi] += np.bincount(idx - lo, minlength=hi - lo)
+        self.headlines += len(idx)
+        self._dirty = min(self._dirty, lo)
+        last = idx == self.n - 1
+        if last.any():
+            self._tail_t = np.concatenate([self._tail_t, t[last]])
+            self._tail_s = np.concatenate([self._tail_s, s[last]])
+
+    def add_headlines(self, times, scores):
+        """Headline timestamps (datetimes or epoch seconds) and scores, in any order."""
+        self._add_ns(_ns(times), np.asarray(scores, dtype=np.float64))
+
+    def _add_ns(self, t, s):
+        if len(t) != len(s):
+            raise ValueError("times and scores must have the same length")
+        if self.n == 0: # no bar yet: everything waits in the tail
+            self._tail_t = np.concatenate([self._tail_t, t])
+            self._tail_s = np.concatenate([self._tail_s, s])
+            return
+        self._assign(t, s)
+
+    def add_bars(self, bars):
+        """
+        Appends bars (an OHLCV frame with a DatetimeIndex of open times, or a Close series).
+        A first bar at the current last bar's time replaces its close (a still-forming bar).
+        """
+        close = bars['Close'] if isinstance(bars, pd.DataFrame) else bars
+        t = _ns(close.index)
+        c = close.to_numpy(dtype=np.float64)
+        if len(t) > 1 and not (np.diff(t) > 0).all():
+            raise ValueError("bars must be sorted by time, without duplicates")
+        if self.n and len(t):
+            if t[0] < self._t[self.n - 1]:
+                raise ValueError("bars must be appended after the last bar")
+            if t[0] == self._t[self.n - 1]:
+                self._close[self.n - 1] = c[0]
+                t, c = t[1:], c[1:]
+        if not len(t):
+            return
+        # Take the provisional last-bar headlines out, add the bars, then assign them again
+        tail_t, tail_s = self._tail_t, self._tail_s
+        self._tail_t, self._tail_s = np.empty(0, np.int64), np.empty(0)
+        if self.n and len(tail_t):
+            self._sum[self.n - 1] -= tail_s.sum()
+            self._cnt[self.n - 1] -= len(tail_t)
+            self.headlines -= len(tail_t)
+            self._dirty = min(self._dirty, self.n - 1)
+        self._reserve(len(t))
+        k = slice(self.n, self.n + len(t))
+        self._t[k], self._close[k] = t, c
+        self._sum[k] = self._cnt[k] = 0.0
+        self._dirty = min(self._dirty, self.n)
+        self.n += len(t)
+        if len(tail_t):
+            self._assign(tail_t, tail_s)
+
+    def _refresh(self):
+        """Re-runs the decayed sums from the first stale bar."""
+        d, n = self._dirty, self.n
+        if d >= n:
+            return
+        a = self.decay
+        for src, dst in ((self._sum, self._ewm_sum), (self._cnt, self._ewm_cnt)):
+            prev = dst[d - 1] if d else 0.0
+            dst[d:n], _ = lfilter([1.0], [1.0, -a], src[d:n], zi=[a * prev])
+        self._dirty = n
+
+    def frame(self, start=None, end=None):
+        """
+        One row per bar in [start, end]: Close, headlines, sentiment, sentiment_<window>,
+        sentiment_ewm and fwd_return_<h> per horizon.
+        """
+        self._refresh()
+        times = self._t[:self.n]
+        s = 0 if start is None else int(np.searchsorted(times, _ns(start)[0], side='left'))
+        e = self.n if end is None else int(np.searchsorted(times, _ns(end)[0], side='right'))
+        e = max(s, e)
+        sums, cnts = self._sum[:self.n], self._cnt[:self.n]
+        # Rolling window sums from cumulative sums over the slice plus its window - 1 lead-in bars
+        lo = max(0, s - self.window + 1)
+        csum = np.concatenate([[0.0], np.cumsum(sums[lo:e])])
+        ccnt = np.concatenate([[0.0], np.cumsum(cnts[lo:e])])
+        right = np.arange(s, e) - lo + 1
+        left = np.maximum(right - self.window, 0)
+        roll_n = ccnt[right] - ccnt[left]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            out = {
+                'Close': self._close[s:e].copy(),
+                'headlines': cnts[s:e].astype(np.int64),
+                'sentiment': np.where(cnts[s:e] > 0, sums[s:e] / cnts[s:e], np.nan),
+                f'sentiment_{self.window}': np.where(roll_n > 0.5, (csum[right] - csum[left]) / roll_n, np.nan),
+                'sentiment_ewm': np.where(self._ewm_cnt[s:e] > 1e-12,
+                                          self._ewm_sum[s:e] / self._ewm_cnt[s:e], np.nan),
+            }
+            close = self._close[:self.n]
+            for h in self.horizons:
+                ret = np.full(e - s, np.nan)
+                m = max(0, min(e, self.n - h) - s) # rows whose bar t + h exists
+                ret[:m] = close[s + h:s + h + m] / close[s:s + m] - 1.0
+                out[f'fwd_return_{h}'] = ret
+        return pd.DataFrame(out, index=pd.DatetimeIndex(times[s:e].view('datetime64[ns]'), name='Date'))
+
+    def nbytes(self):
+        return sum(getattr(self, name).nbytes for name in ('_t', '_close', '_sum', '_cnt', '_ewm_sum', '_ewm_cnt')) \
+            + self._tail_t.nbytes + self._tail_s.nbytes
+
+class FusionBook:
+    """SentimentFusion per ticker for a whole universe."""
+
+    def __init__(self, **params):
+        self.params = params
+        self.dropped = 0 # headlines without a ticker
+        self._fusions = {}
+        self._lock = threading.RLock()
+
+    def fusion(self, ticker):
+        with self._lock:
+            fusion = self._fusions.get(ticker)
+            if fusion is None:
+                fusion = self._fusions[ticker] = SentimentFusion(**self.params)
+            return fusion
+
+    def add_bars(self, ticker, bars):
+        with self._lock:
+            self.fusion(ticker).add_bars(bars)
+
+    def add_headlines(self, tickers, times, scores):
+        """
+        Headlines for any mix of tickers (`tickers` is one symbol or one per headline).
+        Grouped with one stable sort, then each ticker's slice is joined to its own bars.
+        Headlines whose ticker is missing (None / NaN) are dropped.
+        """
+        t = _ns(times)
+        s = np.asarray(scores, dtype=np.float64)
+        if len(t) != len(s):
+            raise ValueError("times and scores must have the same length")
+        if isinstance(tickers, str):
+            with self._lock:
+                self.fusion(tickers)._add_ns(t, s)
+            return
+        codes, symbols = pd.factorize(np.asarray(tickers, dtype=object))
+        if len(codes) != len(t):
+            raise ValueError("tickers must be one symbol or one per headline")
+        missing = codes < 0
+        if missing.any():
+            codes, t, s = codes[~missing], t[~missing], s[~missing]
+            with self._lock:
+                self.dropped += int(missing.sum())
+        order = np.argsort(codes, kind='stable')
+        bounds = np.concatenate([[0], np.cumsum(np.bincount(codes, minlength=len(symbols)))])
+        t, s = t[order], s[order]
+        with self._lock:
+            for i, symbol in enumerate(symbols):
+                self.fusion(symbol)._add_ns(t[bounds[i]:bounds[i + 1]], s[bounds[i]:bounds[i + 1]])
+
+    def frame(self, ticker, start=None, end=None):
+        with self._lock:
+            return self.fusion(ticker).frame(start, end)
+
+    def panel(self, tickers=None, start=None, end=None):
+        """Every (or the given) ticker's frame, stacked with a (ticker, Date) index."""
+        with self._lock:
+            tickers = list(self._fusions) if tickers is None else list(tickers)
+            frames = [self.fusion(tk).frame(start, end) for tk in tickers]
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, keys=tickers, names=['ticker', 'Date'])
+
+    def __len__(self):
+        return len(self._fusions)
+
+    def stats(self):
+        with self._lock:
+            fusions = list(self._fusions.values())
+            dropped = self.dropped
+        return {"tickers": len(fusions), "bars": sum(f.n for f in fusions),
+                "headlines": sum(f.headlines for f in fusions), "dropped": dropped + sum(f.dropped for f in fusions),
+                "nbytes": sum(f.nbytes() for f in fusions)}
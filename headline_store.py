@@ -0,0 +1,263 @@
+"""
+Persistent store of scored headlines (SQLite, WAL mode).
+
+    store = headline_store()                       # process-wide, JUGAR_HEADLINE_DB or .cache/headlines.sqlite
+    store.add(text, result, ticker='TSLA', version=brain.version)
+    store.add_many(texts, results, tickers=..., ts=..., version=...)
+    store.flush()
+    store.hourly('TSLA', start, end)               # mean score per ticker per hour (DataFrame)
+    store.window('TSLA', start, end, seconds=900)  # any bucket size, from the raw rows
+
+Rows are (text hash, ticker, ts, score, label, model version); the hash is the first
+8 bytes of blake2b(text) as a signed integer, indexed for lookups, and (ticker, ts) is
+indexed for windows. Bulk inserts (add_many) are buffered and written `batch_size`
+rows per transaction; a row from add() (one interactive headline) is written at most
+`flush_delay` seconds later by a timer, together with whatever arrived meanwhile, and
+queries flush the buffer first, so they always see every added row. Each flush also folds its rows into the `hourly` rollup table (count,
+score sum, bullish / bearish counts per ticker and hour, upserted), so hourly
+aggregates read a few rows per ticker-hour however many headlines were stored.
+WAL lets readers in other processes query while a flush is writing. Times are
+stored as epoch seconds; naive datetimes and date strings are taken as UTC.
+"""
+import os
+import time
+import atexit
+import sqlite3
+import numbers
+import hashlib
+import threading
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_PATH = os.environ.get('JUGAR_HEADLINE_DB', os.path.join(BASE_DIR, '.cache', 'headlines.sqlite'))
+BATCH_SIZE = 50_000 # rows per transaction (index updates amortize much better at 50k than 10k)
+FLUSH_DELAY = 2.0 # seconds a row from add() may wait in the buffer
+HOUR = 3600
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS headlines (
+    id INTEGER PRIMARY KEY,
+    text_hash INTEGER NOT NULL,
+    ticker TEXT NOT NULL,
+    ts REAL NOT NULL,
+    score REAL NOT NULL,
+    label TEXT NOT NULL,
+    model_version TEXT
+);
+CREATE INDEX IF NOT EXISTS headlines_ticker_ts ON headlines (ticker, ts);
+CREATE INDEX IF NOT EXISTS headlines_text_hash ON headlines (text_hash);
+CREATE TABLE IF NOT EXISTS hourly (
+    ticker TEXT NOT NULL,
+    hour INTEGER NOT NULL,
+    n INTEGER NOT NULL,
+    score_sum REAL NOT NULL,
+    bullish INTEGER NOT NULL,
+    bearish INTEGER NOT NULL,
+    PRIMARY KEY (ticker, hour)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS hourly_hour ON hourly (hour);
+"""
+UPSERT_HOURLY = """
+INSERT INTO hourly (ticker, hour, n, score_sum, bullish, bearish) VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (ticker, hour) DO UPDATE SET
+    n = n + excluded.n, score_sum = score_sum + excluded.score_sum,
+    bullish = bullish + excluded.bullish, bearish = bearish + excluded.bearish
+"""
+
+def text_hash(text):
+    """Signed 64-bit blake2b of the text (what the text_hash column and index hold)."""
+    return int.from_bytes(hashlib.blake2b(text.encode('utf-8', 'surrogatepass'), digest_size=8).digest(),
+                          'little', signed=True)
+
+def _epoch(value):
+    """Epoch seconds from None, a number, a datetime / Timestamp or a date string."""
+    if value is None or isinstance(value, numbers.Real):
+        return value
+    return pd.Timestamp(value).timestamp()
+
+def _stamps(ts, n):
+    """n epoch-second floats from None (now), one timestamp, or a sequence of them."""
+    if ts is None:
+        return [time.time()] * n
+    if isinstance(ts, (str, numbers.Real)) or not hasattr(ts, '__iter__'):
+        return [_epoch(ts)] * n
+    values = np.asarray(ts)
+    if values.dtype.kind == 'M': # datetime64: vectorized
+        return (values.astype('datetime64[ns]').astype(np.int64) / 1e9).tolist()
+    if values.dtype.kind in 'iuf':
+        return values.astype(np.float64).tolist()
+    return [_epoch(t) for t in values.tolist()]
+
+class HeadlineStore:
+    def __init__(self, path=DB_PATH, batch_size=BATCH_SIZE, flush_delay=FLUSH_DELAY):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_delay = flush_delay
+        self.inserted = 0
+        self.flushes = 0
+        self.flush_seconds = 0.0
+        self._pending = []
+        self._timer = None # pending timed flush (armed by add())
+        self._lock = threading.RLock()
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # One connection per store, shared by Streamlit's script threads (guarded by _lock)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL") # WAL + NORMAL: durable across app crashes, not power loss
+        self._conn.execute("PRAGMA temp_store=MEMORY")
+        self._conn.execute("PRAGMA cache_size=-65536") # 64 MB page cache
+        self._conn.executescript(SCHEMA)
+
+    # --- writing -------------------------------------------------------------
+
+    def add(self, text, result, ticker='', ts=None, version=None):
+        """Buffers one analyze() result, written within `flush_delay` seconds (or by flush())."""
+        row = (text_hash(text), ticker or '', time.time() if ts is None else _epoch(ts),
+               float(result['score']), result['label'], version)
+        with self._lock:
+            self._pending.append(row)
+            if len(self._pending) >= self.batch_size or not self.flush_delay:
+                self.flush()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.flush_delay, self._timed_flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def _timed_flush(self):
+        with self._lock:
+            self._timer = None
+            if self._pending:
+                self.flush()
+
+    def add_many(self, texts, results, tickers=None, ts=None, version=None):
+        """Buffers a batch: tickers / ts may be sequences or one value for every row."""
+        n = len(texts)
+        if tickers is None or isinstance(tickers, str):
+            tickers = [tickers or ''] * n
+        stamps = _stamps(ts, n)
+        rows = [(text_hash(t), tk or '', s, float(r['score']), r['label'], version)
+                for t, r, tk, s in zip(texts, results, list(tickers), stamps)]
+        with self._lock:
+            self._pending.extend(rows)
+            if len(self._pending) >= self.batch_size:
+                self.flush()
+
+    def flush(self):
+        """Writes every buffered row and updates the hourly rollup, in one transaction per batch."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            pending, self._pending = self._pending, []
+            t0 = time.perf_counter()
+            for i in range(0, len(pending), self.batch_size):
+                batch = pending[i:i + self.batch_size]
+                rollup = {}
+                for _, ticker, ts, score, label, _ in batch:
+                    key = (ticker, int(ts // HOUR) * HOUR)
+                    agg = rollup.get(key)
+                    if agg is None:
+                        agg = rollup[key] = [0, 0.0, 0, 0]
+                    agg[0] += 1
+                    agg[1] += score
+                    upper = label.upper()
+                    if upper == 'BULLISH':
+                        agg[2] += 1
+                    elif upper == 'BEARISH':
+                        agg[3] += 1
+                with self._conn:
+                    self._conn.executemany("INSERT INTO headlines (text_hash, ticker, ts, score, label, model_version)"
+                                           " VALUES (?, ?, ?, ?, ?, ?)", batch)
+                    self._conn.executemany(UPSERT_HOURLY, [k + tuple(v) for k, v in rollup.items()])
+                self.inserted += len(batch)
+                self.flushes += 1
+            self.flush_seconds += time.perf_counter() - t0
+            return len(pending)
+
+    # --- queries -------------------------------------------------------------
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            if self._pending: # buffered rows are part of every answer
+                self.flush()
+            return self._conn.execute(sql, params).fetchall()
+
+    def lookup(self, text):
+        """Every stored score of this exact text: DataFrame (ticker, time, score, label, model_version)."""
+        rows = self._query("SELECT ticker, ts, score, label, model_version FROM headlines "
+                           "WHERE text_hash = ? ORDER BY ts", (text_hash(text),))
+        df = pd.DataFrame(rows, columns=['ticker', 'time', 'score', 'label', 'model_version'])
+        df['time'] = pd.to_datetime(df['time'], unit='s')
+        return df
+
+    def hourly(self, ticker=None, start=None, end=None):
+        """Per ticker and hour: count, mean score, bullish / bearish counts (from the rollup table)."""
+        where, params = [], []
+        if ticker is not None:
+            where.append("ticker = ?")
+            params.append(ticker)
+        if start is not None:
+            where.append("hour >= ?")
+            params.append(int(_epoch(start) // HOUR) * HOUR)
+        if end is not None:
+            where.append("hour < ?")
+            params.append(_epoch(end))
+        sql = "SELECT ticker, hour, n, score_sum / n, bullish, bearish FROM hourly"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        rows = self._query(sql + " ORDER BY ticker, hour", params)
+        df = pd.DataFrame(rows, columns=['ticker', 'hour', 'count', 'mean_score', 'bullish', 'bearish'])
+        df['hour'] = pd.to_datetime(df['hour'], unit='s')
+        return df
+
+    def window(self, ticker, start=None, end=None, seconds=HOUR):
+        """Count / mean / min / max score per `seconds` bucket for one ticker, from the raw rows."""
+        params = [seconds, seconds, ticker, -float('inf') if start is None else _epoch(start),
+                  float('inf') if end is None else _epoch(end)]
+        rows = self._query("SELECT CAST(ts / ? AS INTEGER) * ? AS bucket, count(*), avg(score), min(score), "
+                           "max(score) FROM headlines WHERE ticker = ? AND ts >= ? AND ts < ? "
+                           "GROUP BY bucket ORDER BY bucket", params)
+        df = pd.DataFrame(rows, columns=['bucket', 'count', 'mean_score', 'min_score', 'max_score'])
+        df['bucket'] = pd.to_datetime(df['bucket'], unit='s')
+        return df
+
+    def tickers(self):
+        return [t for (t,) in self._query("SELECT DISTINCT ticker FROM hourly ORDER BY ticker")]
+
+    def __len__(self):
+        # Rows are never deleted here, so the last rowid is the count (count(*) would scan an index)
+        with self._lock:
+            return self._conn.execute("SELECT coalesce(max(id), 0) FROM headlines").fetchone()[0] + len(self._pending)
+
+    def stats(self):
+        size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        return {"path": self.path, "rows": len(self), "pending": len(self._pending), "inserted": self.inserted,
+                "flushes": self.flushes, "rows_per_s": self.inserted / self.flush_seconds if self.flush_seconds else None,
+                "file_mb": size / 1e6}
+
+    def close(self):
+        with self._lock:
+            self.flush()
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+_store = None
+_store_lock = threading.Lock()
+
+def headline_store():
+    """The process-wide HeadlineStore at DB_PATH (buffered rows are flushed at exit)."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = HeadlineStore()
+            atexit.register(_store.flush)
+        return _store
@@ -0,0 +1,218 @@
+"""
+Bounded, columnar analysis history for a Streamlit session.
+
+    history = HistoryStore(capacity=1_000)
+    history.append(text, result['label'], result['score'], result.get('confidence'))
+    history.recent(20)                   # newest entries, as row dicts
+    for row in history: ...              # every entry, oldest first (spilled ones included)
+
+The newest `capacity` entries live in a ring of NumPy structured records (ENTRY_DTYPE):
+
+    ts float64 | score float32 | confidence float32 | text_off int64 | text_len int32 | label int8
+    = 29 bytes per entry, plus the headline's UTF-8 bytes in the store's string pool
+
+Texts are appended to one bytearray pool (no str object per entry); an entry points at
+its bytes by (offset, length). When the ring is full, the oldest quarter is spilled
+to a local SQLite file in one batch and the pool drops their bytes (compacted once
+at least half of it is dead, so the copy cost is amortized). Memory is therefore
+bounded by capacity * (29 + average text bytes), however long the session runs.
+
+Rows are dicts {'time', 'text', 'label', 'score', 'confidence'}, which is what
+reporting.generate_html_report and the streaming writers read.
+"""
+import os
+import uuid
+import sqlite3
+import weakref
+import datetime
+import threading
+
+import numpy as np
+import pandas as pd
+
+ENTRY_DTYPE = np.dtype([
+    ('ts', np.float64), # epoch seconds
+    ('score', np.float32),
+    ('confidence', np.float32), # NaN if the engine gave none
+    ('text_off', np.int64), # logical offset into the string pool
+    ('text_len', np.int32),
+    ('label', np.int8), # index into the store's label table
+])
+BYTES_PER_ENTRY = ENTRY_DTYPE.itemsize
+
+DEFAULT_CAPACITY = 1_000
+SPILL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'history')
+LABELS = ('BULLISH', 'BEARISH', 'NEUTRAL')
+COLUMNS = ['time', 'text', 'label', 'score', 'confidence']
+
+def _time(ts):
+    return datetime.datetime.fromtimestamp(ts).strftime('%Y-%m-%d %H:%M:%S')
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+class HistoryStore:
+    def __init__(self, capacity=DEFAULT_CAPACITY, spill_path=None, spill_batch=None):
+        if capacity < 1:
+            raise ValueError("capacity must be >= 1")
+        self.capacity = capacity
+        self.spill_batch = max(1, spill_batch or capacity // 4)
+        self._ring = np.zeros(capacity, dtype=ENTRY_DTYPE)
+        self._start = 0 # ring slot of the oldest in-memory entry
+        self._count = 0 # entries in the ring
+        self._pool = bytearray()
+        self._pool_shift = 0 # logical offset of self._pool[0]
+        self._labels = list(LABELS)
+        self._codes = {label: i for i, label in enumerate(LABELS)}
+        self.spilled = 0
+        # A generated spill file belongs to this store and is deleted with it
+        self._owns_file = spill_path is None
+        self.spill_path = spill_path or os.path.join(SPILL_DIR, f"{uuid.uuid4().hex}.sqlite")
+        self._conn = None
+        self._lock = threading.RLock()
+        self._finalizer = None
+
+    # --- writing -------------------------------------------------------------
+
+    def append(self, text, label, score, confidence=None, ts=None):
+        data = str(text).encode('utf-8')
+        with self._lock:
+            code = self._codes.get(label)
+            if code is None:
+                code = self._codes[label] = len(self._labels)
+                self._labels.append(label)
+            if self._count == self.capacity:
+                self._spill(self.spill_batch)
+            slot = (self._start + self._count) % self.capacity
+            self._ring[slot] = (datetime.datetime.now().timestamp() if ts is None else ts, score,
+                                np.nan if confidence is None else confidence,
+                                self._pool_shift + len(self._pool), len(data), code)
+            self._pool += data
+            self._count += 1
+
+    def append_result(self, text, result, ts=None):
+        """append() from an analyze() result dict."""
+        self.append(text, result['label'], result['score'], result.get('confidence'), ts)
+
+    def _slots(self, k=None):
+        """Ring slots of the oldest `k` in-memory entries (all of them by default), oldest first."""
+        k = self._count if k is None else k
+        return (self._start + np.arange(k)) % self.capacity
+
+    def _rows(self, records):
+        """Row dicts for ring records (a copy, so the ring may change afterwards)."""
+        pool, shift, labels = self._pool, self._pool_shift, self._labels
+        out = []
+        for ts, score, conf, off, n, code in records.tolist():
+            # Scores are float32 (~7 digits): round so reports don't show 0.7300000190734863
+            out.append({'time': _time(ts), 'text': pool[off - shift:off - shift + n].decode('utf-8'),
+                        'label': labels[code], 'score': round(score, 6),
+                        'confidence': None if conf != conf else round(conf, 6)})
+        return out
+
+    def _db(self):
+        if self._conn is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.spill_path)), exist_ok=True)
+            self._conn = sqlite3.connect(self.spill_path, check_same_thread=False) # reruns switch threads
+            self._conn.execute("PRAGMA synchronous=OFF") # spill file is scratch space, not a record
+            self._conn.execute("CREATE TABLE IF NOT EXISTS history (id INTEGER PRIMARY KEY, ts REAL, "
+                               "text TEXT, label TEXT, score REAL, confidence REAL)")
+            if self._owns_file and self._finalizer is None:
+                self._finalizer = weakref.finalize(self, _remove, self.spill_path)
+        return self._conn
+
+    def _spill(self, k):
+        """Moves the oldest `k` ring entries to SQLite (one transaction) and frees their text bytes."""
+        k = min(k, self._count)
+        pool, shift, labels = self._pool, self._pool_shift, self._labels
+        rows = [(self.spilled + i, ts, pool[off - shift:off - shift + n].decode('utf-8'), labels[code],
+                 round(score, 6), None if conf != conf else round(conf, 6))
+                for i, (ts, score, conf, off, n, code) in enumerate(self._ring[self._slots(k)].tolist())]
+        db = self._db()
+        with db:
+            db.executemany("INSERT INTO history VALUES (?, ?, ?, ?, ?, ?)", rows)
+        self._start = (self._start + k) % self.capacity
+        self._count -= k
+        self.spilled += k
+        # Text bytes before the oldest remaining entry are dead; compact once they are half the pool
+        live_from = int(self._ring['text_off'][self._start]) if self._count else self._pool_shift + len(self._pool)
+        dead = live_from - self._pool_shift
+        if dead and dead * 2 >= len(self._pool):
+            del self._pool[:dead]
+            self._pool_shift = live_from
+
+    # --- reading -------------------------------------------------------------
+
+    def __len__(self):
+        return self.spilled + self._count
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def recent(self, n=None):
+        """The newest `n` entries (all in-memory ones by default), oldest first, as row dicts."""
+        with self._lock:
+            k = self._count if n is None else min(n, self._count)
+            return self._rows(self._ring[self._slots()[self._count - k:]])
+
+    def __iter__(self):
+        """Every entry, oldest first: the spilled ones streamed from SQLite, then the ring."""
+        with self._lock:
+            spilled = self.spilled
+            ring = self.recent() # snapshot, so appends while iterating are not seen
+        if spilled:
+            cursor = self._db().execute("SELECT ts, text, label, score, confidence FROM history "
+                                        "WHERE id < ? ORDER BY id", (spilled,))
+            for ts, text, label, score, confidence in cursor:
+                yield {'time': _time(ts), 'text': text, 'label': label, 'score': score, 'confidence': confidence}
+        yield from ring
+
+    def records(self):
+        """Every entry as a list of row dicts (what generate_html_report takes)."""
+        return list(self)
+
+    def to_frame(self, limit=None):
+        """The newest `limit` entries (every entry by default) as a DataFrame."""
+        if limit is not None and limit <= self._count:
+            rows = self.recent(limit) # served from the ring, no SQLite read
+        else:
+            rows = list(self)[-limit:] if limit else list(self)
+        return pd.DataFrame(rows, columns=COLUMNS)
+
+    def nbytes(self):
+        """Memory held: ring records + string pool (SQLite pages are on disk)."""
+        return self._ring.nbytes + len(self._pool)
+
+    # --- lifecycle -----------------------------------------------------------
+
+    def clear(self):
+        with self._lock:
+            self._start = self._count = 0
+            self._pool = bytearray()
+            self._pool_shift = 0
+            if self._conn is not None:
+                with self._conn:
+                    self._conn.execute("DELETE FROM history")
+            self.spilled = 0
+
+    def close(self):
+        """Closes the spill database (and deletes it if the store created it)."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+            if self._finalizer is not None:
+                self._finalizer()
+
+    def __getstate__(self):
+        # A copy (e.g. a pickled session) reads the same spill file but never deletes it
+        state = self.__dict__.copy()
+        state.update(_conn=None, _lock=None, _finalizer=None, _owns_file=False)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
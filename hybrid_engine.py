@@ -0,0 +1,135 @@
+"""
+Hybrid (lexicon + TextBlob) sentiment brain used by the Jugar dashboard.
+
+Keyword hits are found by one precompiled regex in a single pass over the text.
+The alternation is built as a prefix trie, and matches are anchored on word
+boundaries so "high" no longer fires inside "highlight" (or "low" inside "below").
+Inflections are allowed after each word, including respelled stems: a doubled final
+consonant ("dropped", "dipping") and a dropped final e ("rising", "surging").
+"""
+import re
+import hashlib
+from textblob import TextBlob
+from result_cache import ResultCache
+
+# Weighted Financial Dictionary (word -> signed weight)
+BULL_WORDS = ['surge', 'soar', 'jump', 'rise', 'gain', 'beat', 'profit', 'record', 'growth', 'bull', 'buy', 'upgrade', 'high', 'rocket']
+BEAR_WORDS = ['plummet', 'crash', 'drop', 'fall', 'miss', 'loss', 'debt', 'bear', 'sell', 'downgrade', 'halt', 'warning', 'low', 'dip']
+DEFAULT_LEXICON = {**{w: 0.5 for w in BULL_WORDS}, **{w: -0.5 for w in BEAR_WORDS}}
+
+# Inflections accepted after a lexicon word ("surged", "gains", "bullish", "lower")
+SUFFIXES = ('s', 'es', 'd', 'ed', 'ing', 'er', 'est', 'ish')
+# Inflections of respelled stems: doubled final consonant ("dropped", "dipping") and dropped e ("rising")
+DOUBLED_SUFFIXES = ('ed', 'ing', 'er', 'est')
+E_DROP_SUFFIXES = ('ing',)
+_VOWELS = set('aeiou')
+
+def _respelled(word):
+    """{stem: suffixes} for spellings the plain suffix list misses ("drop" -> "dropp", "rise" -> "ris")."""
+    stems = {}
+    # consonant-vowel-consonant ending (not w/x/y) doubles before -ed / -ing
+    if (len(word) >= 3 and word[-1] not in _VOWELS and word[-1] not in 'wxy'
+            and word[-2] in _VOWELS and word[-3] not in _VOWELS):
+        stems[word + word[-1]] = DOUBLED_SUFFIXES
+    if len(word) >= 3 and word.endswith('e') and word[-2] not in _VOWELS:
+        stems[word[:-1]] = E_DROP_SUFFIXES
+    return stems
+
+def _trie(words):
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[''] = True
+    return trie
+
+def _trie_pattern(node):
+    """Turns a char trie into a regex alternation with shared prefixes."""
+    alts = [re.escape(ch) + _trie_pattern(child) for ch, child in sorted(node.items()) if ch]
+    if not alts:
+        return ''
+    if len(alts) == 1 and '' not in node:
+        return alts[0]
+    body = '(?:' + '|'.join(alts) + ')'
+    return body + '?' if '' in node else body
+
+class KeywordMatcher:
+    def __init__(self, lexicon=None, suffixes=SUFFIXES):
+        """lexicon: dict {word: weight}; defaults to DEFAULT_LEXICON."""
+        self.lexicon = {w.lower(): float(v) for w, v in (lexicon or DEFAULT_LEXICON).items()}
+        suffix = '(?:' + '|'.join(map(re.escape, suffixes)) + ')?' if suffixes else ''
+        alternatives = [r'\b(' + _trie_pattern(_trie(self.lexicon)) + ')' + suffix + r'\b']
+        # Respelled stems only count with their suffix ("dropped" is a hit, "dropp" is not)
+        self.stems = {}
+        by_suffixes = {}
+        for word in self.lexicon:
+            for stem, tails in _respelled(word).items():
+                if stem not in self.lexicon:
+                    self.stems[stem] = word
+                    by_suffixes.setdefault(tails, []).append(stem)
+        for tails, stems in by_suffixes.items():
+            alternatives.append(r'\b(' + _trie_pattern(_trie(stems)) + ')(?:' + '|'.join(tails) + r')\b')
+        self.pattern = re.compile('|'.join(alternatives))
+
+    def hits(self, text_lower):
+        """Distinct lexicon words present in the (already lower-cased) text."""
+        stems = self.stems
+        return {stems.get(m, m) for groups in self.pattern.findall(text_lower) for m in
+                (groups if isinstance(groups, tuple) else (groups,)) if m}
+
+    def score(self, text_lower):
+        """Sum of weights of the distinct lexicon words present."""
+        lexicon = self.lexicon
+        return sum(lexicon[w] for w in self.hits(text_lower))
+
+# Process-wide result cache (app.py rebuilds the brain on every Streamlit rerun)
+RESULT_CACHE = ResultCache()
+
+class SentimentBrain:
+    def __init__(self, lexicon=None, cache=None):
+        self.matcher = KeywordMatcher(lexicon)
+        self.cache = RESULT_CACHE if cache is None else cache
+        # Scores depend only on the lexicon + matcher, so that is the "model version"
+        signature = repr((sorted(self.matcher.lexicon.items()), self.matcher.pattern.pattern))
+        self.version = "hybrid-" + hashlib.blake2b(signature.encode(), digest_size=8).hexdigest()
+
+    def analyze(self, text):
+        key = self.cache.make_key(text, self.version)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        # 1. DICTIONARY BOOST (Fixes the "Plummet" Issue)
+        manual_score = self.matcher.score(text.lower())
+
+        # 2. NLP Score
+        blob_score = TextBlob(text).sentiment.polarity
+
+        # 3. Hybrid Calculation
+        # If manual keywords exist, they dominate. If not, fallback to Blob.
+        final_score = blob_score + manual_score
+
+        # Normalize to 0-1 range (where 0 is Bear, 1 is Bull)
+        # Standardize: -1.0 to 1.0 -> 0.0 to 1.0
+        norm_score = (final_score + 1) / 2
+
+        # Clamp between 0.01 and 0.99
+        norm_score = max(0.01, min(0.99, norm_score))
+
+        # 4. Classification
+        if norm_score > 0.6:
+            label = "BULLISH"
+            color = "#26a69a" # Green
+        elif norm_score < 0.4:
+            label = "BEARISH"
+            color = "#ef5350" # Red
+        else:
+            label = "NEUTRAL"
+            color = "#ffffff"
+
+        confidence = abs(norm_score - 0.5) * 2
+
+        result = {"label": label, "score": norm_score, "color": color, "confidence": confidence}
+        self.cache.put(key, result)
+        return result
@@ -0,0 +1,389 @@
+"""
+Streaming technical indicators: O(1) work per new bar, per ticker.
+
+market_data.get_chart used to recompute SMA-20, the 20-bar standard deviation, the
+Bollinger bands and RSI with pandas `rolling` over the whole frame on every call.
+The classes here keep just enough state (the last `window` values and running
+moments) to push one bar at a time, and give the same numbers as the pandas code:
+
+    RollingStats(20)   -> Close.rolling(20).mean() / .std()            (ddof=1)
+    RSI(14)            -> market_data.calculate_rsi(Close, 14)          (rolling means)
+    RSI(14, 'wilder')  -> Wilder's smoothed RSI (SMA seed, then 1/n smoothing)
+
+A bar that is still forming can be corrected in place with revise() (also O(1)).
+IndicatorBook holds one IndicatorState per ticker for a whole universe (LRU-bounded
+to `max_tickers`, like result_cache.ResultCache).
+"""
+import math
+import threading
+from collections import deque, OrderedDict
+
+import numpy as np
+import pandas as pd
+
+NAN = float('nan')
+# Running sums drift slowly; rebuild them from the window every this many updates
+RESYNC_EVERY = 1024
+DEFAULT_MAX_TICKERS = 4096
+
+def _finite(x):
+    return x == x and x not in (math.inf, -math.inf)
+
+class RollingStats:
+    """Rolling mean and sample standard deviation over the last `window` values (Welford add/remove)."""
+
+    def __init__(self, window=20):
+        self.window = window
+        self.values = deque(maxlen=window)
+        self.nobs = 0 # finite values in the window
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._run = 0 # identical values ending the window (exact flat-window results, as pandas)
+        self._run_before = 0
+        self._since_resync = 0
+
+    def _add(self, x):
+        if not _finite(x): return
+        self.nobs += 1
+        d = x - self._mean
+        self._mean += d / self.nobs
+        self._m2 += d * (x - self._mean)
+
+    def _remove(self, x):
+        if not _finite(x): return
+        self.nobs -= 1
+        if self.nobs == 0:
+            self._mean = self._m2 = 0.0
+            return
+        d = x - self._mean
+        self._mean -= d / self.nobs
+        self._m2 -= d * (x - self._mean)
+
+    def push(self, x):
+        """Adds a new value (evicting the oldest once the window is full)."""
+        x = float(x)
+        if len(self.values) == self.window:
+            self._remove(self.values[0])
+        self._run_before = self._run
+        self._run = self._run + 1 if self.values and x == self.values[-1] else 1
+        self.values.append(x)
+        self._add(x)
+        self._tick()
+
+    def revise(self, x):
+        """Replaces the most recent value (e.g. an updated, still-forming bar)."""
+        x = float(x)
+        self._remove(self.values[-1])
+        self._run = self._run_before + 1 if len(self.values) > 1 and x == self.values[-2] else 1
+        self.values[-1] = x
+        self._add(x)
+        self._tick()
+
+    def _tick(self):
+        self._since_resync += 1
+        if self._since_resync >= RESYNC_EVERY:
+            self.resync()
+
+    def resync(self):
+        """Recomputes the moments exactly from the window contents (O(window))."""
+        finite = [v for v in self.values if _finite(v)]
+        self.nobs = len(finite)
+        self._mean = math.fsum(finite) / self.nobs if finite else 0.0
+        self._m2 = math.fsum((v - self._mean) ** 2 for v in finite)
+        self._since_resync = 0
+
+    @property
+    def mean(self):
+        # min_periods=window, as pandas rolling(window)
+        if self.nobs != self.window:
+            return NAN
+        return self.values[-1] if self._run >= self.window else self._mean
+
+    @property
+    def std(self):
+        if self.nobs != self.window or self.nobs < 2:
+            return NAN
+        if self._run >= self.window:
+            return 0.0
+        return math.sqrt(max(self._m2, 0.0) / (self.nobs - 1))
+
+class RSI:
+    """
+    Relative Strength Index, one close at a time.
+    method='rolling' is calculate_rsi (simple rolling means of gains/losses, the first
+    bar counting as a zero move); method='wilder' uses Wilder's smoothing.
+    """
+
+    def __init__(self, window=14, method='rolling'):
+        if method not in ('rolling', 'wilder'):
+            raise ValueError(f"Unknown RSI method: {method!r}")
+        self.window = window
+        self.method = method
+        self.reset()
+
+    def reset(self):
+        self._prev = None # close before the last one
+        self._last = None # last close
+        self._gains = deque(maxlen=self.window)
+        self._losses = deque(maxlen=self.window)
+        self._gain_sum = self._loss_sum = 0.0
+        self._gain_nz = self._loss_nz = 0 # non-zero entries, so an all-flat window is exactly 0
+        self._avg = None # wilder: (avg_gain, avg_loss)
+        self._prev_avg = None
+        self._moves = 0
+        self._since_resync = 0
+        self.value = NAN
+
+    def _move(self, close, prev):
+        if prev is None:
+            return 0.0, 0.0
+        delta = close - prev
+        if delta != delta: # NaN close: pandas' where() turns it into no move
+            return 0.0, 0.0
+        return (delta, 0.0) if delta > 0 else (0.0, -delta)
+
+    def push(self, close):
+        close = float(close)
+        gain, loss = self._move(close, self._last)
+        self._prev, self._last = self._last, close
+        if self.method == 'rolling':
+            self._push_rolling(gain, loss)
+        else:
+            self._push_wilder(gain, loss, first=self._prev is None)
+        return self.value
+
+    def revise(self, close):
+        """Replaces the last close."""
+        if self._last is None:
+            return self.push(close)
+        close = float(close)
+        gain, loss = self._move(close, self._prev)
+        self._last = close
+        if self.method == 'rolling':
+            self._drop(self._gains[-1], self._losses[-1])
+            self._gains[-1], self._losses[-1] = gain, loss
+            self._take(gain, loss)
+            self._rolling_value()
+        else:
+            if self._prev is not None: # undo the last move
+                self._avg = self._prev_avg
+                self._moves -= 1
+                self._gains.pop(); self._losses.pop()
+            self._push_wilder(gain, loss, first=self._prev is None)
+        return self.value
+
+    # --- rolling ---
+    def _take(self, gain, loss):
+        self._gain_sum += gain; self._loss_sum += loss
+        self._gain_nz += gain != 0; self._loss_nz += loss != 0
+
+    def _drop(self, gain, loss):
+        self._gain_sum -= gain; self._loss_sum -= loss
+        self._gain_nz -= gain != 0; self._loss_nz -= loss != 0
+
+    def _push_rolling(self, gain, loss):
+        if len(self._gains) == self.window:
+            self._drop(self._gains[0], self._losses[0])
+        self._gains.append(gain); self._losses.append(loss)
+        self._take(gain, loss)
+        self._since_resync += 1
+        if self._since_resync >= RESYNC_EVERY:
+            self._gain_sum, self._loss_sum = math.fsum(self._gains), math.fsum(self._losses)
+            self._since_resync = 0
+        self._rolling_value()
+
+    def _rolling_value(self):
+        if len(self._gains) < self.window:
+            self.value = NAN
+            return
+        gain = self._gain_sum / self.window if self._gain_nz else 0.0
+        loss = self._loss_sum / self.window if self._loss_nz else 0.0
+        self.value = _rsi(gain, loss)
+
+    # --- wilder ---
+    def _push_wilder(self, gain, loss, first):
+        self._prev_avg = self._avg
+        if first: # no move yet
+            self.value = NAN
+            return
+        self._moves += 1
+        if self._avg is None:
+            # Seed with the simple mean of the first `window` moves
+            self._gains.append(gain); self._losses.append(loss)
+            if self._moves == self.window:
+                self._avg = (math.fsum(self._gains) / self.window, math.fsum(self._losses) / self.window)
+        else:
+            self._gains.append(gain); self._losses.append(loss)
+            g, l = self._avg
+            n = self.window
+            self._avg = (g + (gain - g) / n, l + (loss - l) / n)
+        self.value = _rsi(*self._avg) if self._avg is not None else NAN
+
+def _rsi(gain, loss):
+    if loss == 0:
+        return 100.0 if gain > 0 else NAN # 0/0 is NaN in the pandas version too
+    return 100.0 - 100.0 / (1.0 + gain / loss)
+
+class IndicatorState:
+    """All chart indicators for one ticker: SMA, STD, Bollinger bands and RSI."""
+
+    def __init__(self, window=20, num_std=2, rsi_window=14, rsi_method='rolling'):
+        self.window = window
+        self.num_std = num_std
+        self.rsi_method = rsi_method
+        self.stats = RollingStats(window)
+        self.rsi = RSI(rsi_window, rsi_method)
+        self.bars = 0
+        self.last = None
+
+    @property
+    def columns(self):
+        w = self.window
+        return [f'SMA_{w}', f'STD_{w}', 'Upper_BB', 'Lower_BB', 'RSI']
+
+    def _row(self):
+        sma, std = self.stats.mean, self.stats.std
+        band = std * self.num_std
+        self.last = dict(zip(self.columns, (sma, std, sma + band, sma - band, self.rsi.value)))
+        return self.last
+
+    def update(self, close):
+        """Pushes a new bar's close; returns the indicator row for it."""
+        self.stats.push(close)
+        self.rsi.push(close)
+        self.bars += 1
+        return self._row()
+
+    def revise(self, close):
+        """Corrects the close of the latest bar; returns the recomputed row."""
+        if self.bars == 0:
+            return self.update(close)
+        self.stats.revise(close)
+        self.rsi.revise(close)
+        return self._row()
+
+    def seed(self, closes):
+        """Resets and replays a close history; returns the rows for every bar."""
+        self.stats = RollingStats(self.window)
+        self.rsi = RSI(self.rsi.window, self.rsi.method)
+        self.bars = 0
+        self.last = None
+        return [self.update(c) for c in closes]
+
+    @property
+    def warmup(self):
+        """Leading bars whose values depend on what came before them (NaN or a first zero move)."""
+        return max(self.window - 1, self.rsi.window)
+
+    def fresh(self):
+        """A new, empty state with the same parameters."""
+        return IndicatorState(self.window, self.num_std, self.rsi.window, self.rsi_method)
+
+def _same(a, b):
+    """Same index and same values (NaN == NaN)."""
+    return a.index.equals(b.index) and np.array_equal(a.to_numpy(float), b.to_numpy(float), equal_nan=True)
+
+class IndicatorBook:
+    """IndicatorStates for a universe of tickers, plus the indicator frames behind charts."""
+
+    def __init__(self, max_tickers=DEFAULT_MAX_TICKERS, **params):
+        if max_tickers < 1:
+            raise ValueError("max_tickers must be >= 1")
+        self.max_tickers = max_tickers
+        self.params = params
+        self.evictions = 0
+        self._states = OrderedDict()
+        # ticker -> (closes, indicator rows, first bar the state was seeded from) of the last apply()
+        self._frames = {}
+        self._lock = threading.RLock()
+
+    def state(self, ticker):
+        with self._lock:
+            state = self._states.get(ticker)
+            if state is None:
+                state = self._states[ticker] = IndicatorState(**self.params)
+                while len(self._states) > self.max_tickers:
+                    old, _ = self._states.popitem(last=False)
+                    self._frames.pop(old, None)
+                    self.evictions += 1
+            else:
+                self._states.move_to_end(ticker)
+            return state
+
+    def seed(self, ticker, closes):
+        with self._lock:
+            return self.state(ticker).seed(closes)
+
+    def update(self, ticker, close):
+        with self._lock:
+            return self.state(ticker).update(close)
+
+    def revise(self, ticker, close):
+        with self._lock:
+            return self.state(ticker).revise(close)
+
+    def latest(self, ticker):
+        state = self._states.get(ticker)
+        return state.last if state else None
+
+    def __len__(self):
+        return len(self._states)
+
+    def stats(self):
+        with self._lock:
+            return {"tickers": len(self._states), "frames": len(self._frames),
+                    "max_tickers": self.max_tickers, "evictions": self.evictions}
+
+    def apply(self, ticker, df):
+        """
+        Returns a copy of an OHLCV frame with the indicator columns added.
+        Bars already seen for this ticker are reused and only new bars (plus a revised
+        last bar) go through the streaming state. Changed history (re-adjusted prices,
+        gaps) triggers a full re-seed from the frame. The result always equals the
+        pandas rolling code run over `df` alone.
+        """
+        close = df['Close'].astype(float)
+        with self._lock:
+            state = self.state(ticker)
+            cached = self._frames.get(ticker)
+            rows = self._extend(state, cached, close) if cached is not None else None
+            if rows is None:
+                rows = pd.DataFrame(state.seed(close), index=close.index, columns=state.columns)
+                origin = close.index[0] if len(close) else None
+            else:
+                origin = cached[2]
+            self._frames[ticker] = (close, rows, origin)
+        out = df.copy()
+        for col in state.columns:
+            out[col] = rows[col]
+        return out
+
+    @staticmethod
+    def _extend(state, cached, close):
+        """Indicator rows for `close` built on top of the cached ones, or None if a re-seed is needed."""
+        seen_close, seen, origin = cached
+        if close.empty or seen.empty:
+            return None
+        last_ts = seen.index[-1]
+        if close.index[0] < seen.index[0] or last_ts not in close.index:
+            return None
+        slid = close.index[0] != origin # the state has bars from before this frame
+        if slid and state.rsi_method == 'wilder': # smoothing remembers the whole history
+            return None
+        head = close.loc[:last_ts]
+        if not _same(head.iloc[:-1], seen_close.loc[head.index[0]:].iloc[:-1]):
+            return None
+        rows = seen.loc[head.index[0]:].copy() # bars that slid out of the frame are dropped
+        if not _same(head.iloc[-1:], seen_close.iloc[-1:]):
+            rows.iloc[-1] = [state.revise(head.iloc[-1])[c] for c in state.columns]
+        tail = close.loc[close.index > last_ts]
+        if len(tail):
+            new = pd.DataFrame([state.update(c) for c in tail], index=tail.index, columns=state.columns)
+            rows = pd.concat([rows, new])
+        if slid:
+            # The first bars were warmed by history the frame no longer has: recompute
+            # them from the frame alone (later bars only look back inside the frame)
+            k = min(len(rows), state.warmup)
+            fresh = state.fresh()
+            rows.iloc[:k] = [[r[c] for c in state.columns] for r in fresh.seed(close.iloc[:k])]
+        return rows
@@ -0,0 +1,177 @@
+"""
+Per-stage timing for the scoring pipeline, market data and charts.
+
+    with timer('engine.predict'):
+        scores = model.predict_proba(X)
+
+    @timed('market_data.fetch_many')
+    def fetch_many(...): ...
+
+Disabled by default (set JUGAR_METRICS=1, or call enable()): timer() then returns a
+shared no-op context manager and timed() functions only test a flag, so the hooks
+can stay in hot paths. When enabled, every stage feeds a cumulative histogram
+(Prometheus-style buckets, exported by export_prometheus()), and the timings since
+start_rerun() are kept for the app's per-rerun sidebar panel.
+start_rerun(timed=True) turns timing on for the calling context only (context
+variables), so one Streamlit session's toggle does not time (or stop timing) every
+other session. Work handed to pool threads is wrapped with propagate(), so its stages
+are timed, and listed in the rerun's panel, like the caller's own.
+"""
+import os
+import bisect
+import functools
+import threading
+import contextvars
+from time import perf_counter
+
+ENV_VAR = 'JUGAR_METRICS'
+# Histogram bucket upper bounds, in seconds
+BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+           0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+METRIC = 'jugar_stage_seconds'
+
+class Histogram:
+    __slots__ = ('counts', 'sum', 'count')
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1) # last slot: above every bound (+Inf)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.sum += seconds
+        self.count += 1
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-quantile (what histogram_quantile() would bracket)."""
+        if not self.count:
+            return None
+        rank, seen = q * self.count, 0
+        for bound, n in zip(BUCKETS + (float('inf'),), self.counts):
+            seen += n
+            if seen >= rank:
+                return bound
+        return float('inf')
+
+class _Noop:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NOOP = _Noop()
+
+class _Timer:
+    __slots__ = ('stage', 't0')
+
+    def __init__(self, stage):
+        self.stage = stage
+
+    def __enter__(self):
+        self.t0 = perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        observe(self.stage, perf_counter() - self.t0)
+        return False
+
+_enabled = os.environ.get(ENV_VAR, '').lower() in ('1', 'true', 'yes', 'on')
+_histograms = {} # stage -> Histogram
+_lock = threading.Lock()
+_rerun = contextvars.ContextVar('rerun', default=None) # [(stage, seconds)] since start_rerun()
+_timed = contextvars.ContextVar('timed', default=False) # timing on for this context only
+
+def enable():
+    global _enabled
+    _enabled = True
+
+def disable():
+    global _enabled
+    _enabled = False
+
+def enabled():
+    return _enabled or _timed.get()
+
+def timer(stage):
+    """Context manager timing one `stage` (a no-op when disabled)."""
+    return _Timer(stage) if _enabled or _timed.get() else _NOOP
+
+def timed(stage):
+    """Decorator: times every call of the function as `stage`."""
+    def wrap(fn):
+        @functools.wraps(fn)
+        def inner(*args, **kwargs):
+            if not (_enabled or _timed.get()):
+                return fn(*args, **kwargs)
+            t0 = perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                observe(stage, perf_counter() - t0)
+        return inner
+    return wrap
+
+def observe(stage, seconds):
+    with _lock:
+        hist = _histograms.get(stage)
+        if hist is None:
+            hist = _histograms[stage] = Histogram()
+        hist.observe(seconds)
+    rerun = _rerun.get()
+    if rerun is not None:
+        rerun.append((stage, seconds)) # list.append is atomic: pool threads may share the list
+
+def start_rerun(timed=False):
+    """Starts collecting this context's stage timings (one Streamlit rerun); `timed` enables them here."""
+    _rerun.set([])
+    _timed.set(timed)
+
+def propagate(fn):
+    """`fn` wrapped to run in (a copy of) the caller's context, e.g. on a pool thread."""
+    context = contextvars.copy_context()
+
+    @functools.wraps(fn)
+    def run(*args, **kwargs):
+        return context.copy().run(fn, *args, **kwargs) # one copy per call: calls may overlap
+    return run
+
+def rerun_timings():
+    """{stage: (calls, total seconds)} since start_rerun() in this context, in first-seen order."""
+    out = {}
+    for stage, seconds in list(_rerun.get() or ()):
+        calls, total = out.get(stage, (0, 0.0))
+        out[stage] = (calls + 1, total + seconds)
+    return out
+
+def snapshot():
+    """{stage: {count, sum, mean, p50, p99}} over everything observed (quantiles are bucket bounds)."""
+    with _lock:
+        return {stage: {'count': h.count, 'sum': h.sum, 'mean': h.sum / h.count,
+                        'p50': h.quantile(0.5), 'p99': h.quantile(0.99)}
+                for stage, h in sorted(_histograms.items()) if h.count}
+
+def reset():
+    with _lock:
+        _histograms.clear()
+
+def _label(value):
+    return value.replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+
+def export_prometheus():
+    """Every stage histogram in the Prometheus text exposition format."""
+    lines = [f"# HELP {METRIC} Time spent per pipeline stage.", f"# TYPE {METRIC} histogram"]
+    with _lock:
+        for stage, h in sorted(_histograms.items()):
+            label = f'stage="{_label(stage)}"'
+            cumulative = 0
+            for bound, n in zip(BUCKETS, h.counts):
+                cumulative += n
+                lines.append(f'{METRIC}_bucket{{{label},le="{bound:g}"}} {cumulative}')
+            lines.append(f'{METRIC}_bucket{{{label},le="+Inf"}} {h.count}')
+            lines.append(f'{METRIC}_sum{{{label}}} {h.sum!r}')
+            lines.append(f'{METRIC}_count{{{label}}} {h.count}')
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,293 @@
+"""
+Multi-asset portfolio ledger backed by typed arrays.
+
+    ledger = Ledger(balance=10_000)
+    ledger.execute_trade('AAPL', 'buy', 187.5, 10)          # (True, "ORDER FILLED")
+    status = ledger.execute_batch({'symbol': [...], 'side': [...], 'price': [...], 'amount': [...]})
+
+Orders follow MarketSim.execute_trade per symbol: a buy needs balance >= price * amount
+(else INSUFFICIENT FUNDS), a sell needs the symbol's position >= amount (else
+INSUFFICIENT ASSETS). A batch gives exactly the balances and positions of
+executing its orders one at a time, in order.
+
+State is arrays, not dicts:
+  - symbols are interned to int32 ids; positions are one int64 array indexed by id
+  - the journal is an append-only NumPy structured array (JOURNAL_DTYPE, packed):
+      ts int64 | symbol int32 | side int8 | status int8 | amount int64 | price float64 | balance float64
+    = 38 bytes per trade (38 MB per million entries), grown by doubling
+
+execute_batch() works through the orders in chunks. Per chunk it assumes every order
+fills, gets the balance before each order from one cumulative sum and each position
+from a per-symbol cumulative sum, and finds the first order that would be rejected.
+Everything before it is final; the rejected order is recorded and the rest of the
+chunk is re-checked. A chunk with many rejections finishes in a plain loop.
+"""
+import time
+import threading
+
+import numpy as np
+import pandas as pd
+
+# Status codes (journal 'status') and their execute_trade messages
+FILLED, NO_FUNDS, NO_ASSETS, INVALID = 0, 1, 2, 3
+MESSAGES = ["ORDER FILLED", "INSUFFICIENT FUNDS", "INSUFFICIENT ASSETS", "INVALID ORDER"]
+BUY, SELL = 1, -1
+
+JOURNAL_DTYPE = np.dtype([
+    ('ts', np.int64), # epoch nanoseconds
+    ('symbol', np.int32),
+    ('side', np.int8), # BUY / SELL (0 if the side was not understood)
+    ('status', np.int8),
+    ('amount', np.int64),
+    ('price', np.float64),
+    ('balance', np.float64), # cash after the order
+])
+BYTES_PER_TRADE = JOURNAL_DTYPE.itemsize
+
+INITIAL_CAPACITY = 1024
+# Orders checked together in execute_batch(); re-check passes per chunk before looping
+BATCH_CHUNK = 4096
+MAX_PASSES = 8
+
+def _group_running(keys, values):
+    """Per-key running total of `values` before each position (exclusive cumsum by key, in order)."""
+    order = np.argsort(keys, kind='stable')
+    v = values[order]
+    run = np.cumsum(v) - v
+    k = keys[order]
+    first = np.ones(len(k), dtype=bool)
+    first[1:] = k[1:] != k[:-1]
+    start = np.maximum.accumulate(np.where(first, np.arange(len(k)), 0))
+    out = np.empty_like(run)
+    out[order] = run - run[start]
+    return out
+
+def _side(value):
+    if isinstance(value, (int, float, np.number)):
+        return int(np.sign(value)) if value == value else 0
+    return {'buy': BUY, 'sell': SELL}.get(str(value).strip().lower(), 0)
+
+def _sides(values):
+    """'buy'/'sell' (any case) or signed numbers -> BUY / SELL / 0 as int8."""
+    if isinstance(values, (np.ndarray, pd.Series)) and values.dtype.kind in 'iuf':
+        return np.sign(np.nan_to_num(np.asarray(values, dtype=np.float64))).astype(np.int8)
+    codes, uniques = pd.factorize(np.asarray(values, dtype=object))
+    table = np.array([_side(u) for u in uniques] + [0], dtype=np.int8)
+    return table[codes] # code -1 (missing) -> the trailing 0
+
+class Ledger:
+    def __init__(self, balance=0.0, capacity=INITIAL_CAPACITY):
+        self._cash = float(balance)
+        self._ids = {} # symbol -> id
+        self._symbols = []
+        self._pos = np.zeros(0, dtype=np.int64)
+        self._journal = np.zeros(max(1, capacity), dtype=JOURNAL_DTYPE)
+        self._n = 0
+        self._lock = threading.Lock()
+
+    # --- state -------------------------------------------------------------
+
+    @property
+    def balance(self):
+        return self._cash
+
+    def position(self, symbol):
+        i = self._ids.get(str(symbol).strip().upper())
+        return 0 if i is None else int(self._pos[i])
+
+    def positions(self):
+        """{symbol: shares} for every non-zero position."""
+        return {s: int(q) for s, q in zip(self._symbols, self._pos) if q}
+
+    def __len__(self):
+        return self._n
+
+    def nbytes(self):
+        """Memory held by the arrays (journal capacity included)."""
+        return self._journal.nbytes + self._pos.nbytes
+
+    def journal(self):
+        """The journal as a DataFrame (symbol and status as categoricals)."""
+        j = self._journal[:self._n]
+        return pd.DataFrame({
+            'ts': pd.to_datetime(j['ts'], unit='ns', utc=True),
+            'symbol': pd.Categorical.from_codes(j['symbol'], self._symbols),
+            'side': np.where(j['side'] == BUY, 'buy', np.where(j['side'] == SELL, 'sell', '')),
+            'status': pd.Categorical.from_codes(j['status'], MESSAGES),
+            'amount': j['amount'], 'price': j['price'], 'balance': j['balance'],
+        })
+
+    def journal_array(self):
+        """Read-only view of the raw journal entries."""
+        view = self._journal[:self._n]
+        view.flags.writeable = False
+        return view
+
+    # --- internals ---------------------------------------------------------
+
+    def _intern(self, symbols):
+        """Symbol ids for an array of symbols (new symbols get a position slot); -1 if missing."""
+        if isinstance(getattr(symbols, 'dtype', None), pd.CategoricalDtype):
+            cat = pd.Categorical(symbols) # already factorized
+            codes, uniques = cat.codes, cat.categories
+        else:
+            codes, uniques = pd.factorize(np.asarray(symbols, dtype=object))
+        table = np.empty(len(uniques) + 1, dtype=np.int32)
+        for k, sym in enumerate(uniques):
+            table[k] = self._id(sym)
+        table[-1] = -1
+        if len(self._symbols) > len(self._pos):
+            self._pos = np.concatenate((self._pos, np.zeros(len(self._symbols) - len(self._pos), dtype=np.int64)))
+        return table[codes]
+
+    def _id(self, symbol):
+        key = '' if symbol is None or symbol != symbol else str(symbol).strip().upper()
+        if not key:
+            return -1
+        i = self._ids.get(key)
+        if i is None:
+            i = self._ids[key] = len(self._symbols)
+            self._symbols.append(key)
+        return i
+
+    def _reserve(self, extra):
+        need = self._n + extra
+        if need > len(self._journal):
+            grown = np.zeros(max(need, 2 * len(self._journal)), dtype=JOURNAL_DTYPE)
+            grown[:self._n] = self._journal[:self._n]
+            self._journal = grown
+
+    def _fill(self, sym, buy, qty, cost, status):
+        """
+        Decides the orders of one chunk in sequence (status written in place) and
+        applies the fills to the cash and positions.
+        """
+        flow = np.where(buy, -cost, cost)
+        delta = np.where(buy, qty, -qty)
+        m, start, cash, pos = len(sym), 0, self._cash, self._pos
+        for passes in range(MAX_PASSES):
+            seg = slice(start, m)
+            # Balance and position before each order, if every order from `start` fills
+            run = np.cumsum(np.concatenate(([cash], flow[seg])))
+            held = pos[sym[seg]] + _group_running(sym[seg], delta[seg])
+            fails = np.flatnonzero(np.where(buy[seg], run[:-1] < cost[seg], held < qty[seg]))
+            k = fails[0] if len(fails) else m - start
+            if k:
+                pos += np.bincount(sym[start:start + k], weights=delta[start:start + k],
+                                   minlength=len(pos)).astype(np.int64)
+                cash = float(run[k])
+                status[start:start + k] = FILLED
+                start += k
+            if start == m or len(fails) > MAX_PASSES - passes:
+                break # done, or too many rejections ahead to peel off one pass at a time
+            status[start] = NO_FUNDS if buy[start] else NO_ASSETS
+            start += 1
+        if start < m:
+            cash = self._loop(sym, buy, qty, cost, status, start, cash)
+        self._cash = cash
+
+    def _loop(self, sym, buy, qty, cost, status, start, cash):
+        """The orders from `start` one at a time (plain Python numbers); returns the cash."""
+        held = self._pos.tolist()
+        codes = []
+        for j, b, q, c in zip(sym[start:].tolist(), buy[start:].tolist(), qty[start:].tolist(), cost[start:].tolist()):
+            if b:
+                if cash >= c:
+                    cash -= c
+                    held[j] += q
+                    codes.append(FILLED)
+                else:
+                    codes.append(NO_FUNDS)
+            elif held[j] >= q:
+                cash += c
+                held[j] -= q
+                codes.append(FILLED)
+            else:
+                codes.append(NO_ASSETS)
+        status[start:] = codes
+        self._pos[:] = held
+        return cash
+
+    # --- orders ------------------------------------------------------------
+
+    def execute_trade(self, symbol, action, price, amount=1):
+        """One order, MarketSim.execute_trade style: (filled, message)."""
+        side = _side(action)
+        with self._lock:
+            i = self._id(symbol)
+            if i >= len(self._pos):
+                self._pos = np.append(self._pos, np.zeros(i + 1 - len(self._pos), dtype=np.int64))
+            try:
+                price, qty = float(price), float(amount)
+            except (TypeError, ValueError):
+                price, qty = np.nan, 0.0
+            if i < 0 or not side or not (0 < price < np.inf) or not (1 <= qty < 2 ** 53) or qty != int(qty):
+                status, qty = INVALID, 0
+            else:
+                qty = int(qty)
+                cost = price * qty
+                if side == BUY:
+                    status = FILLED if self._cash >= cost else NO_FUNDS
+                    if status == FILLED:
+                        self._cash -= cost
+                        self._pos[i] += qty
+                else:
+                    status = FILLED if self._pos[i] >= qty else NO_ASSETS
+                    if status == FILLED:
+                        self._cash += cost
+                        self._pos[i] -= qty
+            self._reserve(1)
+            self._journal[self._n] = (time.time_ns(), i, side, status, qty, price, self._cash)
+            self._n += 1
+        return status == FILLED, MESSAGES[status]
+
+    def execute_batch(self, orders, ts=None):
+        """
+        Executes orders in sequence. `orders` is a DataFrame / dict of columns
+        symbol, side ('buy'/'sell' or +1/-1), price, amount (default 1), optional ts
+        (epoch ns) - a scalar applies to every order - or a list of
+        (symbol, side, price[, amount]) tuples. Categorical symbols and numeric sides
+        skip the string factorization.
+        Returns the int8 status of every order (FILLED, NO_FUNDS, NO_ASSETS, INVALID).
+        """
+        if isinstance(orders, (pd.DataFrame, dict)):
+            cols = {k: orders[k] for k in ('symbol', 'side', 'price', 'amount', 'ts') if k in orders}
+        else:
+            rows = [tuple(o) + (1,) * (4 - len(o)) for o in orders] # amount defaults to 1
+            cols = dict(zip(('symbol', 'side', 'price', 'amount'), zip(*rows)))
+        n = len(cols.get('symbol', ()))
+        # Scalar columns apply to every order
+        cols = {k: [v] * n if np.ndim(v) == 0 else v for k, v in cols.items()}
+        price = np.asarray(cols.get('price', np.full(n, np.nan)), dtype=np.float64)
+        amount = np.asarray(cols['amount'], dtype=np.float64) if 'amount' in cols else np.ones(n)
+        stamps = cols.get('ts', ts)
+        stamps = np.broadcast_to(np.asarray(time.time_ns() if stamps is None else stamps, dtype=np.int64), (n,))
+        side = _sides(cols.get('side', np.zeros(n)))
+
+        with self._lock:
+            sym = self._intern(cols.get('symbol', ()))
+            # Whole, positive share counts at a finite, positive price
+            valid = ((sym >= 0) & (side != 0) & np.isfinite(price) & (price > 0)
+                     & (amount >= 1) & (amount == np.floor(amount)) & (amount < 2 ** 53))
+            qty = np.where(valid, amount, 0).astype(np.int64)
+            status = np.full(n, INVALID, dtype=np.int8)
+            idx = np.flatnonzero(valid)
+            cash0 = self._cash
+            for lo in range(0, len(idx), BATCH_CHUNK):
+                part = idx[lo:lo + BATCH_CHUNK]
+                chunk_status = np.empty(len(part), dtype=np.int8)
+                q = qty[part]
+                self._fill(sym[part], side[part] == BUY, q, price[part] * q, chunk_status)
+                status[part] = chunk_status
+
+            # Cash after every order (rejected ones add 0.0: identical sums)
+            filled = status == FILLED
+            flow = np.where(filled, np.where(side == BUY, -(price * qty), price * qty), 0.0)
+            balance = np.cumsum(np.concatenate(([cash0], flow)))[1:]
+
+            self._reserve(n)
+            rows = self._journal[self._n:self._n + n]
+            rows['ts'], rows['symbol'], rows['side'], rows['status'] = stamps, sym, side, status
+            rows['amount'], rows['price'], rows['balance'] = np.where(valid, amount, 0).astype(np.int64), price, balance
+            self._n += n
+        return status
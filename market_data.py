@@ -1,7 +1,82 @@
-import yfinance as yf
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
 import pandas as pd
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
+from bar_cache import BarCache
+from providers import get_provider
+from indicators import IndicatorBook
+from chart_data import reduce_chart, volume_marker
+import figures
+from shared_cache import shared_cache
+from instrumentation import timer, timed, propagate
+
+# Process-wide on-disk bar cache (survives restarts, only the missing tail is downloaded)
+BAR_CACHE = BarCache()
+
+# Live SMA/Bollinger/RSI state per ticker (same numbers as the pandas rolling versions)
+INDICATORS = IndicatorBook(window=20, num_std=2, rsi_window=14, max_tickers=512)
+
+# Upper bound on concurrent upstream downloads across all sessions/threads of the process
+MAX_CONCURRENT_FETCHES = 8
+_upstream_slots = threading.BoundedSemaphore(MAX_CONCURRENT_FETCHES)
+
+# Bars shared by every session: stale entries are served at once and refreshed in the background
+MARKET_TTL = 300
+MARKET_CACHE = shared_cache('market_data', ttl=MARKET_TTL)
+
+class FetchResult(namedtuple('FetchResult', ['ticker', 'data', 'error'])):
+    """One ticker of fetch_many(): `data` is the OHLCV frame, or None with `error` set."""
+    __slots__ = ()
+
+    @property
+    def ok(self):
+        return self.error is None
+
+def _load_uncached(ticker, period, interval):
+    provider = get_provider()
+    with timer('market_data.download'): # cache misses only (load_history is 'market_data.fetch')
+        if not provider.cacheable:
+            return provider.history(ticker, period=period, interval=interval)
+        with _upstream_slots:
+            return BAR_CACHE.history(ticker, period=period, interval=interval)
+
+@timed('market_data.fetch')
+def load_history(ticker, period="6mo", interval="1d"):
+    """
+    OHLCV bars for `ticker` from the active provider (through the bar cache when remote).
+    Served from the shared stale-while-revalidate cache; identical requests already in
+    flight are coalesced, so the callers share one download.
+    """
+    key = (id(get_provider()), ticker.upper(), period, interval)
+    df = MARKET_CACHE.get(key, lambda: _load_uncached(ticker, period, interval))
+    # Every caller gets its own copy (get_chart adds indicator columns in place)
+    return df.copy()
+
+@timed('market_data.fetch_many')
+def fetch_many(tickers, period="6mo", interval="1d", max_workers=MAX_CONCURRENT_FETCHES):
+    """
+    Fetches several tickers concurrently. Returns {ticker: FetchResult} in input order;
+    a failing or empty ticker carries its exception instead of failing the batch.
+    """
+    tickers = list(dict.fromkeys(t.strip().upper() for t in tickers if t and t.strip()))
+
+    def fetch_one(ticker):
+        try:
+            df = load_history(ticker, period, interval)
+        except Exception as e:
+            return FetchResult(ticker, None, e)
+        if df is None or df.empty:
+            return FetchResult(ticker, None, LookupError(f"No market data for {ticker}"))
+        return FetchResult(ticker, df, None)
+
+    if len(tickers) <= 1:
+        return {t: fetch_one(t) for t in tickers}
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(tickers)), thread_name_prefix='fetch') as pool:
+        # Workers run in this caller's context (its session's stage timings)
+        return dict(zip(tickers, pool.map(propagate(fetch_one), tickers)))
 
 def calculate_rsi(data, window=14):
     """Helper to calculate RSI without external heavy libraries"""
@@ -11,99 +86,100 @@ def calculate_rsi(data, window=14):
     rs = gain / loss
     return 100 - (100 / (1 + rs))
 
-def get_chart(ticker):
+def _technical_skeleton():
+    """get_chart's figure without data: built once, then reused by figures.render()."""
+    # Subplots (Row 1: Price, Row 2: Volume)
+    fig = make_subplots(
+        rows=2, cols=1, 
+        shared_xaxes=True, 
+        vertical_spacing=0.05, 
+        row_heights=[0.75, 0.25]
+    )
+
+    # --- MAIN CHART (CANDLESTICKS) ---
+    fig.add_trace(go.Candlestick(
+        name='OHLC',
+        increasing_line_color='#00ff00', # Bright Green
+        decreasing_line_color='#ff2a2a'  # Bright Red
+    ), row=1, col=1)
+
+    # SMA 20 (The Gold Line)
+    fig.add_trace(go.Scatter(
+        mode='lines', name='SMA 20', 
+        line=dict(color='#FFD700', width=2)
+    ), row=1, col=1)
+
+    # Bollinger Bands (Subtle Shading)
+    fig.add_trace(go.Scatter(
+        mode='lines', name='Upper BB',
+        line=dict(width=0), showlegend=False
+    ), row=1, col=1)
+    
+    fig.add_trace(go.Scatter(
+        mode='lines', name='Lower BB',
+        line=dict(width=0), fill='tonexty', 
+        fillcolor='rgba(255, 215, 0, 0.1)', # Gold Mist
+        showlegend=False
+    ), row=1, col=1)
+
+    # --- VOLUME CHART (BOTTOM) ---
+    fig.add_trace(go.Bar(
+        name='Volume',
+        marker=volume_marker(None, '#00ff00', '#ff2a2a'),
+        opacity=0.5
+    ), row=2, col=1)
+
+    # LUXURY STYLING
+    fig.update_layout(
+        template="plotly_dark",
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        height=500,
+        title=dict(
+            font=dict(color="#FFD700", family="Orbitron", size=20)
+        ),
+        margin=dict(t=50, b=20, l=20, r=20),
+        hovermode="x unified",
+        xaxis_rangeslider_visible=False,
+        showlegend=False
+    )
+
+    # Clean Gridlines (x values are epoch ms, so the axes are typed as dates)
+    fig.update_xaxes(type='date')
+    fig.update_xaxes(showgrid=False, row=1, col=1)
+    fig.update_yaxes(showgrid=True, gridcolor='rgba(255,255,255,0.05)', row=1, col=1)
+    fig.update_yaxes(showgrid=False, row=2, col=1)
+    return fig
+
+def get_chart(ticker, df=None, width=None, cached=True):
     """
     Fetches 6 months of data and builds a Pro-Level Technical Analysis Chart
     Features: Candlesticks, SMA-20, Bollinger Bands, and Volume.
+    Pass `df` (e.g. from fetch_many) to chart bars that were already fetched.
+    Long histories are reduced to the point budget of a `width`-px chart (chart_data).
     """
     try:
         # 1. Fetch Data (Extended period for better context)
-        stock = yf.Ticker(ticker)
-        df = stock.history(period="6mo")
+        if df is None: df = load_history(ticker, "6mo")
         
         if df.empty: return None, None
         
-        # 2. Calculate Technical Indicators
-        # SMA 20
-        df['SMA_20'] = df['Close'].rolling(window=20).mean()
-        
-        # Bollinger Bands (2 Standard Deviations)
-        df['STD_20'] = df['Close'].rolling(window=20).std()
-        df['Upper_BB'] = df['SMA_20'] + (df['STD_20'] * 2)
-        df['Lower_BB'] = df['SMA_20'] - (df['STD_20'] * 2)
-        
-        # RSI
-        df['RSI'] = calculate_rsi(df['Close'])
-
-        # 3. Create Subplots (Row 1: Price, Row 2: Volume)
-        fig = make_subplots(
-            rows=2, cols=1, 
-            shared_xaxes=True, 
-            vertical_spacing=0.05, 
-            row_heights=[0.75, 0.25]
-        )
-
-        # --- MAIN CHART (CANDLESTICKS) ---
-        fig.add_trace(go.Candlestick(
-            x=df.index,
-            open=df['Open'], high=df['High'],
-            low=df['Low'], close=df['Close'],
-            name='OHLC',
-            increasing_line_color='#00ff00', # Bright Green
-            decreasing_line_color='#ff2a2a'  # Bright Red
-        ), row=1, col=1)
-
-        # SMA 20 (The Gold Line)
-        fig.add_trace(go.Scatter(
-            x=df.index, y=df['SMA_20'], 
-            mode='lines', name='SMA 20', 
-            line=dict(color='#FFD700', width=2)
-        ), row=1, col=1)
-
-        # Bollinger Bands (Subtle Shading)
-        fig.add_trace(go.Scatter(
-            x=df.index, y=df['Upper_BB'], 
-            mode='lines', name='Upper BB',
-            line=dict(width=0), showlegend=False
-        ), row=1, col=1)
-        
-        fig.add_trace(go.Scatter(
-            x=df.index, y=df['Lower_BB'], 
-            mode='lines', name='Lower BB',
-            line=dict(width=0), fill='tonexty', 
-            fillcolor='rgba(255, 215, 0, 0.1)', # Gold Mist
-            showlegend=False
-        ), row=1, col=1)
-
-        # --- VOLUME CHART (BOTTOM) ---
-        colors = ['#00ff00' if c >= o else '#ff2a2a' for c, o in zip(df['Close'], df['Open'])]
-        fig.add_trace(go.Bar(
-            x=df.index, y=df['Volume'],
-            name='Volume',
-            marker_color=colors,
-            opacity=0.5
-        ), row=2, col=1)
-
-        # 4. LUXURY STYLING
-        fig.update_layout(
-            template="plotly_dark",
-            paper_bgcolor='rgba(0,0,0,0)',
-            plot_bgcolor='rgba(0,0,0,0)',
-            height=500,
-            title=dict(
-                text=f"{ticker} MARKET VECTOR",
-                font=dict(color="#FFD700", family="Orbitron", size=20)
-            ),
-            margin=dict(t=50, b=20, l=20, r=20),
-            hovermode="x unified",
-            xaxis_rangeslider_visible=False,
-            showlegend=False
-        )
-
-        # Clean Gridlines
-        fig.update_xaxes(showgrid=False, row=1, col=1)
-        fig.update_yaxes(showgrid=True, gridcolor='rgba(255,255,255,0.05)', row=1, col=1)
-        fig.update_yaxes(showgrid=False, row=2, col=1)
+        # 2. Technical Indicators: SMA 20, STD 20, Bollinger Bands (2 std), RSI 14
+        # Streamed per ticker: bars seen on earlier calls are not recomputed
+        with timer('market_data.indicators'):
+            df = INDICATORS.apply(ticker, df)
+        with timer('market_data.reduce'):
+            data = reduce_chart(df, width, overlays=('SMA_20', 'Upper_BB', 'Lower_BB'))
+
+        # 3. Swap the data into the cached figure (layout/styling built once)
+        with timer('market_data.figure'):
+            fig = figures.render('market_data.technical', _technical_skeleton, traces=[
+                {'x': data['x'], 'open': data['open'], 'high': data['high'], 'low': data['low'], 'close': data['close']},
+                {'x': data['line_x'], 'y': data['SMA_20']},
+                {'x': data['line_x'], 'y': data['Upper_BB']},
+                {'x': data['line_x'], 'y': data['Lower_BB']},
+                {'x': data['x'], 'y': data['volume'], 'marker.color': data['up']},
+            ], layout={'title.text': f"{ticker} MARKET VECTOR"}, cached=cached)
 
         # Return the figure and the last row (with RSI added)
         return fig, df.iloc[-1]
@@ -0,0 +1,166 @@
+"""
+Process-wide registry for the trained artifacts (model.pkl / tfidf.pkl / model.npz).
+
+Every SentimentEngine / SentimentBrain instance (and every Streamlit session living
+in the same process) shares one lazily loaded copy. Arrays inside the pickles are
+opened with joblib's mmap_mode, so several worker processes map the same file pages
+instead of each holding a private copy.
+
+If model.npz (train_model.export_compact) sits next to the pickles and was exported
+from exactly those pickles, the sklearn-free CompactScorer is used instead and the
+pickles are only unpickled if someone asks get() for the sklearn pair.
+
+Accesses stat the files at most every `check_interval` seconds (engines ask on
+every analyze call), get_artifacts(fresh=True) always does; if any was replaced
+(re-training), the artifacts are reloaded and `version` changes, which is what the
+result caches key on. Engines ask for fresh artifacts on every cache miss, so no
+label is ever computed with a replaced model; a cached label of the old version can
+still be served for up to `check_interval` seconds after a re-train in another
+process. train_model calls invalidate() after saving, so in-process re-trains are
+seen at once.
+"""
+import os
+import time
+import hashlib
+import threading
+from collections import namedtuple
+
+import joblib
+
+from sparse_scorer import CompactScorer, source_digest
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MODEL_PATH = os.path.join(BASE_DIR, 'model.pkl')
+TFIDF_PATH = os.path.join(BASE_DIR, 'tfidf.pkl')
+COMPACT_PATH = os.path.join(BASE_DIR, 'model.npz')
+# Seconds between checks for re-trained artifacts (3 os.stat calls each)
+CHECK_INTERVAL = 2.0
+
+# scorer is a CompactScorer (model/vectorizer are None) or None (sklearn pair loaded)
+Artifacts = namedtuple('Artifacts', ['model', 'vectorizer', 'scorer', 'version'])
+
+class ModelRegistry:
+    def __init__(self, model_path=MODEL_PATH, tfidf_path=TFIDF_PATH, mmap_mode='r', compact_path=None, use_compact=True,
+                 check_interval=CHECK_INTERVAL):
+        self.model_path = model_path
+        self.tfidf_path = tfidf_path
+        self.compact_path = compact_path or os.path.join(os.path.dirname(os.path.abspath(model_path)), 'model.npz')
+        self.mmap_mode = mmap_mode
+        self.use_compact = use_compact
+        self.check_interval = check_interval
+        self.load_seconds = None
+        self._fingerprint = None
+        self._artifacts = None
+        self._pair = None # (version, model, vectorizer) unpickled for get() while the compact scorer is in use
+        self._checked = float('-inf') # time.monotonic() of the last stat
+        self._lock = threading.Lock()
+
+    def get(self):
+        """
+        Returns the sklearn (model, vectorizer), loading them on first use. With the compact
+        scorer in use, the pickles are unpickled for this call only (engines never need them).
+        Raises FileNotFoundError if missing.
+        """
+        artifacts = self.get_artifacts()
+        if artifacts.scorer is None:
+            return artifacts.model, artifacts.vectorizer
+        pair = self._pair
+        if pair is None or pair[0] != artifacts.version:
+            with self._lock:
+                pair = self._pair
+                if pair is None or pair[0] != artifacts.version:
+                    pair = self._pair = (artifacts.version, joblib.load(self.model_path, mmap_mode=self.mmap_mode),
+                                         joblib.load(self.tfidf_path, mmap_mode=self.mmap_mode))
+        return pair[1:]
+
+    def get_artifacts(self, fresh=False):
+        """
+        Returns Artifacts(model, vectorizer, scorer, version), reloading if the files changed on
+        disk (checked at most every check_interval seconds, or now if `fresh`).
+        """
+        artifacts = self._artifacts
+        now = time.monotonic()
+        if artifacts is not None and not fresh and now - self._checked < self.check_interval:
+            return artifacts
+        fingerprint = self._stat()
+        self._checked = now
+        if artifacts is None or (fingerprint is not None and fingerprint != self._fingerprint):
+            with self._lock:
+                # Double-checked: only the first thread pays for the (re)load
+                if self._artifacts is None or (fingerprint is not None and fingerprint != self._fingerprint):
+                    self._artifacts = self._load(fingerprint)
+                    self._fingerprint = fingerprint
+                artifacts = self._artifacts
+        return artifacts
+
+    @property
+    def version(self):
+        """Version tag of the currently loaded artifacts (None before the first load)."""
+        artifacts = self._artifacts
+        return artifacts.version if artifacts else None
+
+    def invalidate(self):
+        """Makes the next access check the files (call after writing new artifacts)."""
+        self._checked = float('-inf')
+
+    def reset(self):
+        """Drops the cached artifacts; the next get() reloads from disk."""
+        with self._lock:
+            self._artifacts = None
+            self._fingerprint = None
+            self._pair = None
+            self._checked = float('-inf')
+            self.load_seconds = None
+
+    def _stat(self):
+        """(mtime_ns, size) of every artifact file, or None if a pickle is missing."""
+        try:
+            m, t = os.stat(self.model_path), os.stat(self.tfidf_path)
+        except OSError:
+            return None
+        try:
+            c = os.stat(self.compact_path)
+            compact = (c.st_mtime_ns, c.st_size)
+        except OSError:
+            compact = None
+        return (m.st_mtime_ns, m.st_size, t.st_mtime_ns, t.st_size, compact)
+
+    def _load(self, fingerprint):
+        if fingerprint is None:
+            raise FileNotFoundError("Models missing.")
+        t0 = time.perf_counter()
+        version = hashlib.blake2b(repr(fingerprint).encode(), digest_size=8).hexdigest()
+        scorer = self._load_compact() if self.use_compact and fingerprint[-1] else None
+        if scorer is not None:
+            artifacts = Artifacts(None, None, scorer, version)
+        else:
+            model = joblib.load(self.model_path, mmap_mode=self.mmap_mode)
+            vectorizer = joblib.load(self.tfidf_path, mmap_mode=self.mmap_mode)
+            artifacts = Artifacts(model, vectorizer, None, version)
+        self.load_seconds = time.perf_counter() - t0
+        return artifacts
+
+    def _load_compact(self):
+        """The exported scorer, if it was built from the current pickles (else None)."""
+        try:
+            scorer = CompactScorer.load(self.compact_path)
+        except (OSError, ValueError, KeyError):
+            return None
+        if scorer.source != source_digest(self.model_path, self.tfidf_path):
+            return None # stale export: the pickles were re-trained since
+        return scorer
+
+# Default registry for the artifacts in the project root
+registry = ModelRegistry()
+
+def get_models():
+    """Shortcut for registry.get()."""
+    return registry.get()
+
+def get_artifacts(fresh=False):
+    """Shortcut for registry.get_artifacts()."""
+    return registry.get_artifacts(fresh)
+
+def invalidate():
+    """Shortcut for registry.invalidate()."""
+    registry.invalidate()
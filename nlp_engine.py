@@ -1,68 +1,165 @@
-import os
-import joblib
 import re
 from textblob import TextBlob
-import streamlit as st
+import numpy as np
+import model_registry
+from result_cache import ResultCache
+from instrumentation import timer
+
+# Label thresholds and HUD palette (shared by analyze / analyze_many)
+BULL_THRESHOLD = 0.6
+BEAR_THRESHOLD = 0.4
+LABELS = (
+    ("BULLISH", "#00ffa3"), # HUD Green
+    ("BEARISH", "#ff2a2a"), # Alert Red
+    ("NEUTRAL", "#a0a0a0"), # Grey
+)
+_NON_ALPHA = re.compile(r'[^a-zA-Z\s]')
+
+# Process-wide result cache (shared across instances and Streamlit reruns)
+RESULT_CACHE = ResultCache()
+FALLBACK_VERSION = "textblob"
 
 class SentimentBrain:
-    def __init__(self):
+    def __init__(self, cache=None):
         self.use_fallback = False
         self.model = None
         self.vectorizer = None
+        self.scorer = None
+        self.model_version = None
+        self.cache = RESULT_CACHE if cache is None else cache
         self._initialize_core()
 
     def _initialize_core(self):
         """Loads Neural Core or engages Fallback Protocols."""
         try:
-            # Look in ROOT directory
-            base_path = os.path.dirname(os.path.abspath(__file__))
-            model_path = os.path.join(base_path, 'model.pkl')
-            tfidf_path = os.path.join(base_path, 'tfidf.pkl')
-
-            if os.path.exists(model_path) and os.path.exists(tfidf_path):
-                self.model = joblib.load(model_path)
-                self.vectorizer = joblib.load(tfidf_path)
-                print(">> CITADEL: Neural Core Online.")
-            else:
-                raise FileNotFoundError("Models missing.")
+            # Shared, lazily loaded artifacts (one copy per process)
+            self.model, self.vectorizer, self.scorer, self.model_version = model_registry.get_artifacts()
+            print(">> CITADEL: Neural Core Online.")
         except Exception as e:
             print(f">> CITADEL: {e}")
             print(">> CITADEL: Engaging Fallback Protocol (TextBlob).")
             self.use_fallback = True
 
+    def _sync_core(self, fresh=False):
+        """
+        Picks up re-trained artifacts; returns the version tag used in cache keys.
+        `fresh` checks the files now instead of at most every CHECK_INTERVAL (before scoring).
+        """
+        if self.use_fallback:
+            return FALLBACK_VERSION
+        self.model, self.vectorizer, self.scorer, self.model_version = model_registry.get_artifacts(fresh)
+        self.cache.bind_version(self.model_version)
+        return self.model_version
+
     def _clean(self, text):
-        return re.sub(r'[^a-zA-Z\s]', '', str(text).lower())
+        return _NON_ALPHA.sub('', str(text).lower())
 
     def analyze(self, text):
         """Returns {'score': 0-1, 'label': str, 'color': hex}"""
         if not text: return None
 
+        # Cache on what the scorer sees: raw text for TextBlob, cleaned text for sklearn
+        version = self._sync_core()
+        with timer('nlp_engine.clean'):
+            norm = text if self.use_fallback else self._clean(text)
+        key = self.cache.make_key(norm, version)
+        cached = self.cache.get(key)
+        if cached is not None: return cached
+        if self._sync_core(fresh=True) != version: # re-trained since the last check
+            return self.analyze(text)
+
         if self.use_fallback:
             # TextBlob Logic (-1.0 to 1.0 -> Normalize to 0.0 to 1.0)
-            polarity = TextBlob(text).sentiment.polarity
+            with timer('nlp_engine.textblob'):
+                polarity = TextBlob(text).sentiment.polarity
             score = (polarity + 1) / 2
             confidence = abs(polarity) # Rough proxy for confidence
         else:
-            # Sklearn Logic
-            clean_text = self._clean(text)
-            vec = self.vectorizer.transform([clean_text])
-            score = self.model.predict_proba(vec)[0][1]
+            # Model Logic (compact scorer or sklearn)
+            score = self._predict([norm])[0]
             confidence = score if score > 0.5 else (1 - score)
 
         # Classification
-        if score > 0.6:
-            label = "BULLISH"
-            color = "#00ffa3" # HUD Green
-        elif score < 0.4:
-            label = "BEARISH"
-            color = "#ff2a2a" # Alert Red
+        if score > BULL_THRESHOLD:
+            label, color = LABELS[0]
+        elif score < BEAR_THRESHOLD:
+            label, color = LABELS[1]
         else:
-            label = "NEUTRAL"
-            color = "#a0a0a0" # Grey
+            label, color = LABELS[2]
 
-        return {
+        result = {
             "score": score,
             "label": label,
             "color": color,
             "confidence": confidence
         }
+        self.cache.put(key, result)
+        return result
+
+    def analyze_many(self, texts):
+        """Batch analyze(): one vectorized scoring pass. None where text is empty."""
+        texts = list(texts)
+        results = [None] * len(texts)
+        idx = [i for i, text in enumerate(texts) if text]
+        if not idx:
+            return results
+
+        version = self._sync_core()
+        with timer('nlp_engine.clean'):
+            norm = [texts[i] if self.use_fallback else self._clean(texts[i]) for i in idx]
+        keys = [self.cache.make_key(n, version) for n in norm]
+
+        # Cache lookups; duplicate headlines inside the batch are scored once
+        found, todo = {}, {}
+        for key, n in zip(keys, norm):
+            if key in found or key in todo: continue
+            cached = self.cache.get(key)
+            if cached is None:
+                todo[key] = n
+            else:
+                found[key] = cached
+
+        if todo and self._sync_core(fresh=True) != version: # re-trained since the last check
+            return self.analyze_many(texts)
+        if todo:
+            for key, result in zip(todo, self._score_batch(list(todo.values()))):
+                self.cache.put(key, result)
+                found[key] = result
+
+        for i, key in zip(idx, keys):
+            results[i] = dict(found[key])
+        return results
+
+    def _predict(self, clean_texts):
+        """P(bullish) per cleaned text: compact sparse scorer if exported, else the sklearn pair."""
+        if self.scorer is not None:
+            with timer('nlp_engine.predict'): # the compact scorer vectorizes and predicts in one pass
+                return self.scorer.score_many(clean_texts)
+        with timer('nlp_engine.vectorize'):
+            X = self.vectorizer.transform(clean_texts)
+        with timer('nlp_engine.predict'):
+            return self.model.predict_proba(X)[:, 1]
+
+    def _score_batch(self, norm_texts):
+        """Scores already-normalized texts in one vectorized pass."""
+        if self.use_fallback:
+            with timer('nlp_engine.textblob'):
+                polarity = np.array([TextBlob(t).sentiment.polarity for t in norm_texts])
+            scores = (polarity + 1) / 2
+            confidence = np.abs(polarity)
+        else:
+            scores = self._predict(norm_texts)
+            confidence = np.where(scores > 0.5, scores, 1 - scores)
+
+        # Vectorized classification: 0 = bull, 1 = bear, 2 = neutral
+        codes = np.select([scores > BULL_THRESHOLD, scores < BEAR_THRESHOLD], [0, 1], 2)
+        results = []
+        for score, conf, code in zip(scores, confidence, codes):
+            label, color = LABELS[code]
+            results.append({
+                "score": score,
+                "label": label,
+                "color": color,
+                "confidence": conf
+            })
+        return results
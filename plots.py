@@ -1,17 +1,14 @@
 import plotly.graph_objects as go
+from chart_data import reduce_chart
+import figures
 
-def plot_gauge(score):
-    score_pct = score * 100
-    # Cyan for Bullish, Hot Pink for Bearish
-    color = "#00d2ff" if score > 0.5 else "#ff0055"
-    
+def _gauge_skeleton():
     fig = go.Figure(go.Indicator(
         mode = "gauge+number",
-        value = score_pct,
-        number = {'font': {'color': color, 'family': "Orbitron"}},
+        number = {'font': {'family': "Orbitron"}},
         gauge = {
             'axis': {'range': [0, 100], 'tickcolor': "#333"},
-            'bar': {'color': color, 'thickness': 0.3},
+            'bar': {'thickness': 0.3},
             'bgcolor': "rgba(0,0,0,0)",
             'borderwidth': 0,
             'steps': [
@@ -27,11 +24,17 @@ def plot_gauge(score):
     )
     return fig
 
-def plot_stock_history(ticker, df):
+def plot_gauge(score, cached=True):
+    score_pct = score * 100
+    # Cyan for Bullish, Hot Pink for Bearish
+    color = "#00d2ff" if score > 0.5 else "#ff0055"
+    # Layout is built once (figures); only the value and colours change per call
+    return figures.render('plots.gauge', _gauge_skeleton, traces=[
+        {'value': score_pct, 'number.font.color': color, 'gauge.bar.color': color},
+    ], cached=cached)
+
+def _history_skeleton():
     fig = go.Figure(data=[go.Candlestick(
-        x=df.index,
-        open=df['Open'], high=df['High'],
-        low=df['Low'], close=df['Close'],
         increasing_line_color= '#00d2ff', # Neon Cyan
         decreasing_line_color= '#ff0055'  # Neon Pink
     )])
@@ -43,6 +46,14 @@ def plot_stock_history(ticker, df):
         height=350,
         margin=dict(t=30, b=0, l=0, r=0),
         xaxis_rangeslider_visible=False,
+        xaxis_type='date',
         font={'family': "Exo 2", 'size': 10}
     )
     return fig
+
+def plot_stock_history(ticker, df, width=None, cached=True):
+    # Bucketed to the chart's candle budget, float32 prices, epoch-ms dates
+    data = reduce_chart(df, width)
+    return figures.render('plots.history', _history_skeleton, traces=[
+        {'x': data['x'], 'open': data['open'], 'high': data['high'], 'low': data['low'], 'close': data['close']},
+    ], cached=cached)
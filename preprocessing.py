@@ -1,14 +1,90 @@
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
 import nltk
+import pandas as pd
 from nltk.corpus import stopwords
 
 try: nltk.data.find('corpora/stopwords')
 except LookupError: nltk.download('stopwords', quiet=True)
 
+try:
+    import pyarrow # noqa: F401 (enables the Arrow-backed fast path in clean_series)
+    _HAS_ARROW = True
+except ImportError:
+    _HAS_ARROW = False
+
+_NON_ALPHA = re.compile(r'[^a-zA-Z\s]')
+# Rows per worker task when clean_series() shards across processes
+CHUNK_ROWS = 50_000
+
+@lru_cache(maxsize=1)
+def get_stop_words():
+    """English stopwords, built once per process."""
+    return frozenset(stopwords.words('english'))
+
+@lru_cache(maxsize=1)
+def _stopword_pattern():
+    """Matches a whole whitespace-delimited token that is a stopword."""
+    # After _NON_ALPHA only ASCII letters survive, so stopwords like "don't" can never match
+    words = sorted((w for w in get_stop_words() if w.isascii() and w.isalpha()), key=len, reverse=True)
+    return re.compile(r'(?<!\S)(?:' + '|'.join(words) + r')(?!\S)')
+
+@lru_cache(maxsize=1)
+def _whitespace_class():
+    """Every char Python treats as whitespace (str.isspace), as an RE2 class body."""
+    return ''.join(f'\\x{{{ord(c):x}}}' for c in map(chr, range(0x110000)) if c.isspace())
+
+@lru_cache(maxsize=1)
+def _stopword_regex():
+    """RE2-compatible (no lookarounds) variant of _stopword_pattern for the Arrow path."""
+    words = sorted((w for w in get_stop_words() if w.isascii() and w.isalpha()), key=len, reverse=True)
+    return r'\b(?:' + '|'.join(words) + r')\b'
+
 def clean_text(text):
     if not isinstance(text, str): return ""
     text = text.lower()
-    text = re.sub(r'[^a-zA-Z\s]', '', text)
-    stop_words = set(stopwords.words('english'))
+    text = _NON_ALPHA.sub('', text)
+    stop_words = get_stop_words()
     tokens = [word for word in text.split() if word not in stop_words]
     return " ".join(tokens)
+
+def _clean_chunk(texts):
+    """Vectorized clean_text() over a Series."""
+    texts = texts.astype(object)
+    texts = texts.where(texts.map(lambda x: isinstance(x, str)).astype(bool), "")
+    if not _HAS_ARROW:
+        # Object dtype: Python str/re semantics, identical to clean_text()
+        return (texts.str.lower()
+                     .str.replace(_NON_ALPHA, '', regex=True)
+                     .str.replace(_stopword_pattern(), ' ', regex=True)
+                     .str.split()
+                     .str.join(' '))
+
+    # Arrow kernels (RE2). RE2's \s is ASCII-only, so spell out Python's whitespace set
+    ws = _whitespace_class()
+    texts = texts.astype('string[pyarrow]')
+    cleaned = (texts.str.lower()
+                    .str.replace(f'[^a-zA-Z{ws}]', '', regex=True)
+                    # Only ASCII letters + whitespace remain, so \b is exactly a token boundary
+                    .str.replace(_stopword_regex(), ' ', regex=True)
+                    .str.replace(f'[{ws}]+', ' ', regex=True)
+                    .str.strip(' '))
+    return cleaned.astype(object)
+
+def clean_series(texts, n_jobs=1, chunk_rows=CHUNK_ROWS):
+    """
+    Bulk clean_text(): same output row for row, as a pandas .str pipeline.
+    n_jobs > 1 (or -1 for all cores) shards frames larger than chunk_rows across a process pool.
+    """
+    texts = pd.Series(texts) if not isinstance(texts, pd.Series) else texts
+    if n_jobs == -1:
+        n_jobs = os.cpu_count() or 1
+    if n_jobs <= 1 or len(texts) <= chunk_rows:
+        return _clean_chunk(texts)
+
+    chunks = [texts.iloc[i:i + chunk_rows] for i in range(0, len(texts), chunk_rows)]
+    with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+        return pd.concat(list(pool.map(_clean_chunk, chunks)))
@@ -0,0 +1,200 @@
+"""
+Pluggable market-data providers.
+
+Every provider returns yfinance-shaped OHLCV frames (Open/High/Low/Close/Volume,
+tz-aware DatetimeIndex named 'Date') from
+
+    provider.history(ticker, period=None, start=None, interval='1d')
+
+Shipped providers:
+  - YFinanceProvider:  live data (the default)
+  - FixtureProvider:   local <TICKER>.parquet / <TICKER>.csv files (offline, data lake)
+  - RandomWalkProvider: deterministic synthetic bars, years of history for any ticker
+
+The process default comes from JUGAR_MARKET_DATA ("yfinance", "synthetic",
+"fixtures:/path/to/dir") and can be swapped at runtime with set_provider().
+"""
+import os
+import re
+import zlib
+import threading
+
+import numpy as np
+import pandas as pd
+
+MARKET_TZ = 'America/New_York'
+OHLCV = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+_PERIOD_RE = re.compile(r'^(\d+)(d|wk|mo|y)$')
+
+def period_start(period, now=None):
+    """First timestamp covered by a yfinance-style period ('5d', '3mo', '1y', ...). None for 'max'."""
+    if period in (None, 'max'):
+        return None
+    now = now or pd.Timestamp.now(tz='UTC')
+    if period == 'ytd':
+        return now.normalize().replace(month=1, day=1)
+    match = _PERIOD_RE.match(period)
+    if not match:
+        raise ValueError(f"Unsupported period: {period!r}")
+    n, unit = int(match.group(1)), match.group(2)
+    offset = {'d': pd.DateOffset(days=n), 'wk': pd.DateOffset(weeks=n),
+              'mo': pd.DateOffset(months=n), 'y': pd.DateOffset(years=n)}[unit]
+    return (now - offset).normalize()
+
+def window(df, period=None, start=None):
+    """Slices a frame to `start` (a date/timestamp) or to the last `period`."""
+    begin = pd.Timestamp(start) if start is not None else period_start(period)
+    if begin is None or df.empty:
+        return df
+    tz = df.index.tz
+    if tz is not None:
+        begin = begin.tz_localize(tz) if begin.tz is None else begin.tz_convert(tz)
+    elif begin.tz is not None:
+        begin = begin.tz_localize(None)
+    return df[df.index >= begin]
+
+class MarketDataProvider:
+    """Base class; subclasses implement history()."""
+    name = "base"
+    # False for providers that are already local (the on-disk bar cache would only add a copy)
+    cacheable = True
+
+    def history(self, ticker, period=None, start=None, interval='1d'):
+        raise NotImplementedError
+
+    def __call__(self, ticker, period=None, start=None, interval='1d'):
+        return self.history(ticker, period=period, start=start, interval=interval)
+
+class YFinanceProvider(MarketDataProvider):
+    name = "yfinance"
+
+    def history(self, ticker, period=None, start=None, interval='1d'):
+        import yfinance as yf
+        stock = yf.Ticker(ticker)
+        if start is not None:
+            return stock.history(start=start, interval=interval)
+        return stock.history(period=period or '1mo', interval=interval)
+
+class FixtureProvider(MarketDataProvider):
+    """Reads <root>/<TICKER>.parquet (preferred) or <root>/<TICKER>.csv, e.g. exports from a data lake."""
+    name = "fixtures"
+    cacheable = False
+
+    def __init__(self, root):
+        self.root = root
+        self._frames = {}
+        self._lock = threading.Lock()
+
+    def _load(self, ticker):
+        with self._lock:
+            if ticker in self._frames:
+                return self._frames[ticker]
+        base = os.path.join(self.root, ticker.upper())
+        if os.path.exists(base + '.parquet'):
+            df = pd.read_parquet(base + '.parquet')
+        elif os.path.exists(base + '.csv'):
+            df = pd.read_csv(base + '.csv', index_col=0)
+        else:
+            df = pd.DataFrame(columns=OHLCV, index=pd.DatetimeIndex([], tz=MARKET_TZ, name='Date'))
+        if not isinstance(df.index, pd.DatetimeIndex):
+            df.index = pd.to_datetime(df.index, utc=True).tz_convert(MARKET_TZ)
+        df.index.name = 'Date'
+        df = df.sort_index()
+        with self._lock:
+            self._frames[ticker] = df
+        return df
+
+    def history(self, ticker, period=None, start=None, interval='1d'):
+        return window(self._load(ticker), period, start).copy()
+
+class RandomWalkProvider(MarketDataProvider):
+    """
+    Geometric random-walk bars, deterministic per (seed, ticker). Daily bars always start
+    at `origin`, so any window of the same ticker is consistent across calls. Intraday
+    intervals are generated for the requested window only.
+    """
+    name = "synthetic"
+
+    FREQS = {'1m': '1min', '2m': '2min', '5m': '5min', '15m': '15min', '30m': '30min',
+             '60m': '60min', '1h': '60min', '1d': 'B', '1wk': 'W-FRI', '1mo': 'BME'}
+
+    def __init__(self, seed=0, origin='2000-01-03', drift=0.0002, volatility=0.02, start_price=100.0):
+        self.seed = seed
+        self.origin = pd.Timestamp(origin, tz=MARKET_TZ)
+        self.drift = drift
+        self.volatility = volatility
+        self.start_price = start_price
+
+    def _rng(self, ticker, salt=""):
+        return np.random.default_rng([self.seed, zlib.crc32(f"{ticker.upper()}|{salt}".encode())])
+
+    def bars(self, ticker, index, salt="", bar_minutes=None):
+        """
+        OHLCV frame over an explicit DatetimeIndex (vectorized, one RNG draw per column).
+        Every column has its own generator, so bar i gets the same values whatever the
+        length of the index: a shorter request is a prefix of a longer one.
+        """
+        n = len(index)
+        rng = self._rng(ticker, salt)
+        # Daily volatility scaled down to the bar size for intraday series (390 min session)
+        scale = self.volatility * (np.sqrt(bar_minutes / 390) if bar_minutes else 1.0)
+        first = self.start_price * float(np.exp(rng.normal(0, 1)))
+        log_ret = rng.normal(self.drift, scale, n)
+        close = first * np.exp(np.cumsum(log_ret))
+        open_ = np.concatenate(([first], close[:-1])) * np.exp(self._rng(ticker, salt + '|open').normal(0, scale / 4, n))
+        high = np.maximum(open_, close) * (1 + np.abs(self._rng(ticker, salt + '|high').normal(0, scale / 2, n)))
+        low = np.minimum(open_, close) * (1 - np.abs(self._rng(ticker, salt + '|low').normal(0, scale / 2, n)))
+        volume = np.round(self._rng(ticker, salt + '|volume').lognormal(13, 0.5, n))
+        return pd.DataFrame({'Open': open_, 'High': high, 'Low': low, 'Close': close, 'Volume': volume},
+                            index=index)
+
+    def history(self, ticker, period=None, start=None, interval='1d'):
+        freq = self.FREQS.get(interval)
+        if freq is None:
+            raise ValueError(f"Unsupported interval: {interval!r}")
+        end = pd.Timestamp.now(tz=MARKET_TZ)
+        if interval in ('1d', '1wk', '1mo'):
+            index = pd.date_range(self.origin, end.normalize(), freq=freq, name='Date')
+            return window(self.bars(ticker, index), period, start).copy()
+
+        begin = pd.Timestamp(start) if start is not None else period_start(period or '5d')
+        begin = begin.tz_localize(MARKET_TZ) if begin.tz is None else begin.tz_convert(MARKET_TZ)
+        index = pd.date_range(begin.floor('min'), end.floor('min'), freq=freq, name='Date')
+        # Regular session only (09:30-16:00, weekdays)
+        minutes = index.hour * 60 + index.minute
+        index = index[(index.dayofweek < 5) & (minutes >= 570) & (minutes < 960)]
+        return self.bars(ticker, index, salt=f"{interval}|{begin.date()}",
+                         bar_minutes=pd.Timedelta(freq).total_seconds() / 60)
+
+# ==========================================
+# Process default
+# ==========================================
+_default = None
+_default_lock = threading.Lock()
+
+def provider_from_spec(spec):
+    """'yfinance' | 'synthetic' | 'synthetic:<seed>' | 'fixtures:<dir>' -> provider."""
+    kind, _, arg = (spec or 'yfinance').partition(':')
+    if kind == 'yfinance':
+        return YFinanceProvider()
+    if kind == 'synthetic':
+        return RandomWalkProvider(seed=int(arg or 0))
+    if kind == 'fixtures':
+        return FixtureProvider(arg or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures'))
+    raise ValueError(f"Unknown market data provider: {spec!r}")
+
+def get_provider():
+    """The process-wide provider (JUGAR_MARKET_DATA, default yfinance)."""
+    global _default
+    if _default is None:
+        with _default_lock:
+            if _default is None:
+                _default = provider_from_spec(os.environ.get('JUGAR_MARKET_DATA'))
+    return _default
+
+def set_provider(provider):
+    """Swaps the process-wide provider (an instance or a spec string)."""
+    global _default
+    with _default_lock:
+        _default = provider_from_spec(provider) if isinstance(provider, str) else provider
@@ -1,10 +1,52 @@
+"""
+Analysis-log reports.
+
+generate_html_report() builds the whole report in memory and returns it as a base64
+data-URI download link (fine for a session's worth of rows). For large logs, the
+streaming writers below take any iterable of row dicts (or a DataFrame) and write
+it in chunks of `chunk_rows` rows, so memory stays flat however long the log is:
+
+  - write_html_report(history, sink)       one HTML file (path or file-like sink)
+  - write_html_pages(history, directory)   paginated HTML, `page_rows` rows per file
+  - export_csv(history, sink)              CSV
+  - export_parquet(history, path)          Parquet, one row group per chunk (needs pyarrow)
+"""
 import pandas as pd
 import base64
 import time
+import os
+import csv
+import html
+import itertools
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    _HAS_ARROW = True
+except ImportError:
+    _HAS_ARROW = False
+
+CHUNK_ROWS = 5_000
+PAGE_ROWS = 1_000
+# Parquet column types (any other column is written as strings)
+PARQUET_TYPES = {'time': 'timestamp', 'text': 'string', 'label': 'string', 'version': 'string',
+                 'score': 'float64', 'confidence': 'float64'}
+
+STYLE = """
+            body { font-family: Helvetica, sans-serif; color: #333; }
+            h1 { color: #0f172a; border-bottom: 2px solid #3b82f6; }
+            table { width: 100%; border-collapse: collapse; margin-top: 20px; }
+            th { background: #0f172a; color: white; padding: 10px; text-align: left; }
+            td { border-bottom: 1px solid #ddd; padding: 8px; }
+            .bull { color: green; font-weight: bold; }
+            .bear { color: red; font-weight: bold; }
+            nav a { margin-right: 12px; }"""
+LABEL_CLASSES = {'BULLISH': 'bull', 'BEARISH': 'bear'}
 
 def generate_html_report(history_data):
     """
     history_data: List of dicts [{'time':..., 'text':..., 'label':..., 'score':...}]
+                  (or a history_store.HistoryStore, which iterates as those dicts)
     Returns: HTML string link for download
     """
     if not history_data:
@@ -38,3 +80,163 @@ def generate_html_report(history_data):
     
     b64 = base64.b64encode(html.encode()).decode()
     return f'<a href="data:text/html;base64,{b64}" download="Citadel_Report.html" style="text-decoration:none; padding:10px 20px; background:#3b82f6; color:white; border-radius:5px;">📥 DOWNLOAD INTELLIGENCE REPORT</a>'
+
+# --- streaming ---------------------------------------------------------------
+
+def _rows(history, columns=None):
+    """(columns, iterator of row tuples) for a DataFrame or an iterable of dicts."""
+    if isinstance(history, pd.DataFrame):
+        columns = list(columns or history.columns)
+        return columns, history[columns].itertuples(index=False, name=None)
+    it = iter(history)
+    first = next(it, None)
+    if first is None:
+        return list(columns or ()), iter(())
+    columns = list(columns or first)
+    return columns, (tuple(row.get(c) for c in columns) for row in itertools.chain([first], it))
+
+def _chunks(rows, size):
+    while True:
+        chunk = list(itertools.islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+class _Sink:
+    """A path (opened and closed here) or an already-open text file-like object."""
+    def __init__(self, sink, newline=None):
+        self.owned = isinstance(sink, (str, os.PathLike))
+        self.fh = open(sink, 'w', encoding='utf-8', newline=newline) if self.owned else sink
+
+    def __enter__(self):
+        return self.fh
+
+    def __exit__(self, *exc):
+        if self.owned:
+            self.fh.close()
+        return False
+
+def _cell(value):
+    if value is None or value != value: # None / NaN
+        return ''
+    if isinstance(value, float):
+        return f"{value:.6f}"
+    return html.escape(str(value), quote=False)
+
+def _html_rows(chunk, label_col):
+    out = []
+    for row in chunk:
+        cells = []
+        for i, value in enumerate(row):
+            cls = LABEL_CLASSES.get(value) if i == label_col else None
+            cells.append(f'<td class="{cls}">{_cell(value)}</td>' if cls else f'<td>{_cell(value)}</td>')
+        out.append('<tr>' + ''.join(cells) + '</tr>\n')
+    return ''.join(out)
+
+def _html_head(title, generated):
+    return (f"<!DOCTYPE html>\n<html>\n<head>\n<meta charset=\"utf-8\">\n<title>{html.escape(title)}</title>\n"
+            f"<style>{STYLE}\n</style>\n</head>\n<body>\n<h1>{html.escape(title)}</h1>\n"
+            f"<p><strong>Generated:</strong> {generated}</p>\n<hr>\n<h3>ANALYSIS LOG</h3>\n")
+
+def _table_head(columns):
+    return ('<table class="table">\n<thead><tr>' + ''.join(f'<th>{html.escape(str(c))}</th>' for c in columns)
+            + '</tr></thead>\n<tbody>\n')
+
+def write_html_report(history, sink, columns=None, chunk_rows=CHUNK_ROWS, title="CITADEL INTELLIGENCE REPORT"):
+    """Writes the report table chunk by chunk to `sink` (path or file-like). Returns the row count."""
+    columns, rows = _rows(history, columns)
+    label_col = columns.index('label') if 'label' in columns else -1
+    n = 0
+    with _Sink(sink) as fh:
+        fh.write(_html_head(title, time.strftime('%Y-%m-%d %H:%M:%S')))
+        fh.write(_table_head(columns))
+        for chunk in _chunks(rows, chunk_rows):
+            fh.write(_html_rows(chunk, label_col))
+            n += len(chunk)
+        fh.write("</tbody>\n</table>\n</body>\n</html>\n")
+    return n
+
+def _page_name(prefix, page):
+    return f"{prefix}-{page:05d}.html"
+
+def write_html_pages(history, directory, columns=None, page_rows=PAGE_ROWS, prefix="report",
+                     title="CITADEL INTELLIGENCE REPORT"):
+    """
+    Paginated report: `page_rows` rows per file (small DOM per page), with first /
+    previous / next links. Returns the paths written, first page first.
+    """
+    os.makedirs(directory, exist_ok=True)
+    columns, rows = _rows(history, columns)
+    label_col = columns.index('label') if 'label' in columns else -1
+    generated = time.strftime('%Y-%m-%d %H:%M:%S')
+    paths, page = [], 1
+    chunks = _chunks(rows, page_rows)
+    chunk = next(chunks, [])
+    while True:
+        following = next(chunks, None) # one page of lookahead: is there a next page?
+        links = []
+        if page > 1:
+            links.append(f'<a href="{_page_name(prefix, 1)}">FIRST</a>')
+            links.append(f'<a href="{_page_name(prefix, page - 1)}">PREVIOUS</a>')
+        if following is not None:
+            links.append(f'<a href="{_page_name(prefix, page + 1)}">NEXT</a>')
+        nav = f"<nav>PAGE {page} {' '.join(links)}</nav>\n"
+        path = os.path.join(directory, _page_name(prefix, page))
+        with open(path, 'w', encoding='utf-8') as fh:
+            fh.write(_html_head(title, generated))
+            fh.write(nav)
+            fh.write(_table_head(columns))
+            fh.write(_html_rows(chunk, label_col))
+            fh.write("</tbody>\n</table>\n")
+            fh.write(nav)
+            fh.write("</body>\n</html>\n")
+        paths.append(path)
+        if following is None:
+            return paths
+        chunk, page = following, page + 1
+
+def export_csv(history, sink, columns=None, chunk_rows=CHUNK_ROWS):
+    """Writes the log as CSV to `sink` (path or file-like). Returns the row count."""
+    columns, rows = _rows(history, columns)
+    n = 0
+    with _Sink(sink, newline='') as fh:
+        writer = csv.writer(fh)
+        writer.writerow(columns)
+        for chunk in _chunks(rows, chunk_rows):
+            writer.writerows(chunk)
+            n += len(chunk)
+    return n
+
+def _parquet_schema(columns):
+    types = {'timestamp': pa.timestamp('us'), 'string': pa.string(), 'float64': pa.float64()}
+    return pa.schema([(c, types[PARQUET_TYPES.get(c, 'string')]) for c in columns])
+
+def _parquet_frame(chunk, columns):
+    """The chunk as a DataFrame whose columns convert to PARQUET_TYPES whatever the first rows hold."""
+    df = pd.DataFrame(chunk, columns=columns)
+    for c in columns:
+        kind = PARQUET_TYPES.get(c, 'string')
+        if kind == 'timestamp':
+            df[c] = pd.to_datetime(df[c], format='ISO8601') # history_store writes '%Y-%m-%d %H:%M:%S'
+        elif kind == 'float64':
+            df[c] = pd.to_numeric(df[c]).astype('float64')
+        else:
+            df[c] = df[c].map(lambda v: v if v is None or isinstance(v, str) else str(v), na_action='ignore')
+    return df
+
+def export_parquet(history, path, columns=None, chunk_rows=CHUNK_ROWS * 10):
+    """
+    Writes the log as Parquet, one row group per chunk. The schema is fixed up front
+    (PARQUET_TYPES), so a first chunk of all-None confidences or integer scores cannot
+    narrow the types later chunks have to fit.
+    """
+    if not _HAS_ARROW:
+        raise ImportError("export_parquet needs pyarrow (pip install pyarrow)")
+    columns, rows = _rows(history, columns)
+    schema = _parquet_schema(columns)
+    n = 0
+    with pq.ParquetWriter(path, schema) as writer: # no rows: a file with the columns only
+        for chunk in _chunks(rows, chunk_rows):
+            writer.write_table(pa.Table.from_pandas(_parquet_frame(chunk, columns), schema=schema, preserve_index=False))
+            n += len(chunk)
+    return n
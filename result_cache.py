@@ -0,0 +1,77 @@
+"""
+Bounded LRU cache for sentiment results, shared by every engine instance in the process.
+
+Keys are (model_version, blake2b(normalized_text)), so a re-trained model can never be
+served a label computed by the previous one. Engines also clear their cache as soon
+as they observe a new model version, which frees the dead entries right away.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+
+DEFAULT_MAX_ENTRIES = 50_000
+
+class ResultCache:
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        if max_entries < 1:
+            raise ValueError("max_entries must be >= 1")
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.version = None
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(normalized_text, version):
+        digest = hashlib.blake2b(normalized_text.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+        return (version, digest)
+
+    def get(self, key):
+        """Returns a copy of the cached result, or None on a miss."""
+        with self._lock:
+            value = self._data.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+        return dict(value)
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = dict(value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def bind_version(self, version):
+        """Clears the cache once the model version moves on (old entries could never hit again)."""
+        if version != self.version:
+            with self._lock:
+                if version != self.version:
+                    self._data.clear()
+                    self.version = version
+
+    def clear(self):
+        """Drops every entry (counters are kept)."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "version": self.version,
+                "size": len(self._data),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,287 @@
+"""
+Headless scoring service: the sentiment engines over HTTP, without Streamlit.
+
+    python scoring_server.py --engine engine --port 8765 --max-batch 64 --max-wait-ms 5
+
+    POST /score    {"text": "..."}            -> one result ({"label", "score", "color", ...})
+                   {"texts": ["...", ...]}    -> {"results": [...]}
+    GET  /health   -> {"status": "ok", "engine": ..., "version": ...}
+    GET  /stats    -> micro-batching counters
+    GET  /metrics  -> instrumentation stage histograms, Prometheus text format
+
+Texts from concurrent requests are collected into micro-batches: a batch is scored
+once it holds `max_batch` texts or `max_wait_ms` after its first text arrived,
+whichever comes first, in one analyze_many call. Scoring runs on one worker thread,
+so the event loop keeps accepting (and the next batch keeps filling) meanwhile.
+Only the standard library is used for HTTP/1.1 (keep-alive, Content-Length bodies).
+"""
+import json
+import time
+import asyncio
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+import instrumentation
+from instrumentation import timer
+
+DEFAULT_PORT = 8765
+DEFAULT_MAX_BATCH = 64
+DEFAULT_MAX_WAIT_MS = 5.0
+MAX_BODY = 1 << 20 # bytes
+ENGINES = ('engine', 'nlp', 'hybrid')
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+           413: 'Payload Too Large', 500: 'Internal Server Error'}
+
+def make_engine(name):
+    """The engine behind the service (imported lazily: only the chosen one is loaded)."""
+    if name == 'engine':
+        from engine import SentimentEngine
+        return SentimentEngine()
+    if name == 'nlp':
+        from nlp_engine import SentimentBrain
+        return SentimentBrain()
+    if name == 'hybrid':
+        from hybrid_engine import SentimentBrain
+        return SentimentBrain()
+    raise ValueError(f"Unknown engine: {name!r} (expected one of {ENGINES})")
+
+def _version(engine):
+    return getattr(engine, 'model_version', None) or getattr(engine, 'version', None)
+
+class MicroBatcher:
+    """Collects texts from concurrent callers and scores them max_batch at a time."""
+
+    def __init__(self, score_many, max_batch=DEFAULT_MAX_BATCH, max_wait_ms=DEFAULT_MAX_WAIT_MS):
+        if max_batch < 1 or max_wait_ms < 0:
+            raise ValueError("max_batch must be >= 1 and max_wait_ms >= 0")
+        self.score_many = score_many
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1e3
+        self.batches = 0
+        self.items = 0
+        self.full_batches = 0 # closed by size rather than by the wait
+        self.score_seconds = 0.0
+        self._queue = None
+        self._task = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='scoring')
+
+    def start(self):
+        """Starts the batching loop on the running event loop."""
+        self._queue = asyncio.Queue()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._executor.shutdown(wait=False)
+
+    async def score(self, texts):
+        """Results for `texts`, each scored in whichever batch it lands in."""
+        loop = asyncio.get_running_loop()
+        futures = []
+        for text in texts:
+            future = loop.create_future()
+            self._queue.put_nowait((text, future))
+            futures.append(future)
+        return await asyncio.gather(*futures)
+
+    async def _collect(self):
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.max_batch:
+            if not self._queue.empty(): # already waiting: take it without a timer
+                batch.append(self._queue.get_nowait())
+                continue
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    def _score(self, texts):
+        t0 = time.perf_counter()
+        with timer('server.batch'):
+            results = self.score_many(texts)
+        self.score_seconds += time.perf_counter() - t0
+        return results
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            self.batches += 1
+            self.items += len(batch)
+            self.full_batches += len(batch) == self.max_batch
+            try:
+                results = await loop.run_in_executor(self._executor, self._score, [t for t, _ in batch])
+            except Exception as exc:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+            for (_, future), result in zip(batch, results):
+                if not future.done(): # the client may have gone away
+                    future.set_result(result)
+
+    def stats(self):
+        return {"batches": self.batches, "items": self.items, "full_batches": self.full_batches,
+                "mean_batch": self.items / self.batches if self.batches else 0.0,
+                "queued": self._queue.qsize() if self._queue is not None else 0,
+                "max_batch": self.max_batch, "max_wait_ms": self.max_wait * 1e3,
+                "score_seconds": self.score_seconds}
+
+class _HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+class ScoringServer:
+    def __init__(self, engine='engine', max_batch=DEFAULT_MAX_BATCH, max_wait_ms=DEFAULT_MAX_WAIT_MS):
+        self.engine_name = engine
+        self.engine = make_engine(engine)
+        if hasattr(self.engine, 'analyze_many'):
+            score_many = self.engine.analyze_many
+        else: # hybrid: no vectorized path, score one by one inside the batch
+            score_many = lambda texts: [self.engine.analyze(t) for t in texts]
+        self.batcher = MicroBatcher(score_many, max_batch, max_wait_ms)
+        self.requests = 0
+        self._server = None
+
+    async def start(self, host='127.0.0.1', port=DEFAULT_PORT):
+        self.batcher.start()
+        self._server = await asyncio.start_server(self._handle, host, port)
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        await self.batcher.stop()
+
+    async def serve_forever(self, host='127.0.0.1', port=DEFAULT_PORT):
+        host, port = await self.start(host, port)
+        print(f"scoring server ({self.engine_name}, max_batch={self.batcher.max_batch}, "
+              f"max_wait_ms={self.batcher.max_wait * 1e3:g}) on http://{host}:{port}", flush=True)
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                request = await self._read_request(reader)
+                if request is None:
+                    break
+                method, path, headers, body = request
+                try:
+                    status, payload = await self._route(method, path, body)
+                except _HTTPError as exc:
+                    status, payload = exc.status, {"error": str(exc)}
+                except Exception as exc:
+                    status, payload = 500, {"error": f"{type(exc).__name__}: {exc}"}
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                self._write(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except _HTTPError as exc: # malformed request: answer, then drop the connection
+            self._write(writer, exc.status, {"error": str(exc)}, False)
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader):
+        line = await reader.readline()
+        if not line:
+            return None
+        try:
+            method, path, _ = line.decode('latin-1').split(' ', 2)
+        except ValueError:
+            raise _HTTPError(400, "malformed request line")
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        try:
+            length = int(headers.get('content-length') or 0)
+        except ValueError:
+            raise _HTTPError(400, "bad Content-Length")
+        if length < 0:
+            raise _HTTPError(400, "bad Content-Length")
+        if length > MAX_BODY:
+            raise _HTTPError(413, f"body over {MAX_BODY} bytes")
+        body = await reader.readexactly(length) if length else b''
+        return method, path.split('?', 1)[0], headers, body
+
+    async def _route(self, method, path, body):
+        if path == '/score':
+            if method != 'POST':
+                raise _HTTPError(405, "use POST")
+            return 200, await self._score(body)
+        if method != 'GET':
+            raise _HTTPError(405, "use GET")
+        if path == '/health':
+            return 200, {"status": "ok", "engine": self.engine_name, "version": _version(self.engine)}
+        if path == '/stats':
+            return 200, dict(self.batcher.stats(), requests=self.requests)
+        if path == '/metrics':
+            return 200, instrumentation.export_prometheus()
+        raise _HTTPError(404, f"no route {path}")
+
+    async def _score(self, body):
+        try:
+            doc = json.loads(body)
+        except ValueError:
+            raise _HTTPError(400, "body is not JSON")
+        if not isinstance(doc, dict):
+            raise _HTTPError(400, 'expected {"text": ...} or {"texts": [...]}')
+        self.requests += 1
+        if isinstance(doc.get('texts'), list):
+            if not all(isinstance(t, str) for t in doc['texts']):
+                raise _HTTPError(400, '"texts" must be a list of strings')
+            return {"results": await self.batcher.score(doc['texts'])}
+        if isinstance(doc.get('text'), str):
+            return (await self.batcher.score([doc['text']]))[0]
+        raise _HTTPError(400, 'expected {"text": ...} or {"texts": [...]}')
+
+    @staticmethod
+    def _write(writer, status, payload, keep_alive):
+        if isinstance(payload, str):
+            body, ctype = payload.encode(), 'text/plain; version=0.0.4'
+        else:
+            body, ctype = json.dumps(payload, default=float).encode(), 'application/json'
+        head = (f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\nContent-Type: {ctype}\r\n"
+                f"Content-Length: {len(body)}\r\nConnection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode('latin-1') + body)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless sentiment scoring server")
+    parser.add_argument("--engine", choices=ENGINES, default='engine')
+    parser.add_argument("--host", default='127.0.0.1')
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--max-batch", type=int, default=DEFAULT_MAX_BATCH, help="texts per scoring call")
+    parser.add_argument("--max-wait-ms", type=float, default=DEFAULT_MAX_WAIT_MS,
+                        help="how long a batch waits for more texts after its first one")
+    parser.add_argument("--metrics", action="store_true", help="enable stage timings (GET /metrics)")
+    args = parser.parse_args(argv)
+    if args.metrics:
+        instrumentation.enable()
+    server = ScoringServer(args.engine, args.max_batch, args.max_wait_ms)
+    try:
+        asyncio.run(server.serve_forever(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""
+Process-wide stale-while-revalidate cache, shared by every Streamlit session.
+
+    value = cache.get(key, loader)
+
+  - miss:  loader() runs once; concurrent callers for the same key wait for that
+           same call (its exception is raised to all of them and nothing is cached)
+  - fresh: (age < ttl) the cached value is returned
+  - stale: (ttl <= age < max_stale) the cached value is returned at once and a
+           background refresh is started, at most one per key at a time; if the
+           refresh fails, the stale value stays in place and is retried later
+  - older than max_stale: treated as a miss (don't show data that old)
+
+Entries are bounded LRU. stats() reports hit rates and refresh latencies.
+"""
+import time
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from instrumentation import propagate
+
+DEFAULT_TTL = 300 # seconds; same as the old st.cache_data(ttl=300)
+DEFAULT_MAX_STALE = 3600
+DEFAULT_MAX_ENTRIES = 1024
+REFRESH_WORKERS = 4
+# Latency samples kept per cache (most recent)
+LATENCY_SAMPLES = 512
+
+class SharedCache:
+    def __init__(self, name, ttl=DEFAULT_TTL, max_stale=DEFAULT_MAX_STALE, max_entries=DEFAULT_MAX_ENTRIES,
+                 workers=REFRESH_WORKERS):
+        if max_entries < 1:
+            raise ValueError("max_entries must be >= 1")
+        self.name = name
+        self.ttl = ttl
+        self.max_stale = max(max_stale, ttl)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.refreshes = 0
+        self.refresh_errors = 0
+        self._refresh_seconds = deque(maxlen=LATENCY_SAMPLES) # background refresh latencies
+        self._load_seconds = deque(maxlen=LATENCY_SAMPLES) # blocking (miss) load latencies
+        self._data = OrderedDict() # key -> (value, fetched_at)
+        self._loading = {} # key -> Future of the blocking load in progress
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._workers = workers
+        self._pool = None
+
+    def get(self, key, loader):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                value, fetched_at = entry
+                age = now - fetched_at
+                if age < self.max_stale:
+                    self._data.move_to_end(key)
+                    if age < self.ttl:
+                        self.hits += 1
+                    else:
+                        self.stale_hits += 1
+                        self._schedule_refresh(key, loader)
+                    return value
+            self.misses += 1
+            future = self._loading.get(key)
+            owner = future is None
+            if owner:
+                future = self._loading[key] = Future()
+        if not owner:
+            return future.result()
+
+        t0 = time.perf_counter()
+        try:
+            value = loader()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(value)
+            self._store(key, value)
+        finally:
+            with self._lock:
+                self._loading.pop(key, None)
+                self._load_seconds.append(time.perf_counter() - t0)
+        return value
+
+    def _schedule_refresh(self, key, loader):
+        # Called with the lock held
+        if key in self._refreshing:
+            return
+        self._refreshing.add(key)
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix=f"swr-{self.name}")
+        self._pool.submit(propagate(self._refresh), key, loader)
+
+    def _refresh(self, key, loader):
+        t0 = time.perf_counter()
+        try:
+            value = loader()
+        except Exception:
+            with self._lock:
+                self.refresh_errors += 1 # keep serving the stale value
+        else:
+            self._store(key, value)
+            with self._lock:
+                self.refreshes += 1
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+                self._refresh_seconds.append(time.perf_counter() - t0)
+
+    def _store(self, key, value):
+        with self._lock:
+            self._data[key] = (value, time.monotonic())
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def peek(self, key):
+        """The cached value (fresh or stale) without loading or counting, else None."""
+        entry = self._data.get(key)
+        return entry[0] if entry else None
+
+    def invalidate(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        """Drops every entry (counters are kept)."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.stale_hits + self.misses
+            return {
+                "name": self.name,
+                "size": len(self._data),
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                # Every fresh or stale hit was answered without waiting on upstream
+                "hit_rate": (self.hits + self.stale_hits) / lookups if lookups else 0.0,
+                "fresh_hit_rate": self.hits / lookups if lookups else 0.0,
+                "refreshes": self.refreshes,
+                "refresh_errors": self.refresh_errors,
+                "refreshing": len(self._refreshing),
+                "refresh_latency": _summary(self._refresh_seconds),
+                "miss_latency": _summary(self._load_seconds),
+            }
+
+def _summary(samples):
+    """count / mean / p50 / p95 / max in seconds over the recent samples."""
+    if not samples:
+        return {"count": 0}
+    ordered = sorted(samples)
+    pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+    return {"count": len(ordered), "mean": sum(ordered) / len(ordered),
+            "p50": pick(0.5), "p95": pick(0.95), "max": ordered[-1]}
+
+# Registry, so a dashboard can list every shared cache of the process
+_caches = {}
+_registry_lock = threading.Lock()
+
+def shared_cache(name, **kwargs):
+    """The process-wide SharedCache called `name` (created on first use with kwargs)."""
+    with _registry_lock:
+        cache = _caches.get(name)
+        if cache is None:
+            cache = _caches[name] = SharedCache(name, **kwargs)
+        return cache
+
+def all_stats():
+    return [cache.stats() for cache in list(_caches.values())]
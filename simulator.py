@@ -1,21 +1,166 @@
+"""
+Market simulator: synthetic headline feed and order execution.
+
+HeadlineStream is a seeded, unbounded generator of templated headlines (tickers,
+bull/bear phrases built on the hybrid_engine lexicon, numbers, sources) with
+ground-truth labels and arrival times:
+  - mode='steady':  one headline every 1/rate seconds
+  - mode='poisson': exponential gaps with mean 1/rate
+  - mode='bursty':  Poisson arrivals that switch between `rate` and
+                    rate * burst_factor (on average burst_seconds long, every calm_seconds)
+
+    stream = HeadlineStream(seed=7, rate=500, mode='bursty')
+    batch = stream.take(10_000)          # as fast as possible, arrival times attached
+    for h in stream.paced(duration=10):   # real time, at the configured rate
+        ...
+"""
+import time
 import random
-import datetime
+from collections import namedtuple
+
+from hybrid_engine import BULL_WORDS, BEAR_WORDS
+
+TICKERS = ["AAPL", "TSLA", "NVDA", "MSFT", "AMZN", "GOOGL", "META", "NFLX", "AMD", "INTC",
+           "JPM", "GS", "XOM", "CVX", "BTC-USD", "ETH-USD", "SPY", "QQQ", "GOLD", "OIL"]
+SOURCES = ["Reuters", "Bloomberg", "CNBC", "WSJ", "MarketWatch", "FT", "AP", "Barron's"]
+SUBJECTS = ["shares", "stock", "earnings", "revenue", "guidance", "margins", "outlook", "sales"]
+# Context only: a tail must not carry sentiment of its own, or it can contradict the label
+TAILS = ["after the Fed decision", "ahead of the open", "after hours", "after the close",
+         "ahead of the quarterly report", "before the CPI print", "in midday trading", "on Monday",
+         "after the jobs report", "in morning trading"]
+
+# Headline phrases per lexicon word ({pct} and {price} are filled in per headline)
+PHRASES = {
+    'surge': ["{subject} surge {pct}%", "surges {pct}% {tail}"],
+    'soar': ["{subject} soar {pct}%", "soars to ${price}"],
+    'jump': ["{subject} jump {pct}%", "jumps {pct}% {tail}"],
+    'rise': ["{subject} rise {pct}%", "rises to ${price}"],
+    'gain': ["gains {pct}% {tail}", "{subject} gain {pct}%"],
+    'beat': ["beats estimates by {pct}%", "{subject} beat forecasts"],
+    'profit': ["quarterly profit tops ${price}M", "profit climbs {pct}%"],
+    'record': ["posts record {subject}", "closes at a record ${price}"],
+    'growth': ["{subject} growth accelerates to {pct}%"],
+    'bull': ["bulls pile in {tail}", "turns bullish on {subject}"],
+    'buy': ["analysts say buy, target ${price}", "upgraded to buy"],
+    'upgrade': ["gets an upgrade at {source}", "analyst upgrade lifts {subject}"],
+    'high': ["hits an all-time high of ${price}", "{subject} at a 52-week high"],
+    'rocket': ["rockets {pct}% {tail}"],
+    'plummet': ["{subject} plummet {pct}%", "plummets to ${price}"],
+    'crash': ["crashes {pct}% {tail}", "{subject} crash after the report"],
+    'drop': ["{subject} drop {pct}%", "drops to ${price}"],
+    'fall': ["falls {pct}% {tail}", "{subject} fall {pct}%"],
+    'miss': ["misses estimates by {pct}%", "{subject} miss forecasts"],
+    'loss': ["reports a ${price}M loss", "loss widens {pct}%"],
+    'debt': ["debt concerns mount {tail}", "debt load weighs on {subject}"],
+    'bear': ["bears take control {tail}", "turns bearish on {subject}"],
+    'sell': ["analysts say sell, target ${price}", "cut to sell"],
+    'downgrade': ["gets a downgrade at {source}", "analyst downgrade hits {subject}"],
+    'halt': ["trading halted {tail}"],
+    'warning': ["issues a {subject} warning", "warning on {subject} {tail}"],
+    'low': ["hits a 52-week low of ${price}", "{subject} at a multi-year low"],
+    'dip': ["dips {pct}% {tail}", "{subject} dip {pct}%"],
+}
+NEUTRAL_PHRASES = ["to hold annual meeting in {month}", "schedules {subject} call for {month}",
+                   "names new CFO", "files quarterly report", "announces {month} conference date",
+                   "trades flat {tail}", "{subject} in line with expectations"]
+MONTHS = ["January", "February", "March", "April", "May", "June", "July", "August",
+          "September", "October", "November", "December"]
+TEMPLATES = ["{ticker} {phrase}", "{ticker} {phrase} - {source}", "{source}: {ticker} {phrase}",
+             "BREAKING: {ticker} {phrase}"]
+
+BULLISH, BEARISH, NEUTRAL = "Bullish", "Bearish", "Neutral"
+MODES = ('steady', 'poisson', 'bursty')
+
+# text, ground-truth label, ticker, source, arrival (seconds since the stream started)
+Headline = namedtuple("Headline", ["text", "label", "ticker", "source", "ts"])
+
+def _phrases(words):
+    return [p for w in words for p in PHRASES.get(w, [w + "s {tail}"])]
+
+class HeadlineStream:
+    def __init__(self, seed=None, rate=100.0, mode='poisson', tickers=TICKERS,
+                 bull_share=0.5, neutral_share=0.0, burst_factor=10.0, burst_seconds=0.5, calm_seconds=5.0):
+        if mode not in MODES:
+            raise ValueError(f"Unknown arrival mode: {mode!r} (expected one of {MODES})")
+        if rate <= 0:
+            raise ValueError("rate must be > 0")
+        self.rng = random.Random(seed)
+        self.rate = float(rate)
+        self.mode = mode
+        self.tickers = list(tickers)
+        self.bull_share = bull_share
+        self.neutral_share = neutral_share
+        self.burst_factor = burst_factor
+        self.burst_seconds = burst_seconds
+        self.calm_seconds = calm_seconds
+        self.bull_phrases = _phrases(BULL_WORDS)
+        self.bear_phrases = _phrases(BEAR_WORDS)
+        self.clock = 0.0
+        self.count = 0
+        self._burst_until = 0.0
+        self._next_burst = self.rng.expovariate(1.0 / calm_seconds) if mode == 'bursty' else float('inf')
+
+    def _gap(self):
+        """Seconds until the next arrival."""
+        if self.mode == 'steady':
+            return 1.0 / self.rate
+        rate = self.rate
+        if self.mode == 'bursty':
+            if self.clock >= self._next_burst:
+                self._burst_until = self.clock + self.rng.expovariate(1.0 / self.burst_seconds)
+                self._next_burst = self._burst_until + self.rng.expovariate(1.0 / self.calm_seconds)
+            if self.clock < self._burst_until:
+                rate *= self.burst_factor
+        return self.rng.expovariate(rate)
+
+    def next(self):
+        rng = self.rng
+        r = rng.random()
+        if r < self.neutral_share:
+            label, phrases = NEUTRAL, NEUTRAL_PHRASES
+        elif r < self.neutral_share + (1 - self.neutral_share) * self.bull_share:
+            label, phrases = BULLISH, self.bull_phrases
+        else:
+            label, phrases = BEARISH, self.bear_phrases
+        ticker, source = rng.choice(self.tickers), rng.choice(SOURCES)
+        phrase = rng.choice(phrases).format(
+            subject=rng.choice(SUBJECTS), tail=rng.choice(TAILS), source=source, month=rng.choice(MONTHS),
+            pct=round(rng.uniform(0.5, 40), 1), price=rng.randint(5, 2000))
+        text = rng.choice(TEMPLATES).format(ticker=ticker, phrase=phrase, source=source)
+        self.clock += self._gap()
+        self.count += 1
+        return Headline(text, label, ticker, source, self.clock)
+
+    def __iter__(self):
+        while True:
+            yield self.next()
+
+    def take(self, n):
+        """The next `n` headlines, generated immediately (arrival times attached)."""
+        return [self.next() for _ in range(n)]
+
+    def paced(self, duration=None, limit=None):
+        """Yields headlines in real time, at their arrival times (until duration seconds / limit headlines)."""
+        begin = self.clock
+        start = time.perf_counter() - begin # wall clock of stream time 0
+        produced = 0
+        while limit is None or produced < limit:
+            h = self.next()
+            if duration is not None and h.ts - begin > duration:
+                return
+            wait = start + h.ts - time.perf_counter()
+            if wait > 0:
+                time.sleep(wait)
+            produced += 1
+            yield h
 
 class MarketSim:
-    def __init__(self):
-        self.headlines = [
-            ("FED Hikes Interest Rates by 50bps", "Bearish"),
-            ("Apple Reports Record Q3 Earnings", "Bullish"),
-            ("Oil Prices Surge Amid Supply Chain Crisis", "Bearish"),
-            ("Tech Sector Rallies on AI Breakthrough", "Bullish"),
-            ("Bitcoin Breaks $100k Resistance Level", "Bullish"),
-            ("Global Manufacturing Output Slows Down", "Bearish"),
-            ("Tesla Announces New Gigafactory in Europe", "Bullish")
-        ]
+    def __init__(self, seed=None):
+        self.stream = HeadlineStream(seed=seed)
 
     def get_live_feed(self, count=3):
-        """Returns random headlines for stress testing."""
-        return random.sample(self.headlines, count)
+        """Returns `count` fresh (headline, label) pairs for stress testing."""
+        return [(h.text, h.label) for h in self.stream.take(count)]
 
     def execute_trade(self, portfolio, action, price, amount=1):
         """
@@ -30,7 +175,7 @@ class MarketSim:
                 return True, "ORDER FILLED"
             else:
                 return False, "INSUFFICIENT FUNDS"
-        
+
         elif action == 'sell':
             if portfolio['shares'] >= amount:
                 gain = price * amount
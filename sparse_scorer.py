@@ -0,0 +1,111 @@
+"""
+Compact, sklearn-free scorer for the TF-IDF + LogisticRegression model.
+
+train_model.export_compact() flattens the pickled pair into one .npz holding:
+  - hashes:    sorted 64-bit hashes of the vocabulary terms
+  - idf:       idf weight per term (needed for the l2 document norm)
+  - weights:   idf * coef per term
+  - intercept: the logistic-regression intercept
+plus the tokenizer settings. Scoring a document is a tokenize -> hash -> searchsorted
+-> sparse dot product, with no vocabulary dict and no sklearn import.
+"""
+import re
+import json
+import hashlib
+from functools import lru_cache
+import numpy as np
+
+COMPACT_FORMAT = 1
+
+# Headlines reuse a small working set of n-grams, so hashes are memoized (bounded)
+@lru_cache(maxsize=1 << 18)
+def term_hash(term):
+    """Stable 64-bit hash of a vocabulary term."""
+    return int.from_bytes(hashlib.blake2b(term.encode('utf-8'), digest_size=8).digest(), 'little')
+
+def source_digest(*paths):
+    """Content digest of the pickles an export was built from (pairs .npz with .pkl)."""
+    h = hashlib.blake2b(digest_size=16)
+    for path in paths:
+        with open(path, 'rb') as fh:
+            h.update(fh.read())
+    return h.hexdigest()
+
+class CompactScorer:
+    def __init__(self, hashes, idf, weights, intercept, config, source=""):
+        self.hashes = hashes
+        self.idf = idf
+        self.weights = weights
+        self.intercept = float(intercept)
+        self.config = config
+        self.source = source
+        self._token_re = re.compile(config["token_pattern"])
+        self._ngram_range = tuple(config["ngram_range"])
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            config = json.loads(str(data["config"]))
+            if config.get("format") != COMPACT_FORMAT:
+                raise ValueError(f"Unsupported compact model format: {config.get('format')}")
+            return cls(data["hashes"], data["idf"], data["weights"], data["intercept"][0],
+                       config, str(data["source"]))
+
+    def save(self, path):
+        np.savez(path, hashes=self.hashes, idf=self.idf, weights=self.weights,
+                 intercept=np.array([self.intercept]), config=np.array(json.dumps(self.config)),
+                 source=np.array(self.source))
+
+    def _terms(self, text):
+        """Word n-grams exactly as sklearn's 'word' analyzer builds them."""
+        if self.config["lowercase"]:
+            text = text.lower()
+        tokens = self._token_re.findall(text)
+        min_n, max_n = self._ngram_range
+        if max_n == 1:
+            return tokens
+        terms = list(tokens) if min_n == 1 else []
+        for n in range(max(min_n, 2), max_n + 1):
+            terms.extend(" ".join(tokens[i:i + n]) for i in range(len(tokens) - n + 1))
+        return terms
+
+    def score_many(self, texts):
+        """P(class 1) for each text, as a float64 array."""
+        texts = list(texts)
+        n_docs = len(texts)
+        doc_ids, term_hashes = [], []
+        for doc, text in enumerate(texts):
+            hashed = [term_hash(t) for t in self._terms(text)]
+            term_hashes.extend(hashed)
+            doc_ids.extend([doc] * len(hashed))
+        if not term_hashes:
+            return self._prior(n_docs)
+
+        # Look every term up in the sorted hash table; drop out-of-vocabulary terms
+        term_hashes = np.array(term_hashes, dtype=np.uint64)
+        doc_ids = np.array(doc_ids, dtype=np.int64)
+        pos = np.searchsorted(self.hashes, term_hashes)
+        pos[pos == len(self.hashes)] = 0
+        known = self.hashes[pos] == term_hashes
+        doc_ids, pos = doc_ids[known], pos[known]
+        if not len(pos): # no term of the batch is known (np.bincount would return int64 zeros)
+            return self._prior(n_docs)
+
+        # Term frequencies per (doc, term), then tf-idf, l2 norm and the dot product
+        keys, tf = np.unique(doc_ids * len(self.hashes) + pos, return_counts=True)
+        doc_ids, pos = keys // len(self.hashes), keys % len(self.hashes)
+        tf = tf.astype(np.float64)
+        if self.config["sublinear_tf"]:
+            tf = 1.0 + np.log(tf)
+        dot = np.bincount(doc_ids, weights=tf * self.weights[pos], minlength=n_docs)
+        if self.config["norm"] == "l2":
+            norm = np.sqrt(np.bincount(doc_ids, weights=(tf * self.idf[pos]) ** 2, minlength=n_docs))
+            dot = np.divide(dot, norm, out=np.zeros_like(dot), where=norm > 0)
+        return 1.0 / (1.0 + np.exp(-(self.intercept + dot)))
+
+    def _prior(self, n_docs):
+        """The score of a text without known terms (intercept only), for n_docs texts."""
+        return np.full(n_docs, 1.0 / (1.0 + np.exp(-self.intercept)))
+
+    def score(self, text):
+        return float(self.score_many([text])[0])
@@ -0,0 +1,70 @@
+import joblib
+import numpy as np
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+
+import preprocessing
+import train_model
+from fixtures import make_headlines, make_labelled_headlines, write_sentiment_csv
+from sparse_scorer import CompactScorer
+
+# Training cleans with the NLTK stopwords, which are downloaded on first use; a stub
+# list keeps the test independent of the network (parity does not depend on it)
+STOPWORDS = frozenset({'the', 'a', 'an', 'of', 'on', 'in', 'to', 'after', 'ahead', 'out'})
+
+def _clear_stopword_caches():
+    preprocessing._stopword_pattern.cache_clear()
+    preprocessing._stopword_regex.cache_clear()
+
+@pytest.fixture(scope="module")
+def trained(tmp_path_factory):
+    """A small TF-IDF + LogisticRegression trained on fixture data, and its compact export."""
+    tmp = tmp_path_factory.mktemp("compact")
+    data = write_sentiment_csv(str(tmp / "data.csv"), 2_000)
+    model_path, tfidf_path, out = str(tmp / "model.pkl"), str(tmp / "tfidf.pkl"), str(tmp / "model.npz")
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(preprocessing, 'get_stop_words', lambda: STOPWORDS)
+        _clear_stopword_caches()
+        try:
+            assert train_model.train(data, model_path, tfidf_path)
+        finally:
+            _clear_stopword_caches()
+    train_model.export_compact(model_path, tfidf_path, out)
+    return joblib.load(model_path), joblib.load(tfidf_path), CompactScorer.load(out)
+
+def _expected(model, vectorizer, texts):
+    return model.predict_proba(vectorizer.transform(texts))[:, 1]
+
+def test_probabilities_match_predict_proba(trained):
+    model, vectorizer, scorer = trained
+    texts = [t.lower() for t in make_headlines(500, seed=7)]
+    np.testing.assert_allclose(scorer.score_many(texts), _expected(model, vectorizer, texts), rtol=0, atol=1e-9)
+
+def test_empty_input(trained):
+    _, _, scorer = trained
+    out = scorer.score_many([])
+    assert out.shape == (0,)
+
+def test_all_unknown_tokens(trained):
+    model, vectorizer, scorer = trained
+    texts = ["zzqx qqqv wwxy", "", "zzqx"]
+    np.testing.assert_allclose(scorer.score_many(texts), _expected(model, vectorizer, texts), rtol=0, atol=1e-9)
+
+def test_train_without_data_reports_failure(tmp_path):
+    assert not train_model.train(str(tmp_path / "missing.csv"), str(tmp_path / "m.pkl"), str(tmp_path / "t.pkl"))
+
+@pytest.mark.parametrize("norm", ["l2", None])
+def test_batch_without_known_terms(tmp_path, norm):
+    """Regression: np.bincount over zero known terms returned int64, which broke the l2 division."""
+    texts, labels = make_labelled_headlines(300, seed=3)
+    vectorizer = TfidfVectorizer(norm=norm)
+    model = LogisticRegression(max_iter=200).fit(vectorizer.fit_transform(texts), labels)
+    model_path, tfidf_path, out = str(tmp_path / "m.pkl"), str(tmp_path / "t.pkl"), str(tmp_path / "m.npz")
+    joblib.dump(model, model_path)
+    joblib.dump(vectorizer, tfidf_path)
+    train_model.export_compact(model_path, tfidf_path, out)
+    batch = ["zzqx qqqv", "wwxy", "zzqx zzqx zzqx"]
+    scores = CompactScorer.load(out).score_many(batch)
+    assert scores.dtype == np.float64
+    np.testing.assert_allclose(scores, _expected(model, vectorizer, batch), rtol=0, atol=1e-12)
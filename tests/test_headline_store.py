@@ -0,0 +1,30 @@
+import time
+import sqlite3
+
+from headline_store import HeadlineStore
+
+RESULT = {"score": 0.8, "label": "BULLISH"}
+
+def _stored(path):
+    with sqlite3.connect(path) as conn:
+        return conn.execute("SELECT count(*) FROM headlines").fetchone()[0]
+
+def test_interactive_add_is_written_within_the_flush_delay(tmp_path):
+    path = str(tmp_path / "h.sqlite")
+    with HeadlineStore(path, flush_delay=0.05) as store:
+        store.add("Tesla stock surges", RESULT, ticker="TSLA")
+        store.add("Apple stock surges", RESULT, ticker="AAPL")
+        deadline = time.monotonic() + 5
+        while _stored(path) < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert _stored(path) == 2 # seen by another connection, before any explicit flush
+        assert store.flushes == 1 # both rows in one transaction
+
+def test_bulk_rows_wait_for_the_batch_but_queries_see_them(tmp_path):
+    path = str(tmp_path / "h.sqlite")
+    with HeadlineStore(path, batch_size=1000, flush_delay=0.05) as store:
+        store.add_many(["a", "b", "c"], [RESULT] * 3, tickers="TSLA", ts=3600.0)
+        time.sleep(0.2)
+        assert _stored(path) == 0 and len(store) == 3
+        assert store.hourly("TSLA")["count"].tolist() == [3]
+        assert store.tickers() == ["TSLA"]
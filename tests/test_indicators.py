@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from indicators import IndicatorBook
+
+def reference(df, window=20, num_std=2, rsi_window=14):
+    """get_chart's original pandas code, over `df` alone."""
+    close = df['Close']
+    sma = close.rolling(window).mean()
+    std = close.rolling(window).std()
+    delta = close.diff()
+    gain = delta.where(delta > 0, 0).rolling(rsi_window).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(rsi_window).mean()
+    return pd.DataFrame({f'SMA_{window}': sma, f'STD_{window}': std, 'Upper_BB': sma + std * num_std,
+                         'Lower_BB': sma - std * num_std, 'RSI': 100 - 100 / (1 + gain / loss)})
+
+def bars(n, seed=3):
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range('2024-01-01', periods=n)
+    return pd.DataFrame({'Close': 100 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))}, index=index)
+
+def check(book, ticker, df):
+    out = book.apply(ticker, df)
+    ref = reference(df)
+    pd.testing.assert_frame_equal(out[ref.columns], ref, check_freq=False, rtol=1e-9, atol=1e-9)
+
+@pytest.mark.parametrize("size", [5, 15, 30, 120])
+def test_sliding_frame_matches_pandas(size):
+    """A fixed-length window moving forward one bar at a time, the last bar revised in between."""
+    full = bars(size + 60)
+    book = IndicatorBook(window=20, num_std=2, rsi_window=14)
+    for start in range(60):
+        df = full.iloc[start:start + size]
+        check(book, "T", df)
+        forming = df.copy()
+        forming.iloc[-1, 0] *= 1.01
+        check(book, "T", forming)
+
+def test_growing_then_sliding_frame_matches_pandas():
+    full = bars(200)
+    book = IndicatorBook(window=20, num_std=2, rsi_window=14)
+    for end in range(1, 80):
+        check(book, "T", full.iloc[:end])
+    for start in range(1, 40):
+        check(book, "T", full.iloc[start:start + 8])
+
+def test_wilder_reseeds_when_the_frame_slides():
+    full = bars(150)
+    book = IndicatorBook(window=20, rsi_window=14, rsi_method='wilder')
+    book.apply("T", full.iloc[:100])
+    slid = book.apply("T", full.iloc[10:110])
+    pd.testing.assert_frame_equal(slid, IndicatorBook(window=20, rsi_window=14, rsi_method='wilder')
+                                  .apply("T", full.iloc[10:110]))
+
+def test_tickers_are_lru_bounded():
+    book = IndicatorBook(max_tickers=3, window=20, num_std=2, rsi_window=14)
+    df = bars(40)
+    for ticker in "ABCA":
+        book.apply(ticker, df)
+    book.apply("D", df) # evicts B, the least recently used
+    assert len(book) == 3 and set(book._states) == set(book._frames) == {"A", "C", "D"}
+    assert book.stats()["evictions"] == 1
+    check(book, "B", df) # re-created from scratch
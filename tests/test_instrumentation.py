@@ -0,0 +1,30 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import instrumentation
+from instrumentation import timer
+
+def _work(stage):
+    with timer(stage):
+        pass
+    return stage
+
+def _session(timed, out):
+    instrumentation.start_rerun(timed=timed)
+    _work("caller")
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        list(pool.map(instrumentation.propagate(_work), ["pool.a", "pool.b", "pool.a"]))
+        pool.submit(_work, "unpropagated").result()
+    out.update(instrumentation.rerun_timings())
+
+def test_session_timing_follows_propagated_pool_work():
+    timed, untimed = {}, {}
+    threads = [threading.Thread(target=_session, args=(True, timed)),
+               threading.Thread(target=_session, args=(False, untimed))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert {stage: calls for stage, (calls, _) in timed.items()} == {"caller": 1, "pool.a": 2, "pool.b": 1}
+    assert untimed == {}
+    assert not instrumentation.enabled() # nothing leaked into this thread / the process
@@ -0,0 +1,42 @@
+import pytest
+
+import fixtures
+import simulator
+from fixtures import make_headlines
+from hybrid_engine import DEFAULT_LEXICON, KeywordMatcher, SentimentBrain
+from result_cache import ResultCache
+from simulator import HeadlineStream
+
+def _baseline_hits(text_lower):
+    """The original app.py rule: substring test per lexicon word."""
+    return {w for w in DEFAULT_LEXICON if w in text_lower}
+
+def test_every_baseline_hit_still_hits_on_simulator_headlines():
+    matcher = KeywordMatcher()
+    texts = [h.text for h in HeadlineStream(seed=1, neutral_share=0.2).take(20_000)] + make_headlines(5_000)
+    for text in texts:
+        lower = text.lower()
+        missing = _baseline_hits(lower) - matcher.hits(lower)
+        assert not missing, (text, missing)
+
+@pytest.mark.parametrize("text, word", [
+    ("stocks dropped 5%", "drop"), ("shares dipping on news", "dip"), ("nvda dropping", "drop"),
+    ("rates rising again", "rise"), ("oil surging", "surge"), ("bank downgraded", "downgrade"),
+    ("shares plummeted", "plummet"), ("stock gains", "gain"), ("lower guidance", "low"),
+    ("bullish call", "bull"), ("record highs", "high"),
+])
+def test_inflections_hit(text, word):
+    assert word in KeywordMatcher().hits(text)
+
+@pytest.mark.parametrize("text", ["q3 highlights", "below estimates", "the dropp key", "risotto"])
+def test_word_boundaries(text):
+    assert KeywordMatcher().hits(text) == set()
+
+@pytest.mark.parametrize("text", ["Stocks dropped 5%", "Shares dipping on news", "NVDA dropping"])
+def test_doubled_consonant_headlines_are_bearish(text):
+    assert SentimentBrain(cache=ResultCache()).analyze(text)["label"] == "BEARISH"
+
+@pytest.mark.parametrize("tail", sorted(set(simulator.TAILS) | set(fixtures.TAILS)))
+def test_headline_tails_carry_no_sentiment_words(tail):
+    """A bear word in a bullish headline's tail (or vice versa) would contradict its label."""
+    assert KeywordMatcher().hits(tail.lower()) == set()
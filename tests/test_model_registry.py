@@ -0,0 +1,81 @@
+import os
+
+import joblib
+import numpy as np
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+
+import train_model
+from fixtures import make_labelled_headlines
+from model_registry import ModelRegistry
+
+def _train(tmp_path, n=400, seed=1):
+    texts, labels = make_labelled_headlines(n, seed=seed)
+    tfidf = TfidfVectorizer(ngram_range=(1, 2))
+    model = LogisticRegression(max_iter=200).fit(tfidf.fit_transform(texts), labels)
+    paths = str(tmp_path / "model.pkl"), str(tmp_path / "tfidf.pkl")
+    joblib.dump(model, paths[0])
+    joblib.dump(tfidf, paths[1])
+    return paths
+
+@pytest.fixture
+def artifacts(tmp_path):
+    model_path, tfidf_path = _train(tmp_path)
+    train_model.export_compact(model_path, tfidf_path, str(tmp_path / "model.npz"))
+    return model_path, tfidf_path
+
+def test_get_returns_the_sklearn_pair_with_the_compact_scorer(artifacts):
+    registry = ModelRegistry(*artifacts)
+    scorer = registry.get_artifacts().scorer
+    assert scorer is not None
+    model, vectorizer = registry.get()
+    texts = [t.lower() for t in make_labelled_headlines(50, seed=5)[0]]
+    np.testing.assert_allclose(model.predict_proba(vectorizer.transform(texts))[:, 1], scorer.score_many(texts),
+                               rtol=0, atol=1e-9)
+    assert registry.get()[0] is model # unpickled once per version
+
+def test_freshness_check_is_throttled(artifacts, monkeypatch):
+    registry = ModelRegistry(*artifacts, check_interval=60)
+    calls = []
+    stat = registry._stat
+    monkeypatch.setattr(registry, '_stat', lambda: calls.append(1) or stat())
+    version = registry.get_artifacts().version
+    for _ in range(100):
+        assert registry.get_artifacts().version == version
+    assert len(calls) == 1
+
+def test_retrained_artifacts_are_picked_up_after_the_interval(artifacts, tmp_path):
+    registry = ModelRegistry(*artifacts, use_compact=False, check_interval=0)
+    before = registry.get_artifacts().version
+    os.remove(tmp_path / "model.npz")
+    _train(tmp_path, n=300, seed=2)
+    assert registry.get_artifacts().version != before
+
+def test_fresh_and_invalidate_bypass_the_interval(artifacts, tmp_path):
+    registry = ModelRegistry(*artifacts, use_compact=False, check_interval=60)
+    before = registry.get_artifacts().version
+    os.remove(tmp_path / "model.npz")
+    _train(tmp_path, n=300, seed=2)
+    assert registry.get_artifacts().version == before # inside the interval: not checked yet
+    assert registry.get_artifacts(fresh=True).version != before
+    after = registry.version
+    _train(tmp_path, n=250, seed=3)
+    registry.invalidate()
+    assert registry.get_artifacts().version not in (before, after)
+
+def test_engine_never_scores_a_miss_with_a_replaced_model(artifacts, tmp_path, monkeypatch):
+    import model_registry
+    from engine import SentimentEngine
+    from result_cache import ResultCache
+    monkeypatch.setattr(model_registry, 'registry', ModelRegistry(*artifacts, use_compact=False, check_interval=60))
+    engine = SentimentEngine(cache=ResultCache())
+    assert engine.analyze("tsla surge 10% after the close") is not None
+    old = engine.model_version
+    os.remove(tmp_path / "model.npz")
+    model_path, tfidf_path = _train(tmp_path, n=300, seed=2)
+    new = engine.analyze("aapl drop 3% ahead of the open") # a miss: checks the files despite the interval
+    assert engine.model_version == model_registry.registry.version != old
+    model, vectorizer = joblib.load(model_path), joblib.load(tfidf_path)
+    expected = model.predict_proba(vectorizer.transform(["aapl drop  ahead of the open"]))[0, 1]
+    assert new["score"] == pytest.approx(expected)
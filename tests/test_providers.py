@@ -0,0 +1,16 @@
+import pandas as pd
+
+from providers import RandomWalkProvider
+
+def test_bars_do_not_depend_on_the_request_length():
+    provider = RandomWalkProvider(seed=7)
+    index = pd.date_range("2024-01-02 09:30", periods=500, freq="min", tz="America/New_York")
+    long = provider.bars("AAPL", index, salt="1m", bar_minutes=1)
+    short = provider.bars("AAPL", index[:120], salt="1m", bar_minutes=1)
+    pd.testing.assert_frame_equal(short, long.iloc[:120])
+
+def test_daily_windows_agree():
+    provider = RandomWalkProvider(seed=3)
+    year = provider.history("MSFT", "1y")
+    month = provider.history("MSFT", "1mo")
+    pd.testing.assert_frame_equal(month, year.loc[month.index], check_freq=False)
@@ -0,0 +1,22 @@
+import pytest
+
+import reporting
+
+pq = pytest.importorskip("pyarrow.parquet")
+
+def _row(i, score, confidence):
+    return {"time": f"2024-01-01 10:00:{i % 60:02d}", "text": f"headline {i}", "label": "BULLISH",
+            "score": score, "confidence": confidence}
+
+@pytest.mark.parametrize("first, later", [
+    ((1, None), (0.5, 0.7)), # all-None confidences, then floats
+    ((1, 0.9), (0.5, 0.7)),  # integer scores, then floats
+])
+def test_parquet_types_do_not_depend_on_the_first_chunk(tmp_path, first, later):
+    rows = [_row(i, *first) for i in range(3)] + [_row(i, *later) for i in range(3, 6)]
+    path = str(tmp_path / "log.parquet")
+    assert reporting.export_parquet(rows, path, chunk_rows=3) == 6
+    table = pq.read_table(path)
+    assert [str(t) for t in table.schema.types] == ["timestamp[us]", "string", "string", "double", "double"]
+    assert table.column("score").to_pylist() == [first[0]] * 3 + [later[0]] * 3
+    assert table.column("confidence").to_pylist() == [first[1]] * 3 + [later[1]] * 3
@@ -1,31 +1,43 @@
 import pandas as pd
+import numpy as np
 import joblib
 import os
 import sys
+import time
+import argparse
 from sklearn.model_selection import train_test_split
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.linear_model import LogisticRegression
+from sklearn.feature_extraction.text import TfidfVectorizer, HashingVectorizer
+from sklearn.linear_model import LogisticRegression, SGDClassifier
 
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 import preprocessing
+import model_registry
+from sparse_scorer import CompactScorer, COMPACT_FORMAT, term_hash, source_digest
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DATA_PATH = os.path.join(BASE_DIR, 'data', 'Sentiment_Stock_data.csv')
 MODEL_PATH = os.path.join(BASE_DIR, 'models', 'model.pkl')
 TFIDF_PATH = os.path.join(BASE_DIR, 'models', 'tfidf.pkl')
+COMPACT_PATH = os.path.join(BASE_DIR, 'models', 'model.npz')
 
-def train():
+# Streaming mode: rows per CSV chunk, hashed feature space, known label set
+STREAM_CHUNK_ROWS = 50_000
+HASH_FEATURES = 2 ** 20
+CLASSES = np.array([0, 1])
+
+def train(data_path=DATA_PATH, model_path=MODEL_PATH, tfidf_path=TFIDF_PATH):
+    """Fits TF-IDF + LogisticRegression and saves both pickles. Returns True once they are saved."""
     print("   [Train Script] Loading Data...")
-    if not os.path.exists(DATA_PATH):
+    if not os.path.exists(data_path):
         print("   [Train Script] ❌ DATA NOT FOUND.")
-        return
+        return False
 
-    df = pd.read_csv(DATA_PATH)
+    df = pd.read_csv(data_path)
     if 'Unnamed: 0' in df.columns: df = df.drop(columns=['Unnamed: 0'])
     df = df.dropna(subset=['Sentence', 'Sentiment'])
     
     print("   [Train Script] Cleaning...")
-    df['clean'] = df['Sentence'].apply(preprocessing.clean_text)
+    df['clean'] = preprocessing.clean_series(df['Sentence'], n_jobs=-1)
     
     print("   [Train Script] Vectorizing...")
     tfidf = TfidfVectorizer(max_features=5000, ngram_range=(1,2))
@@ -37,9 +49,117 @@ def train():
     model.fit(X, y)
     
     print("   [Train Script] Saving Models...")
-    joblib.dump(model, MODEL_PATH)
-    joblib.dump(tfidf, TFIDF_PATH)
-    print(f"   [Train Script] ✅ SAVED: {MODEL_PATH}")
+    joblib.dump(model, model_path)
+    joblib.dump(tfidf, tfidf_path)
+    model_registry.invalidate() # engines in this process see the new files on their next call
+    print(f"   [Train Script] ✅ SAVED: {model_path}")
+    return True
+
+def train_streaming(data_path=DATA_PATH, model_path=MODEL_PATH, tfidf_path=TFIDF_PATH, chunksize=STREAM_CHUNK_ROWS):
+    """
+    Out-of-core trainer: reads the CSV in chunks, hashes features (no vocabulary to hold)
+    and fits an SGD logistic model with partial_fit. Peak memory is bounded by `chunksize`,
+    not by the file size. Saves a vectorizer/model pair the inference engines load as-is.
+    Returns True once they are saved.
+    """
+    print("   [Train Script] Streaming mode...")
+    if not os.path.exists(data_path):
+        print("   [Train Script] ❌ DATA NOT FOUND.")
+        return False
+
+    vectorizer = HashingVectorizer(n_features=HASH_FEATURES, ngram_range=(1, 2), alternate_sign=False)
+    model = SGDClassifier(loss='log_loss', random_state=42)
+
+    rows = 0
+    t0 = time.perf_counter()
+    for chunk in pd.read_csv(data_path, usecols=['Sentence', 'Sentiment'], chunksize=chunksize):
+        chunk = chunk.dropna(subset=['Sentence', 'Sentiment'])
+        if chunk.empty: continue
+        X = vectorizer.transform(preprocessing.clean_series(chunk['Sentence']))
+        model.partial_fit(X, chunk['Sentiment'].astype(int), classes=CLASSES)
+        rows += len(chunk)
+        print(f"   [Train Script] ... {rows:,} rows ({rows / (time.perf_counter() - t0):,.0f} rows/s)")
+
+    if rows == 0:
+        print("   [Train Script] ❌ NO ROWS.")
+        return False
+
+    print("   [Train Script] Saving Models...")
+    joblib.dump(model, model_path)
+    joblib.dump(vectorizer, tfidf_path)
+    model_registry.invalidate() # engines in this process see the new files on their next call
+    print(f"   [Train Script] ✅ SAVED: {model_path}")
+    return True
+
+def check_parity(scorer, model, vectorizer, texts=None, tol=1e-9):
+    """Max |CompactScorer - predict_proba| over `texts`; raises if it exceeds `tol`."""
+    if texts is None:
+        # Synthetic documents drawn from the vocabulary itself (plus repeats and OOV noise)
+        rng = np.random.default_rng(0)
+        vocab = np.array(sorted(vectorizer.vocabulary_))
+        texts = [" ".join(rng.choice(vocab, size=rng.integers(1, 30))) + " zzqx" * int(rng.integers(0, 2))
+                 for _ in range(2000)] + ["", "zzqx"]
+    expected = model.predict_proba(vectorizer.transform(texts))[:, 1]
+    diff = float(np.max(np.abs(scorer.score_many(texts) - expected)))
+    if diff > tol:
+        raise RuntimeError(f"Compact scorer parity failed: max |dp| = {diff:.3e} > {tol:.0e}")
+    return diff
+
+def export_compact(model_path=MODEL_PATH, tfidf_path=TFIDF_PATH, out_path=COMPACT_PATH):
+    """
+    Flattens the pickled TF-IDF + LogisticRegression pair into an array-only .npz
+    (sorted term hashes, idf, idf * coef, intercept) that sparse_scorer loads without sklearn.
+    """
+    print("   [Train Script] Exporting compact scorer...")
+    model = joblib.load(model_path)
+    tfidf = joblib.load(tfidf_path)
+    if not isinstance(tfidf, TfidfVectorizer) or tfidf.analyzer != 'word' or tfidf.tokenizer or tfidf.preprocessor \
+            or tfidf.stop_words or tfidf.strip_accents or tfidf.binary or not tfidf.use_idf or tfidf.norm not in ('l2', None):
+        raise ValueError("export_compact supports a plain word-level TfidfVectorizer (use_idf, l2/no norm)")
+    if model.coef_.shape[0] != 1:
+        raise ValueError("export_compact supports binary classifiers only")
+
+    terms = list(tfidf.vocabulary_)
+    index = np.array([tfidf.vocabulary_[t] for t in terms])
+    hashes = np.array([term_hash(t) for t in terms], dtype=np.uint64)
+    order = np.argsort(hashes)
+    if np.any(np.diff(hashes[order]) == 0):
+        raise ValueError("64-bit term hash collision in vocabulary")
+
+    idf = tfidf.idf_[index[order]].astype(np.float64)
+    config = {
+        "format": COMPACT_FORMAT,
+        "token_pattern": tfidf.token_pattern,
+        "ngram_range": list(tfidf.ngram_range),
+        "lowercase": bool(tfidf.lowercase),
+        "sublinear_tf": bool(tfidf.sublinear_tf),
+        "norm": tfidf.norm,
+    }
+    scorer = CompactScorer(hashes[order], idf, idf * model.coef_[0][index[order]], model.intercept_[0],
+                           config, source_digest(model_path, tfidf_path))
+    diff = check_parity(scorer, model, tfidf)
+    scorer.save(out_path)
+    model_registry.invalidate()
+    print(f"   [Train Script] ✅ SAVED: {out_path} (parity max |dp| = {diff:.1e})")
+    return scorer
 
 if __name__ == "__main__":
-    train()
+    parser = argparse.ArgumentParser(description="Train the sentiment model.")
+    parser.add_argument("--stream", action="store_true", help="out-of-core chunked training (bounded memory)")
+    parser.add_argument("--chunksize", type=int, default=STREAM_CHUNK_ROWS, help="rows per chunk in --stream mode")
+    parser.add_argument("--export", action="store_true", help="only export existing pickles to the compact .npz scorer")
+    parser.add_argument("--model", default=MODEL_PATH, help="model pickle path")
+    parser.add_argument("--tfidf", default=TFIDF_PATH, help="vectorizer pickle path")
+    parser.add_argument("--out", default=None, help="compact scorer path (default: model.npz next to --model)")
+    args = parser.parse_args()
+    out = args.out or os.path.join(os.path.dirname(os.path.abspath(args.model)), 'model.npz')
+    if args.export:
+        export_compact(args.model, args.tfidf, out)
+    elif args.stream:
+        if not train_streaming(model_path=args.model, tfidf_path=args.tfidf, chunksize=args.chunksize):
+            sys.exit(1)
+    elif train(model_path=args.model, tfidf_path=args.tfidf):
+        # Only a model trained just now is exported (never stale pickles left from an earlier run)
+        export_compact(args.model, args.tfidf, out)
+    else:
+        sys.exit(1)